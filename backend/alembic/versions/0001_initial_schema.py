@@ -0,0 +1,165 @@
+"""initial schema
+
+Matches the tables the application created with ``SQLModel.metadata.create_all`` before
+migrations were introduced; ``init_db`` stamps such databases at this revision.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 19:06:52.476531
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('item',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('description', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('category', sa.Enum('WEAPON', 'EQUIPMENT', 'POTION', 'MISC', name='itemcategory'), nullable=False),
+    sa.Column('strength_bonus', sa.Integer(), nullable=False),
+    sa.Column('agility_bonus', sa.Integer(), nullable=False),
+    sa.Column('intelligence_bonus', sa.Integer(), nullable=False),
+    sa.Column('vitality_bonus', sa.Integer(), nullable=False),
+    sa.Column('sense_bonus', sa.Integer(), nullable=False),
+    sa.Column('rank_requirement', sa.Enum('E', 'D', 'C', 'B', 'A', 'S', 'NATIONAL', name='rank'), nullable=False),
+    sa.Column('price', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('player',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('username', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('email', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('hashed_password', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('level', sa.Integer(), nullable=False),
+    sa.Column('xp', sa.Integer(), nullable=False),
+    sa.Column('stat_points', sa.Integer(), nullable=False),
+    sa.Column('strength', sa.Integer(), nullable=False),
+    sa.Column('agility', sa.Integer(), nullable=False),
+    sa.Column('intelligence', sa.Integer(), nullable=False),
+    sa.Column('vitality', sa.Integer(), nullable=False),
+    sa.Column('sense', sa.Integer(), nullable=False),
+    sa.Column('mana', sa.Integer(), nullable=False),
+    sa.Column('currency', sa.Integer(), nullable=False),
+    sa.Column('daily_streak', sa.Integer(), nullable=False),
+    sa.Column('best_streak', sa.Integer(), nullable=False),
+    sa.Column('rank', sa.Enum('E', 'D', 'C', 'B', 'A', 'S', 'NATIONAL', name='rank'), nullable=False),
+    sa.Column('class_name', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('player', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_player_class_name'), ['class_name'], unique=False)
+        batch_op.create_index(batch_op.f('ix_player_email'), ['email'], unique=True)
+        batch_op.create_index(batch_op.f('ix_player_username'), ['username'], unique=True)
+
+    op.create_table('skill',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('description', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('skill_type', sa.Enum('ACTIVE', 'PASSIVE', name='skilltype'), nullable=False),
+    sa.Column('unlock_level', sa.Integer(), nullable=False),
+    sa.Column('mana_cost', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('achievement',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('player_id', sa.Integer(), nullable=False),
+    sa.Column('name', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('description', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('unlocked_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['player_id'], ['player.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('analyticssnapshot',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('player_id', sa.Integer(), nullable=False),
+    sa.Column('captured_at', sa.DateTime(), nullable=False),
+    sa.Column('level', sa.Integer(), nullable=False),
+    sa.Column('xp', sa.Integer(), nullable=False),
+    sa.Column('strength', sa.Integer(), nullable=False),
+    sa.Column('agility', sa.Integer(), nullable=False),
+    sa.Column('intelligence', sa.Integer(), nullable=False),
+    sa.Column('vitality', sa.Integer(), nullable=False),
+    sa.Column('sense', sa.Integer(), nullable=False),
+    sa.Column('mana', sa.Integer(), nullable=False),
+    sa.Column('quests_completed', sa.Integer(), nullable=False),
+    sa.Column('quests_failed', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['player_id'], ['player.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('inventoryitem',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('player_id', sa.Integer(), nullable=False),
+    sa.Column('item_id', sa.Integer(), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('equipped', sa.Boolean(), nullable=False),
+    sa.ForeignKeyConstraint(['item_id'], ['item.id'], ),
+    sa.ForeignKeyConstraint(['player_id'], ['player.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('playerskill',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('player_id', sa.Integer(), nullable=False),
+    sa.Column('skill_id', sa.Integer(), nullable=False),
+    sa.Column('level', sa.Integer(), nullable=False),
+    sa.Column('equipped', sa.Boolean(), nullable=False),
+    sa.ForeignKeyConstraint(['player_id'], ['player.id'], ),
+    sa.ForeignKeyConstraint(['skill_id'], ['skill.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('quest',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('player_id', sa.Integer(), nullable=False),
+    sa.Column('title', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('description', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('quest_type', sa.Enum('DAILY', 'PENALTY', 'EMERGENCY', 'STORY', name='questtype'), nullable=False),
+    sa.Column('status', sa.Enum('ACTIVE', 'COMPLETED', 'FAILED', name='queststatus'), nullable=False),
+    sa.Column('difficulty', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('xp_reward', sa.Integer(), nullable=False),
+    sa.Column('stat_reward', sa.Integer(), nullable=False),
+    sa.Column('loot_box_reward', sa.Boolean(), nullable=False),
+    sa.Column('currency_reward', sa.Integer(), nullable=False),
+    sa.Column('deadline', sa.DateTime(), nullable=True),
+    sa.Column('started_at', sa.DateTime(), nullable=False),
+    sa.Column('completed_at', sa.DateTime(), nullable=True),
+    sa.Column('metadata', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.ForeignKeyConstraint(['player_id'], ['player.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('transaction',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('player_id', sa.Integer(), nullable=False),
+    sa.Column('description', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('delta_xp', sa.Integer(), nullable=False),
+    sa.Column('delta_currency', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['player_id'], ['player.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('transaction')
+    op.drop_table('quest')
+    op.drop_table('playerskill')
+    op.drop_table('inventoryitem')
+    op.drop_table('analyticssnapshot')
+    op.drop_table('achievement')
+    op.drop_table('skill')
+    with op.batch_alter_table('player', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_player_username'))
+        batch_op.drop_index(batch_op.f('ix_player_email'))
+        batch_op.drop_index(batch_op.f('ix_player_class_name'))
+
+    op.drop_table('player')
+    op.drop_table('item')
@@ -0,0 +1,51 @@
+"""player stats and timezones
+
+Adds the PlayerStats analytics aggregate, per-player timezones for the daily rollover and
+the (player_id, captured_at) snapshot index. Run ``python -m app.cli backfill-stats`` after
+upgrading an existing database.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 19:07:03.438853
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('playerstats',
+    sa.Column('player_id', sa.Integer(), nullable=False),
+    sa.Column('quests_completed', sa.Integer(), nullable=False),
+    sa.Column('quests_failed', sa.Integer(), nullable=False),
+    sa.Column('daily_xp', sa.JSON(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['player_id'], ['player.id'], ),
+    sa.PrimaryKeyConstraint('player_id')
+    )
+    with op.batch_alter_table('analyticssnapshot', schema=None) as batch_op:
+        batch_op.create_index('ix_analyticssnapshot_player_captured', ['player_id', 'captured_at'], unique=False)
+
+    with op.batch_alter_table('player', schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column('timezone', sqlmodel.sql.sqltypes.AutoString(), nullable=False, server_default='UTC')
+        )
+        batch_op.create_index(batch_op.f('ix_player_timezone'), ['timezone'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('player', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_player_timezone'))
+        batch_op.drop_column('timezone')
+
+    with op.batch_alter_table('analyticssnapshot', schema=None) as batch_op:
+        batch_op.drop_index('ix_analyticssnapshot_player_captured')
+
+    op.drop_table('playerstats')
@@ -0,0 +1,45 @@
+"""hot query indexes
+
+Composite indexes for the per-player quest filters used by the quest routers and services,
+player_id lookups on inventory, and a unique (player_id, skill_id) on unlocked skills.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 19:07:16.342242
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_inventoryitem_player_id', 'inventoryitem', ['player_id'], unique=False)
+
+    # Collapse any duplicate unlocks (keeping the oldest row) so the unique index can be built.
+    op.execute(
+        sa.text(
+            "DELETE FROM playerskill WHERE id NOT IN "
+            "(SELECT MIN(id) FROM playerskill GROUP BY player_id, skill_id)"
+        )
+    )
+    op.create_index('uq_playerskill_player_skill', 'playerskill', ['player_id', 'skill_id'], unique=True)
+
+    op.create_index('ix_quest_player_started', 'quest', ['player_id', 'started_at'], unique=False)
+    op.create_index('ix_quest_player_status', 'quest', ['player_id', 'status'], unique=False)
+    op.create_index('ix_quest_player_type_started', 'quest', ['player_id', 'quest_type', 'started_at'], unique=False)
+    op.create_index('ix_quest_status_deadline', 'quest', ['status', 'deadline'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_quest_status_deadline', table_name='quest')
+    op.drop_index('ix_quest_player_type_started', table_name='quest')
+    op.drop_index('ix_quest_player_status', table_name='quest')
+    op.drop_index('ix_quest_player_started', table_name='quest')
+    op.drop_index('uq_playerskill_player_skill', table_name='playerskill')
+    op.drop_index('ix_inventoryitem_player_id', table_name='inventoryitem')
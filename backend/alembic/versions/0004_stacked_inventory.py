@@ -0,0 +1,48 @@
+"""stacked inventory
+
+Merges duplicate (player_id, item_id, equipped) inventory rows into their oldest row and adds
+the unique stack index that purchases and loot boxes upsert against. The stack index leads
+with player_id, so the separate player_id index is dropped. On a large database run
+``python -m app.cli compact-inventory`` first; it merges in committed batches and leaves this
+migration's merge with nothing to do.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 21:42:10.118204
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        sa.text(
+            "UPDATE inventoryitem SET quantity = ("
+            "SELECT SUM(dup.quantity) FROM inventoryitem AS dup "
+            "WHERE dup.player_id = inventoryitem.player_id AND dup.item_id = inventoryitem.item_id "
+            "AND dup.equipped = inventoryitem.equipped"
+            ") WHERE id IN ("
+            "SELECT MIN(id) FROM inventoryitem GROUP BY player_id, item_id, equipped HAVING COUNT(*) > 1)"
+        )
+    )
+    op.execute(
+        sa.text(
+            "DELETE FROM inventoryitem WHERE id NOT IN "
+            "(SELECT MIN(id) FROM inventoryitem GROUP BY player_id, item_id, equipped)"
+        )
+    )
+    op.create_index('uq_inventoryitem_stack', 'inventoryitem', ['player_id', 'item_id', 'equipped'], unique=True)
+    op.drop_index('ix_inventoryitem_player_id', table_name='inventoryitem')
+
+
+def downgrade() -> None:
+    # Stacks are not split back into single rows; only the indexes are restored.
+    op.create_index('ix_inventoryitem_player_id', 'inventoryitem', ['player_id'], unique=False)
+    op.drop_index('uq_inventoryitem_stack', table_name='inventoryitem')
@@ -0,0 +1,51 @@
+"""player effective stats
+
+Adds the per-player effective stats record (base stats plus equipped item bonuses) and fills
+it for existing players from their current equipment. Verify it at any time with
+``python -m app.cli check-effective-stats``.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 22:16:44.904317
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+STATS = ('strength', 'agility', 'intelligence', 'vitality', 'sense')
+
+
+def upgrade() -> None:
+    op.create_table('playereffectivestats',
+    sa.Column('player_id', sa.Integer(), nullable=False),
+    sa.Column('strength', sa.Integer(), nullable=False),
+    sa.Column('agility', sa.Integer(), nullable=False),
+    sa.Column('intelligence', sa.Integer(), nullable=False),
+    sa.Column('vitality', sa.Integer(), nullable=False),
+    sa.Column('sense', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['player_id'], ['player.id'], ),
+    sa.PrimaryKeyConstraint('player_id')
+    )
+
+    bonus_sums = ", ".join(f"SUM(inv.quantity * item.{stat}_bonus) AS {stat}" for stat in STATS)
+    effective = ", ".join(f"player.{stat} + COALESCE(bonus.{stat}, 0)" for stat in STATS)
+    op.execute(
+        sa.text(
+            f"INSERT INTO playereffectivestats (player_id, {', '.join(STATS)}, updated_at) "
+            f"SELECT player.id, {effective}, CURRENT_TIMESTAMP FROM player LEFT JOIN ("
+            f"SELECT inv.player_id, {bonus_sums} FROM inventoryitem AS inv "
+            "JOIN item ON item.id = inv.item_id WHERE inv.equipped GROUP BY inv.player_id"
+            ") AS bonus ON bonus.player_id = player.id"
+        )
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('playereffectivestats')
@@ -0,0 +1,25 @@
+"""player level/xp index
+
+Composite (level, xp) index on players. It covers the ordered read that loads the in-memory
+leaderboard at startup and on every refresh.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 23:02:11.518204
+"""
+from __future__ import annotations
+
+from alembic import op
+
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_player_level_xp', 'player', ['level', 'xp'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_player_level_xp', table_name='player')
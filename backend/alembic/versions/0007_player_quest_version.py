@@ -0,0 +1,28 @@
+"""player quest version
+
+Adds the per-player quest version counter that, together with ``updated_at``, feeds the weak
+ETags on ``/players/me``, ``/quests/active`` and ``/analytics/me``.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 23:41:37.092615
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('player', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('quest_version', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('player', schema=None) as batch_op:
+        batch_op.drop_column('quest_version')
@@ -0,0 +1,66 @@
+"""Operational commands, run as ``python -m app.cli <command>`` from the backend directory."""
+
+from __future__ import annotations
+
+import argparse
+from typing import Any, Callable, Optional, Sequence
+
+from .database import init_db, session_scope
+from .services.analytics import backfill_player_stats
+from .services.effective_stats import check_effective_stats
+from .services.inventory import compact_inventory
+
+
+def backfill_stats(args: argparse.Namespace) -> None:
+    init_db()
+    with session_scope() as session:
+        written = backfill_player_stats(session)
+    print(f"Rebuilt analytics aggregates for {written} players")
+
+
+def compact_inventory_stacks(args: argparse.Namespace) -> None:
+    # Deliberately no init_db(): this is meant to run before the stacking migration is applied.
+    with session_scope() as session:
+        removed = compact_inventory(session)
+    print(f"Merged {removed} duplicate inventory rows")
+
+
+def verify_effective_stats(args: argparse.Namespace) -> None:
+    init_db()
+    with session_scope() as session:
+        mismatches = check_effective_stats(session, fix=args.fix)
+    for mismatch in mismatches:
+        print(f"player {mismatch.player_id}: stored {mismatch.stored}, expected {mismatch.expected}")
+    action = "Repaired" if args.fix else "Found"
+    print(f"{action} {len(mismatches)} inconsistent effective stats records")
+    if mismatches and not args.fix:
+        raise SystemExit(1)
+
+
+Argument = tuple[tuple[str, ...], dict[str, Any]]
+
+COMMANDS: dict[str, tuple[Callable[[argparse.Namespace], None], str, tuple[Argument, ...]]] = {
+    "backfill-stats": (backfill_stats, "Rebuild per-player analytics aggregates from quest history", ()),
+    "compact-inventory": (compact_inventory_stacks, "Merge duplicate inventory rows into per-item stacks", ()),
+    "check-effective-stats": (
+        verify_effective_stats,
+        "Recompute effective stats from scratch and report stored records that disagree",
+        ((("--fix",), {"action": "store_true", "help": "overwrite inconsistent records"}),),
+    ),
+}
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    for name, (handler, help_text, arguments) in COMMANDS.items():
+        subparser = subparsers.add_parser(name, help=help_text)
+        for flags, options in arguments:
+            subparser.add_argument(*flags, **options)
+        subparser.set_defaults(handler=handler)
+    args = parser.parse_args(argv)
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,7 +7,39 @@ class Settings(BaseSettings):
     secret_key: str = Field(default="supersecretchange", env="SOLO_SYSTEM_SECRET_KEY")
     access_token_expire_minutes: int = 60 * 24
     database_url: str = Field(default="sqlite:///./solo_system.db", env="SOLO_SYSTEM_DATABASE_URL")
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout_seconds: float = 30.0
+    # Applied to every SQLite connection; ignored for other databases.
+    sqlite_journal_mode: str = "WAL"
+    sqlite_synchronous: str = "NORMAL"
+    sqlite_mmap_size: int = 256 * 1024 * 1024
+    sqlite_cache_size: int = -64_000  # negative values are KiB, so roughly 64 MB
+    sqlite_busy_timeout_ms: int = 5_000
+    sqlite_temp_store: str = "MEMORY"
     daily_reset_hour: int = 5
+    rollover_tick_seconds: int = 60
+    deadline_sweep_seconds: int = 60
+    token_cache_size: int = 4096
+    token_cache_ttl_seconds: int = 300
+    hash_pool_workers: int = 2
+    hash_pool_queue_size: int = 32
+    hash_pool_retry_after_seconds: int = 2
+    analytics_window_days: int = 7
+    snapshot_interval_minutes: int = 60
+    snapshot_batch_size: int = 500
+    # Relative loot-box odds per item category; a category missing here or weighted 0 never drops.
+    loot_category_weights: dict[str, int] = {"weapon": 5, "equipment": 3, "potion": 1, "misc": 1}
+    lootbox_max_open: int = 100
+    ledger_batch_size: int = 500
+    ledger_flush_seconds: float = 1.0
+    ledger_max_queue: int = 100_000
+    leaderboard_refresh_seconds: int = 300
+    # Responses at least this large are gzipped for clients that accept it.
+    gzip_minimum_bytes: int = 1024
+    # Render every list response on the orjson fast path, skipping response_model validation.
+    # Requests that pass ``fields=`` always take it.
+    fast_responses: bool = False
 
     class Config:
         env_file = ".env"
@@ -1,28 +1,237 @@
-from contextlib import contextmanager
-from typing import Generator, Iterator
+import logging
+import time
+from contextlib import asynccontextmanager, contextmanager
+from pathlib import Path
+from typing import Any, AsyncIterator, Generator, Iterator, Mapping, Optional
 
-from sqlmodel import Session, SQLModel, create_engine
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import event, inspect
+from sqlalchemy.engine import URL, Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool, StaticPool
+from sqlmodel import Session, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from .config import Settings, get_settings
+from .utils.metrics import db_commits, pool_checkout_seconds, record_statement
+
+logger = logging.getLogger(__name__)
+
+ALEMBIC_INI = Path(__file__).resolve().parent.parent / "alembic.ini"
+# Databases created by create_all before migrations existed match this revision.
+LEGACY_REVISION = "0001"
+
+# Async drivers used when the configured URL names a sync one (or none).
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+
+SQLITE_PRAGMAS = ("journal_mode", "synchronous", "mmap_size", "cache_size", "busy_timeout", "temp_store")
+
+
+def sqlite_profile(settings: Settings) -> dict[str, Any]:
+    return {
+        "journal_mode": settings.sqlite_journal_mode,
+        "synchronous": settings.sqlite_synchronous,
+        "mmap_size": settings.sqlite_mmap_size,
+        "cache_size": settings.sqlite_cache_size,
+        "busy_timeout": settings.sqlite_busy_timeout_ms,
+        "temp_store": settings.sqlite_temp_store,
+    }
+
+
+def async_database_url(database_url: str) -> URL:
+    """Swap the driver of ``database_url`` for its asyncio counterpart, keeping everything else."""
+    url = make_url(database_url)
+    driver = ASYNC_DRIVERS.get(url.get_backend_name())
+    if driver is None or url.get_driver_name() in ("aiosqlite", "asyncpg"):
+        return url
+    return url.set(drivername=driver)
+
+
+def _is_memory_database(url: URL) -> bool:
+    return url.database in (None, "", ":memory:")
+
+
+def _sqlite_connect_args(pragmas: Mapping[str, Any]) -> dict[str, Any]:
+    connect_args: dict[str, Any] = {"check_same_thread": False}
+    if "busy_timeout" in pragmas:
+        connect_args["timeout"] = pragmas["busy_timeout"] / 1000
+    return connect_args
+
+
+def _install_pragmas(target: Engine, pragmas: Mapping[str, Any]) -> None:
+    @event.listens_for(target, "connect")
+    def _apply_pragmas(dbapi_connection, connection_record) -> None:  # type: ignore[no-untyped-def]
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+class _TimedCheckout:
+    """Pool mixin recording how long each checkout takes, waiting for a free slot included."""
+
+    engine_label = "sync"
+
+    def _do_get(self):  # type: ignore[no-untyped-def]
+        started = time.perf_counter()
+        try:
+            return super()._do_get()  # type: ignore[misc]
+        finally:
+            pool_checkout_seconds.observe(time.perf_counter() - started, self.engine_label)
+
+
+class TimedQueuePool(_TimedCheckout, QueuePool):
+    pass
+
+
+class TimedAsyncQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    engine_label = "async"
+
+
+def install_metrics(target: Engine, label: str) -> None:
+    """Count statements and commits on ``target`` and time each statement."""
+
+    @event.listens_for(target, "before_cursor_execute")
+    def _start_timer(conn, cursor, statement, parameters, context, executemany) -> None:  # type: ignore[no-untyped-def]
+        conn.info.setdefault("statement_started", []).append(time.perf_counter())
+
+    @event.listens_for(target, "after_cursor_execute")
+    def _record_statement(conn, cursor, statement, parameters, context, executemany) -> None:  # type: ignore[no-untyped-def]
+        record_statement(label, time.perf_counter() - conn.info["statement_started"].pop())
+
+    @event.listens_for(target, "handle_error")
+    def _drop_timer(exception_context) -> None:  # type: ignore[no-untyped-def]
+        connection = exception_context.connection
+        if connection is not None and connection.info.get("statement_started"):
+            connection.info["statement_started"].pop()
+
+    @event.listens_for(target, "commit")
+    def _count_commit(conn) -> None:  # type: ignore[no-untyped-def]
+        db_commits.inc(label)
+
+
+def build_engine(
+    database_url: str,
+    pragmas: Optional[Mapping[str, Any]] = None,
+    pool_size: int = 5,
+    max_overflow: int = 10,
+    pool_timeout: float = 30.0,
+) -> Engine:
+    """Create an engine; for SQLite, ``pragmas`` are applied to every new connection."""
+    url = make_url(database_url)
+    if url.get_backend_name() != "sqlite":
+        return create_engine(
+            database_url,
+            echo=False,
+            poolclass=TimedQueuePool,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=pool_timeout,
+        )
+
+    pragmas = dict(pragmas or {})
+    pool_args: dict[str, Any] = {}
+    if not _is_memory_database(url):
+        pool_args = {
+            "poolclass": TimedQueuePool,
+            "pool_size": pool_size,
+            "max_overflow": max_overflow,
+            "pool_timeout": pool_timeout,
+        }
+    sqlite_engine = create_engine(database_url, echo=False, connect_args=_sqlite_connect_args(pragmas), **pool_args)
+    _install_pragmas(sqlite_engine, pragmas)
+    return sqlite_engine
+
+
+def build_async_engine(
+    database_url: str,
+    pragmas: Optional[Mapping[str, Any]] = None,
+    pool_size: int = 5,
+    max_overflow: int = 10,
+    pool_timeout: float = 30.0,
+) -> AsyncEngine:
+    """Async counterpart of :func:`build_engine` for request handlers (aiosqlite or asyncpg)."""
+    url = async_database_url(database_url)
+    pool_args: dict[str, Any] = {
+        "poolclass": TimedAsyncQueuePool,
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": pool_timeout,
+    }
+    if url.get_backend_name() != "sqlite":
+        return create_async_engine(url, echo=False, **pool_args)
+
+    pragmas = dict(pragmas or {})
+    if _is_memory_database(url):
+        # Every connection to ":memory:" is a new database, so share a single one.
+        pool_args = {"poolclass": StaticPool}
+    async_engine = create_async_engine(url, echo=False, connect_args=_sqlite_connect_args(pragmas), **pool_args)
+    # Connection events fire on the sync facade; aiosqlite's adapter accepts blocking-style calls there.
+    _install_pragmas(async_engine.sync_engine, pragmas)
+    return async_engine
+
+
+def engine_report(target: Engine) -> dict[str, Any]:
+    """Effective connection settings, read back from the database rather than from config."""
+    report: dict[str, Any] = {"dialect": target.dialect.name, "pool": target.pool.status()}
+    if target.dialect.name == "sqlite":
+        with target.connect() as connection:
+            for name in SQLITE_PRAGMAS:
+                report[name] = connection.exec_driver_sql(f"PRAGMA {name}").scalar()
+    return report
 
-from .config import get_settings
 
 settings = get_settings()
-engine = create_engine(
+engine = build_engine(
     settings.database_url,
-    echo=False,
-    connect_args={"check_same_thread": False} if settings.database_url.startswith("sqlite") else {},
+    sqlite_profile(settings),
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout_seconds,
 )
+# Request handlers use the async engine; migrations, the CLI and background jobs keep the sync one.
+async_engine = build_async_engine(
+    settings.database_url,
+    sqlite_profile(settings),
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout_seconds,
+)
+install_metrics(engine, "sync")
+install_metrics(async_engine.sync_engine, "async")
 
 
 def init_db() -> None:
-    SQLModel.metadata.create_all(engine)
+    config = Config(str(ALEMBIC_INI))
+    config.attributes["configure_logger"] = False
+    with engine.begin() as connection:
+        config.attributes["connection"] = connection
+        tables = inspect(connection).get_table_names()
+        if "player" in tables and "alembic_version" not in tables:
+            command.stamp(config, LEGACY_REVISION)
+        command.upgrade(config, "head")
+    logger.info("Database engine profile: %s", engine_report(engine))
 
 
 def get_session() -> Generator[Session, None, None]:
-    with Session(engine) as session:
+    # Objects stay loaded after commit so responses can be serialised without re-selecting them.
+    with Session(engine, expire_on_commit=False) as session:
         yield session
 
 
 @contextmanager
 def session_scope() -> Iterator[Session]:
-    with Session(engine) as session:
+    with Session(engine, expire_on_commit=False) as session:
+        yield session
+
+
+async def get_async_session() -> AsyncIterator[AsyncSession]:
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        yield session
+
+
+@asynccontextmanager
+async def async_session_scope() -> AsyncIterator[AsyncSession]:
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
         yield session
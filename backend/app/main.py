@@ -1,13 +1,29 @@
 from __future__ import annotations
 
+from dataclasses import asdict
+from typing import Iterator
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import PlainTextResponse
+from sqlalchemy import insert
 from sqlmodel import Session, select
 
 from .config import get_settings
-from .database import get_session, init_db, session_scope
-from .models import Item, ItemCategory, Skill, SkillType
-from .routers import analytics, auth, inventory, players, quests, shop, skills
+from .database import async_engine, init_db, session_scope
+from .models import Item, ItemCategory, Skill, SkillType, Transaction
+from .routers import analytics, auth, dashboard, inventory, leaderboard, leveling, players, quests, shop, skills
+from .services.analytics import capture_snapshots
+from .services.catalog import catalog_cache
+from .services.leaderboard import global_leaderboard, load_leaderboard
+from .services.ledger import LedgerEntry, ledger_writer
+from .services.quests import sweep_expired_quests
+from .services.rollover import rollover_wheel
+from .utils.background import PeriodicTask
+from .utils.hashing import hashing_pool
+from .utils.metrics import CONTENT_TYPE, Family, MetricsMiddleware, registry
+from .utils.security import token_cache
 
 settings = get_settings()
 app = FastAPI(title=settings.app_name)
@@ -19,12 +35,73 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(GZipMiddleware, minimum_size=settings.gzip_minimum_bytes)
+# Added last so it is outermost and times the other middleware too.
+app.add_middleware(MetricsMiddleware)
 
 
 @app.on_event("startup")
 def on_startup() -> None:
     init_db()
     seed_data()
+    run_leaderboard_refresh()
+
+
+def run_snapshot_capture() -> None:
+    with session_scope() as session:
+        capture_snapshots(session)
+
+
+def run_daily_rollover() -> None:
+    with session_scope() as session:
+        rollover_wheel.tick(session)
+
+
+def run_leaderboard_refresh() -> None:
+    # Picks up changes made by other worker processes, which only update their own copy.
+    with session_scope() as session:
+        load_leaderboard(session)
+
+
+def run_deadline_sweep() -> None:
+    with session_scope() as session:
+        sweep_expired_quests(session)
+        session.commit()
+
+
+background_jobs = [
+    PeriodicTask("analytics-snapshots", run_snapshot_capture, settings.snapshot_interval_minutes * 60),
+    PeriodicTask("daily-rollover", run_daily_rollover, settings.rollover_tick_seconds),
+    PeriodicTask("deadline-sweeper", run_deadline_sweep, settings.deadline_sweep_seconds),
+    PeriodicTask("leaderboard-refresh", run_leaderboard_refresh, settings.leaderboard_refresh_seconds),
+]
+
+
+async def write_ledger_batch(entries: list[LedgerEntry]) -> None:
+    # One executemany INSERT per batch on its own short transaction.
+    async with async_engine.begin() as connection:
+        await connection.execute(insert(Transaction), [asdict(entry) for entry in entries])
+
+
+@app.on_event("startup")
+async def start_background_jobs() -> None:
+    for job in background_jobs:
+        job.start()
+    ledger_writer.start(write_ledger_batch)
+
+
+@app.on_event("shutdown")
+async def stop_background_jobs() -> None:
+    for job in background_jobs:
+        await job.stop()
+    # Drains the queue, so this must run before the engine is disposed.
+    await ledger_writer.stop()
+
+
+@app.on_event("shutdown")
+async def on_shutdown() -> None:
+    hashing_pool.shutdown()
+    await async_engine.dispose()
 
 
 def seed_data() -> None:
@@ -103,8 +180,52 @@ app.include_router(inventory.router)
 app.include_router(skills.router)
 app.include_router(shop.router)
 app.include_router(analytics.router)
+app.include_router(leveling.router)
+app.include_router(leaderboard.router)
+app.include_router(dashboard.router)
 
 
 @app.get("/health")
 def healthcheck() -> dict[str, str]:
     return {"status": "ok"}
+
+
+@app.get("/health/caches")
+def cache_stats() -> dict[str, dict[str, int]]:
+    return {
+        "token": token_cache.stats(),
+        "catalog": catalog_cache.stats(),
+        "leaderboard": global_leaderboard.stats(),
+    }
+
+
+@app.get("/health/queues")
+def queue_stats() -> dict[str, dict[str, int]]:
+    return {ledger_writer.name: ledger_writer.stats()}
+
+
+def cache_metrics() -> Iterator[Family]:
+    token, catalog = token_cache.stats(), catalog_cache.stats()
+    lookups = {"token": (token["hits"], token["misses"]), "catalog": (catalog["hits"], catalog["loads"])}
+    yield "cache_hits_total", "counter", "Cache lookups answered from memory.", [
+        ("", {"cache": name}, hits) for name, (hits, _) in lookups.items()
+    ]
+    yield "cache_misses_total", "counter", "Cache lookups that went to the database.", [
+        ("", {"cache": name}, misses) for name, (_, misses) in lookups.items()
+    ]
+    yield "cache_hit_ratio", "gauge", "Share of cache lookups answered from memory since startup.", [
+        ("", {"cache": name}, hits / (hits + misses) if hits + misses else 0.0) for name, (hits, misses) in lookups.items()
+    ]
+
+
+registry.register_collector(cache_metrics)
+
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def metrics() -> PlainTextResponse:
+    return PlainTextResponse(registry.render(), media_type=CONTENT_TYPE)
+
+
+@app.get("/health/pools")
+def pool_stats() -> dict[str, dict[str, int | float]]:
+    return {hashing_pool.name: hashing_pool.stats()}
@@ -4,6 +4,7 @@ import enum
 from datetime import datetime
 from typing import Optional
 
+from sqlalchemy import JSON, Column, Index
 from sqlmodel import Field, Relationship, SQLModel
 
 
@@ -43,6 +44,8 @@ class SkillType(str, enum.Enum):
 
 
 class Player(SQLModel, table=True):
+    __table_args__ = (Index("ix_player_level_xp", "level", "xp"),)
+
     id: Optional[int] = Field(default=None, primary_key=True)
     username: str = Field(index=True, unique=True)
     email: str = Field(index=True, unique=True)
@@ -62,6 +65,9 @@ class Player(SQLModel, table=True):
     best_streak: int = Field(default=0)
     rank: Rank = Field(default=Rank.E)
     class_name: Optional[str] = Field(default=None, index=True)
+    timezone: str = Field(default="UTC", index=True)
+    # Bumped on every change to the player's quests; part of the read endpoints' ETags.
+    quest_version: int = Field(default=0)
 
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow, sa_column_kwargs={"onupdate": datetime.utcnow})
@@ -74,6 +80,13 @@ class Player(SQLModel, table=True):
 
 
 class Quest(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_quest_player_status", "player_id", "status"),
+        Index("ix_quest_player_type_started", "player_id", "quest_type", "started_at"),
+        Index("ix_quest_player_started", "player_id", "started_at"),
+        Index("ix_quest_status_deadline", "status", "deadline"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     player_id: int = Field(foreign_key="player.id")
     title: str
@@ -108,6 +121,9 @@ class Item(SQLModel, table=True):
 
 
 class InventoryItem(SQLModel, table=True):
+    # One stack per item and equipped state; the leading player_id also serves per-player lookups.
+    __table_args__ = (Index("uq_inventoryitem_stack", "player_id", "item_id", "equipped", unique=True),)
+
     id: Optional[int] = Field(default=None, primary_key=True)
     player_id: int = Field(foreign_key="player.id")
     item_id: int = Field(foreign_key="item.id")
@@ -128,6 +144,8 @@ class Skill(SQLModel, table=True):
 
 
 class PlayerSkill(SQLModel, table=True):
+    __table_args__ = (Index("uq_playerskill_player_skill", "player_id", "skill_id", unique=True),)
+
     id: Optional[int] = Field(default=None, primary_key=True)
     player_id: int = Field(foreign_key="player.id")
     skill_id: int = Field(foreign_key="skill.id")
@@ -160,6 +178,8 @@ class Achievement(SQLModel, table=True):
 
 
 class AnalyticsSnapshot(SQLModel, table=True):
+    __table_args__ = (Index("ix_analyticssnapshot_player_captured", "player_id", "captured_at"),)
+
     id: Optional[int] = Field(default=None, primary_key=True)
     player_id: int = Field(foreign_key="player.id")
     captured_at: datetime = Field(default_factory=datetime.utcnow)
@@ -173,3 +193,24 @@ class AnalyticsSnapshot(SQLModel, table=True):
     mana: int
     quests_completed: int
     quests_failed: int
+
+
+class PlayerStats(SQLModel, table=True):
+    player_id: int = Field(foreign_key="player.id", primary_key=True)
+    quests_completed: int = Field(default=0)
+    quests_failed: int = Field(default=0)
+    # ISO date -> XP earned that day, pruned to the configured rolling window.
+    daily_xp: dict[str, int] = Field(default_factory=dict, sa_column=Column(JSON, nullable=False))
+    updated_at: datetime = Field(default_factory=datetime.utcnow, sa_column_kwargs={"onupdate": datetime.utcnow})
+
+
+class PlayerEffectiveStats(SQLModel, table=True):
+    """Base stats plus every equipped item's bonuses, kept current on allocate, equip and unequip."""
+
+    player_id: int = Field(foreign_key="player.id", primary_key=True)
+    strength: int = Field(default=0)
+    agility: int = Field(default=0)
+    intelligence: int = Field(default=0)
+    vitality: int = Field(default=0)
+    sense: int = Field(default=0)
+    updated_at: datetime = Field(default_factory=datetime.utcnow, sa_column_kwargs={"onupdate": datetime.utcnow})
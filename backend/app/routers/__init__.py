@@ -1,9 +1,10 @@
-from . import analytics, auth, inventory, players, quests, shop, skills
+from . import analytics, auth, inventory, leveling, players, quests, shop, skills
 
 __all__ = [
     "analytics",
     "auth",
     "inventory",
+    "leveling",
     "players",
     "quests",
     "shop",
@@ -1,39 +1,41 @@
 from __future__ import annotations
 
-from datetime import datetime, timedelta
+from datetime import datetime
+from typing import List, Union
 
-import pendulum
-from fastapi import APIRouter, Depends
-from sqlmodel import Session, select
+from fastapi import APIRouter, Depends, Query, Request, Response
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from ..database import get_session
-from ..models import Player, Quest, QuestStatus, QuestType
-from ..schemas import AnalyticsRead
+from ..database import get_async_session
+from ..models import Player, PlayerStats
+from ..schemas import AnalyticsHistoryPoint, AnalyticsRead, HistoryResolution
+from ..services.analytics import analytics_read, snapshot_history_async
+from ..utils.etag import etag_matches, not_modified, player_etag, validator_headers
 from ..utils.security import get_current_player
 
 router = APIRouter(prefix="/analytics", tags=["analytics"])
 
 
 @router.get("/me", response_model=AnalyticsRead)
-def analytics_dashboard(
+async def analytics_dashboard(
+    request: Request,
+    response: Response,
     current_player: Player = Depends(get_current_player),
-    session: Session = Depends(get_session),
-) -> AnalyticsRead:
-    quests = session.exec(select(Quest).where(Quest.player_id == current_player.id)).all()
-    completed = sum(1 for quest in quests if quest.status == QuestStatus.COMPLETED)
-    failed = sum(1 for quest in quests if quest.status == QuestStatus.FAILED)
-    now = pendulum.now()
-    week_ago = now.subtract(days=7)
-    xp_week = sum(q.xp_reward for q in quests if q.completed_at and q.completed_at >= week_ago)
-    daily_average = xp_week / 7
-
-    streak = current_player.daily_streak
-
-    return AnalyticsRead(
-        level=current_player.level,
-        xp=current_player.xp,
-        quests_completed=completed,
-        quests_failed=failed,
-        streak=streak,
-        average_daily_xp=daily_average,
-    )
+    session: AsyncSession = Depends(get_async_session),
+) -> Union[AnalyticsRead, Response]:
+    # The rolling XP average moves with the calendar even when nothing is written.
+    etag = player_etag(current_player, "analytics", datetime.utcnow().date())
+    if etag_matches(request, etag):
+        return not_modified(etag, private=True)
+    response.headers.update(validator_headers(etag, private=True))
+    return analytics_read(current_player, await session.get(PlayerStats, current_player.id))
+
+
+@router.get("/me/history", response_model=List[AnalyticsHistoryPoint])
+async def analytics_history(
+    resolution: HistoryResolution = HistoryResolution.DAY,
+    limit: int = Query(default=90, ge=1, le=1000),
+    current_player: Player = Depends(get_current_player),
+    session: AsyncSession = Depends(get_async_session),
+) -> List[AnalyticsHistoryPoint]:
+    return await snapshot_history_async(session, current_player.id, resolution, limit)
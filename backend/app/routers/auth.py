@@ -2,41 +2,52 @@ from __future__ import annotations
 
 from datetime import timedelta
 
+import pendulum
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from ..database import get_session
+from ..database import get_async_session
 from ..models import Player
 from ..schemas import PlayerCreate, PlayerRead, TokenResponse
-from ..utils.security import authenticate_player, create_access_token, get_password_hash
+from ..services.effective_stats import initial_effective_stats
+from ..services.leaderboard import track_player
+from ..utils.security import authenticate_player_async, create_player_token, get_password_hash_async
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
 @router.post("/register", response_model=PlayerRead, status_code=status.HTTP_201_CREATED)
-def register_player(payload: PlayerCreate, session: Session = Depends(get_session)) -> Player:
-    existing = session.exec(select(Player).where(Player.username == payload.username)).first()
+async def register_player(payload: PlayerCreate, session: AsyncSession = Depends(get_async_session)) -> Player:
+    existing = (await session.exec(select(Player).where(Player.username == payload.username))).first()
     if existing:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Username already registered")
-    email_existing = session.exec(select(Player).where(Player.email == payload.email)).first()
+    email_existing = (await session.exec(select(Player).where(Player.email == payload.email))).first()
     if email_existing:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
+    try:
+        pendulum.timezone(payload.timezone)
+    except (ValueError, KeyError) as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Unknown timezone") from exc
     player = Player(
         username=payload.username,
         email=payload.email,
-        hashed_password=get_password_hash(payload.password),
+        timezone=payload.timezone,
+        hashed_password=await get_password_hash_async(payload.password),
     )
     session.add(player)
-    session.commit()
-    session.refresh(player)
+    await session.flush()
+    session.add(initial_effective_stats(player))
+    track_player(session, player)
+    await session.commit()
     return player
 
 
 @router.post("/token", response_model=TokenResponse)
-def login(form_data: OAuth2PasswordRequestForm = Depends(), session: Session = Depends(get_session)) -> TokenResponse:
-    player = authenticate_player(session, form_data.username, form_data.password)
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), session: AsyncSession = Depends(get_async_session)) -> TokenResponse:
+    player = await authenticate_player_async(session, form_data.username, form_data.password)
     if not player:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Incorrect username or password")
-    access_token = create_access_token({"sub": player.username}, expires_delta=timedelta(minutes=60 * 24))
+    access_token = create_player_token(player, expires_delta=timedelta(minutes=60 * 24))
     return TokenResponse(access_token=access_token)
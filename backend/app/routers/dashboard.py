@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Union
+
+from fastapi import APIRouter, Depends, Request, Response
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ..database import get_async_session
+from ..models import Player
+from ..schemas import DashboardRead
+from ..services.dashboard import build_dashboard
+from ..utils.etag import etag_matches, not_modified, player_etag, validator_headers
+from ..utils.security import get_current_player
+
+router = APIRouter(prefix="/dashboard", tags=["dashboard"])
+
+
+def _dashboard_etag(player: Player) -> str:
+    # Dated because the rolling XP average in the analytics part moves with the calendar.
+    return player_etag(player, "dashboard", datetime.utcnow().date())
+
+
+@router.get("", response_model=DashboardRead)
+async def read_dashboard(
+    request: Request,
+    response: Response,
+    current_player: Player = Depends(get_current_player),
+    session: AsyncSession = Depends(get_async_session),
+) -> Union[DashboardRead, Response]:
+    """Player profile, today's daily quest, active quests and analytics in one round trip."""
+    etag = _dashboard_etag(current_player)
+    if etag_matches(request, etag):
+        return not_modified(etag, private=True)
+    dashboard = await build_dashboard(session, current_player)
+    # Usually a read-only commit; it only writes for players who joined mid-cycle or predate
+    # effective stats, and a new daily quest moves the validators, so take them afterwards.
+    await session.commit()
+    response.headers.update(validator_headers(_dashboard_etag(current_player), private=True))
+    return dashboard
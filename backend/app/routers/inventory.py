@@ -1,67 +1,114 @@
 from __future__ import annotations
 
-import random
-from typing import List
+from collections import Counter
+from typing import Any, List, Optional, Union
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import selectinload
-from sqlmodel import Session, select
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import ORJSONResponse
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from ..database import get_session
-from ..models import InventoryItem, Item, ItemCategory, Player
+from ..config import get_settings
+from ..database import get_async_session
+from ..models import InventoryItem, Player
 from ..schemas import InventoryItemRead, ItemRead
+from ..services.catalog import catalog_cache
+from ..services.effective_stats import item_bonuses, shift_effective_stats
+from ..services.inventory import grant_items, stack_read
+from ..utils.etag import cached_json_response
+from ..utils.rendering import Serializer, fast_path
 from ..utils.security import get_current_player
 
 router = APIRouter(prefix="/inventory", tags=["inventory"])
+settings = get_settings()
+inventory_serializer = Serializer(InventoryItemRead)
 
 
 @router.get("/items", response_model=List[ItemRead])
-def list_items(session: Session = Depends(get_session)) -> List[Item]:
-    return session.exec(select(Item)).all()
+async def list_items(request: Request, session: AsyncSession = Depends(get_async_session)) -> Response:
+    catalog = await catalog_cache.snapshot(session)
+    return cached_json_response(request, catalog.items_body, catalog.items_etag)
 
 
 @router.get("/me", response_model=List[InventoryItemRead])
-def list_inventory(
+async def list_inventory(
+    fields: Optional[str] = Query(default=None, description="Comma-separated InventoryItemRead fields to return"),
     current_player: Player = Depends(get_current_player),
-    session: Session = Depends(get_session),
-) -> List[InventoryItem]:
-    statement = select(InventoryItem).where(InventoryItem.player_id == current_player.id).options(
-        selectinload(InventoryItem.item)
-    )
-    return session.exec(statement).all()
+    session: AsyncSession = Depends(get_async_session),
+) -> Union[list[dict[str, Any]], Response]:
+    fieldset = inventory_serializer.fieldset(fields)
+    columns = inventory_serializer.columns(InventoryItem, fieldset, "item_id")
+    rows = (await session.execute(select(*columns).where(InventoryItem.player_id == current_player.id))).all()
+    if "item" not in fieldset:
+        stacks = inventory_serializer.rows(rows, fieldset)
+    else:
+        # Item details come from the in-process catalog rather than a join.
+        items = (await catalog_cache.snapshot(session)).items
+        stacks = [inventory_serializer.row(row, fieldset, item=items[row.item_id]) for row in rows]
+    return ORJSONResponse(stacks) if fast_path(fields) else stacks
+
+
+async def _move_unit(
+    session: AsyncSession, player: Player, inventory_id: int, equip: bool
+) -> InventoryItemRead:
+    """Move one unit of a stack between its unequipped and equipped sides, updating effective stats."""
+    inventory_item = await session.get(InventoryItem, inventory_id)
+    if not inventory_item or inventory_item.player_id != player.id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Item not found")
+    item = (await catalog_cache.snapshot(session)).items[inventory_item.item_id]
+    if inventory_item.equipped == equip:
+        return stack_read(inventory_item, item)
+    if inventory_item.quantity > 1:
+        inventory_item.quantity -= 1
+        session.add(inventory_item)
+    else:
+        await session.delete(inventory_item)
+    (moved,) = await grant_items(session, player.id, {inventory_item.item_id: 1}, equipped=equip)
+    await shift_effective_stats(session, player, item_bonuses(item, 1 if equip else -1))
+    await session.commit()
+    return stack_read(moved, item)
 
 
 @router.post("/equip/{inventory_id}", response_model=InventoryItemRead)
-def equip_item(
+async def equip_item(
     inventory_id: int,
     current_player: Player = Depends(get_current_player),
-    session: Session = Depends(get_session),
-) -> InventoryItem:
-    inventory_item = session.get(InventoryItem, inventory_id)
-    if not inventory_item or inventory_item.player_id != current_player.id:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Item not found")
-    inventory_item.equipped = True
-    session.add(inventory_item)
-    session.commit()
-    session.refresh(inventory_item, attribute_names=["item"])
-    return inventory_item
+    session: AsyncSession = Depends(get_async_session),
+) -> InventoryItemRead:
+    return await _move_unit(session, current_player, inventory_id, equip=True)
 
 
-@router.post("/lootbox", response_model=InventoryItemRead)
-def open_loot_box(
+@router.post("/unequip/{inventory_id}", response_model=InventoryItemRead)
+async def unequip_item(
+    inventory_id: int,
     current_player: Player = Depends(get_current_player),
-    session: Session = Depends(get_session),
-) -> InventoryItem:
-    items = session.exec(select(Item)).all()
-    if not items:
+    session: AsyncSession = Depends(get_async_session),
+) -> InventoryItemRead:
+    return await _move_unit(session, current_player, inventory_id, equip=False)
+
+
+async def _open_boxes(session: AsyncSession, player: Player, count: int) -> List[InventoryItemRead]:
+    catalog = await catalog_cache.snapshot(session)
+    drops = Counter(item.id for item in catalog.draw_loot(count))
+    if not drops:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No items available")
-    weights = [
-        5 if item.category == ItemCategory.WEAPON else 3 if item.category == ItemCategory.EQUIPMENT else 1
-        for item in items
-    ]
-    item = random.choices(items, weights=weights, k=1)[0]
-    inventory_item = InventoryItem(player_id=current_player.id, item_id=item.id, quantity=1)
-    session.add(inventory_item)
-    session.commit()
-    session.refresh(inventory_item, attribute_names=["item"])
-    return inventory_item
+    stacks = await grant_items(session, player.id, drops)
+    await session.commit()
+    return [stack_read(stack, catalog.items[stack.item_id]) for stack in stacks]
+
+
+@router.post("/lootbox", response_model=InventoryItemRead)
+async def open_loot_box(
+    current_player: Player = Depends(get_current_player),
+    session: AsyncSession = Depends(get_async_session),
+) -> InventoryItemRead:
+    return (await _open_boxes(session, current_player, 1))[0]
+
+
+@router.post("/lootbox/open", response_model=List[InventoryItemRead])
+async def open_loot_boxes(
+    count: int = Query(default=1, ge=1, le=settings.lootbox_max_open),
+    current_player: Player = Depends(get_current_player),
+    session: AsyncSession = Depends(get_async_session),
+) -> List[InventoryItemRead]:
+    return await _open_boxes(session, current_player, count)
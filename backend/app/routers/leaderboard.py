@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ..database import get_async_session
+from ..models import Player, Rank
+from ..schemas import LeaderboardEntry, LeaderboardPage, LeaderboardPosition
+from ..services.leaderboard import Standing, global_leaderboard
+from ..services.progression import rank_for_level, rank_level_range
+from ..utils.security import get_current_player
+
+MAX_LEADERBOARD_PAGE = 100
+
+router = APIRouter(prefix="/leaderboard", tags=["leaderboard"])
+
+
+def _bracket(rank: Optional[Rank]) -> tuple[int, int]:
+    """Position range covered by ``rank``, or the whole board without one."""
+    if rank is None:
+        return 0, len(global_leaderboard)
+    return global_leaderboard.bounds(*rank_level_range(rank))
+
+
+def _my_position(player: Player) -> int:
+    position = global_leaderboard.position(player.id)
+    if position is None:
+        # Registered through another worker since this process last loaded the board.
+        global_leaderboard.update(player.id, player.level, player.xp)
+        position = global_leaderboard.position(player.id)
+    assert position is not None
+    return position
+
+
+async def _entries(session: AsyncSession, standings: list[Standing], first_position: int) -> list[LeaderboardEntry]:
+    if not standings:
+        return []
+    usernames = dict(
+        (await session.exec(select(Player.id, Player.username).where(Player.id.in_([s.player_id for s in standings])))).all()
+    )
+    return [
+        LeaderboardEntry(
+            position=first_position + offset,
+            player_id=standing.player_id,
+            username=usernames[standing.player_id],
+            level=standing.level,
+            xp=standing.xp,
+            rank=rank_for_level(standing.level),
+        )
+        for offset, standing in enumerate(standings)
+        # Skips players deleted since the board was loaded.
+        if standing.player_id in usernames
+    ]
+
+
+@router.get("/top", response_model=LeaderboardPage)
+async def top_players(
+    limit: int = Query(default=10, ge=1, le=MAX_LEADERBOARD_PAGE),
+    rank: Optional[Rank] = None,
+    session: AsyncSession = Depends(get_async_session),
+) -> LeaderboardPage:
+    start, stop = _bracket(rank)
+    standings = global_leaderboard.slice(start, min(start + limit, stop))
+    return LeaderboardPage(total=stop - start, entries=await _entries(session, standings, 1))
+
+
+@router.get("/me", response_model=LeaderboardPosition)
+async def my_position(
+    rank: Optional[Rank] = None,
+    current_player: Player = Depends(get_current_player),
+    session: AsyncSession = Depends(get_async_session),
+) -> LeaderboardPosition:
+    position = _my_position(current_player)
+    start, stop = _bracket(rank)
+    if not start <= position < stop:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not ranked in this bracket")
+    entries = await _entries(session, global_leaderboard.slice(position, position + 1), position - start + 1)
+    return LeaderboardPosition(total=stop - start, entry=entries[0])
+
+
+@router.get("/around-me", response_model=LeaderboardPage)
+async def players_around_me(
+    radius: int = Query(default=5, ge=1, le=MAX_LEADERBOARD_PAGE // 2),
+    rank: Optional[Rank] = None,
+    current_player: Player = Depends(get_current_player),
+    session: AsyncSession = Depends(get_async_session),
+) -> LeaderboardPage:
+    position = _my_position(current_player)
+    start, stop = _bracket(rank)
+    if not start <= position < stop:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not ranked in this bracket")
+    low, high = max(start, position - radius), min(stop, position + radius + 1)
+    return LeaderboardPage(total=stop - start, entries=await _entries(session, global_leaderboard.slice(low, high), low - start + 1))
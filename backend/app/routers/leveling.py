@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Query, Response
+
+from ..schemas import LevelCurveEntry, LevelingCurveRead
+from ..utils.leveling import BASE_XP, XP_SCALE, xp_curve
+
+router = APIRouter(prefix="/leveling", tags=["leveling"])
+
+
+@router.get("/curve", response_model=LevelingCurveRead)
+async def leveling_curve(response: Response, max_level: int = Query(default=100, ge=1, le=500)) -> LevelingCurveRead:
+    # The curve only changes with a deploy, so let browsers and proxies keep it for a day.
+    response.headers["Cache-Control"] = "public, max-age=86400"
+    return LevelingCurveRead(
+        base_xp=BASE_XP,
+        xp_scale=XP_SCALE,
+        levels=[
+            LevelCurveEntry(level=level, xp_required=xp_required, total_xp=total_xp)
+            for level, xp_required, total_xp in xp_curve(max_level)
+        ],
+    )
@@ -1,27 +1,50 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session
+from typing import Union
 
-from ..database import get_session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ..database import get_async_session
 from ..models import Player
-from ..schemas import PlayerRead, PlayerUpdateStats
+from ..schemas import EffectiveStatsRead, PlayerRead, PlayerUpdateStats
+from ..services.effective_stats import STAT_NAMES, get_effective_stats, shift_effective_stats
+from ..utils.etag import etag_matches, not_modified, player_etag, validator_headers
 from ..utils.security import get_current_player
 
 router = APIRouter(prefix="/players", tags=["players"])
 
 
+def _profile(player: Player, effective_stats: EffectiveStatsRead) -> PlayerRead:
+    profile = PlayerRead.model_validate(player)
+    profile.effective_stats = effective_stats
+    return profile
+
+
 @router.get("/me", response_model=PlayerRead)
-def read_profile(current_player: Player = Depends(get_current_player)) -> Player:
-    return current_player
+async def read_profile(
+    request: Request,
+    response: Response,
+    current_player: Player = Depends(get_current_player),
+    session: AsyncSession = Depends(get_async_session),
+) -> Union[PlayerRead, Response]:
+    etag = player_etag(current_player, "profile")
+    if etag_matches(request, etag):
+        return not_modified(etag, private=True)
+    response.headers.update(validator_headers(etag, private=True))
+    effective_stats = await get_effective_stats(session, current_player)
+    if session.new:
+        # Only players who predate effective stats get a record built here.
+        await session.commit()
+    return _profile(current_player, effective_stats)
 
 
 @router.post("/me/allocate", response_model=PlayerRead)
-def allocate_stats(
+async def allocate_stats(
     payload: PlayerUpdateStats,
     current_player: Player = Depends(get_current_player),
-    session: Session = Depends(get_session),
-) -> Player:
+    session: AsyncSession = Depends(get_async_session),
+) -> PlayerRead:
     total_requested = sum([
         payload.strength - current_player.strength,
         payload.agility - current_player.agility,
@@ -34,6 +57,7 @@ def allocate_stats(
     if total_requested < 0:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cannot reduce stats")
 
+    deltas = {name: getattr(payload, name) - getattr(current_player, name) for name in STAT_NAMES}
     current_player.strength = payload.strength
     current_player.agility = payload.agility
     current_player.intelligence = payload.intelligence
@@ -42,6 +66,6 @@ def allocate_stats(
     current_player.stat_points -= total_requested
 
     session.add(current_player)
-    session.commit()
-    session.refresh(current_player)
-    return current_player
+    effective_stats = await shift_effective_stats(session, current_player, deltas)
+    await session.commit()
+    return _profile(current_player, effective_stats)
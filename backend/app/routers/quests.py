@@ -1,125 +1,219 @@
 from __future__ import annotations
 
-from typing import List
+from datetime import datetime
+from typing import Any, AsyncIterator, List, Optional, Union
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session, select
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy import or_
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from ..database import get_session
+from ..database import async_session_scope, get_async_session
 from ..models import Player, Quest, QuestStatus, QuestType
-from ..schemas import EmergencyQuestRequest, QuestCreate, QuestRead, RewardResultRead
-from ..services.progression import apply_quest_rewards
+from ..schemas import (
+    EmergencyQuestRequest,
+    QuestBatchRequest,
+    QuestBatchResult,
+    QuestCreate,
+    QuestPage,
+    QuestRead,
+    RewardResultRead,
+)
+from ..services.analytics import record_quests_failed_async
+from ..services.progression import RewardTotals, apply_quest_rewards_async, apply_reward_totals
+from ..services.quest_batch import apply_quest_batch_async
 from ..services.quests import (
-    complete_quest,
-    ensure_daily_quest,
-    fail_expired_quests,
-    trigger_emergency_quest,
-    trigger_penalty_quest,
+    complete_quest_async,
+    ensure_daily_quest_async,
+    trigger_emergency_quest_async,
+    trigger_penalty_quest_async,
 )
+from ..utils.etag import etag_matches, not_modified, player_etag, validator_headers
 from ..utils.security import get_current_player
-from ..utils.leveling import level_from_xp
+from ..utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, newest_first, quest_row_page_async
+from ..utils.rendering import Serializer, fast_path
+
+EXPORT_BATCH_SIZE = 500
+# Keyset pagination reads these from every row, whether requested or not.
+CURSOR_COLUMNS = ("started_at", "id")
 
 router = APIRouter(prefix="/quests", tags=["quests"])
+quest_serializer = Serializer(QuestRead)
 
 
 @router.get("/daily", response_model=QuestRead)
-def get_daily_quest(
+async def get_daily_quest(
     current_player: Player = Depends(get_current_player),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
 ) -> Quest:
-    quest = ensure_daily_quest(session, current_player)
+    quest = await ensure_daily_quest_async(session, current_player)
+    await session.commit()
     return quest
 
 
 @router.get("/active", response_model=List[QuestRead])
-def list_active_quests(
+async def list_active_quests(
+    request: Request,
+    response: Response,
+    fields: Optional[str] = Query(default=None, description="Comma-separated QuestRead fields to return"),
     current_player: Player = Depends(get_current_player),
-    session: Session = Depends(get_session),
-) -> List[Quest]:
-    statement = select(Quest).where(Quest.player_id == current_player.id, Quest.status == QuestStatus.ACTIVE)
-    quests = session.exec(statement).all()
-    fail_expired_quests(session, quests)
+    session: AsyncSession = Depends(get_async_session),
+) -> Union[list[dict[str, Any]], Response]:
+    fieldset = quest_serializer.fieldset(fields)
+    etag = player_etag(current_player, "active-quests", *fieldset)
+    if etag_matches(request, etag):
+        return not_modified(etag, private=True)
+    # Expired quests are failed by the deadline sweeper; hide any it has not reached yet.
+    statement = select(*quest_serializer.columns(Quest, fieldset)).where(
+        Quest.player_id == current_player.id,
+        Quest.status == QuestStatus.ACTIVE,
+        or_(Quest.deadline.is_(None), Quest.deadline >= datetime.utcnow()),
+    )
+    quests = quest_serializer.rows((await session.execute(statement)).all(), fieldset)
+    if fast_path(fields):
+        return ORJSONResponse(quests, headers=validator_headers(etag, private=True))
+    response.headers.update(validator_headers(etag, private=True))
     return quests
 
 
-@router.get("/completed", response_model=List[QuestRead])
-def list_completed_quests(
+async def _quest_page(
+    session: AsyncSession, criteria: list[Any], fields: Optional[str], cursor: Optional[str], limit: int
+) -> Union[dict[str, Any], Response]:
+    fieldset = quest_serializer.fieldset(fields)
+    statement = select(*quest_serializer.columns(Quest, fieldset, *CURSOR_COLUMNS)).where(*criteria)
+    rows, next_cursor = await quest_row_page_async(session, statement, cursor, limit)
+    page = {"items": quest_serializer.rows(rows, fieldset), "next_cursor": next_cursor}
+    return ORJSONResponse(page) if fast_path(fields) else page
+
+
+@router.get("/completed", response_model=QuestPage)
+async def list_completed_quests(
+    cursor: Optional[str] = None,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    fields: Optional[str] = Query(default=None, description="Comma-separated QuestRead fields to return"),
     current_player: Player = Depends(get_current_player),
-    session: Session = Depends(get_session),
-) -> List[Quest]:
-    statement = select(Quest).where(Quest.player_id == current_player.id, Quest.status == QuestStatus.COMPLETED)
-    return session.exec(statement).all()
+    session: AsyncSession = Depends(get_async_session),
+) -> Union[dict[str, Any], Response]:
+    criteria = [Quest.player_id == current_player.id, Quest.status == QuestStatus.COMPLETED]
+    return await _quest_page(session, criteria, fields, cursor, limit)
 
 
 @router.post("/", response_model=QuestRead, status_code=status.HTTP_201_CREATED)
-def create_custom_quest(
+async def create_custom_quest(
     payload: QuestCreate,
     current_player: Player = Depends(get_current_player),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
 ) -> Quest:
     quest = Quest(player_id=current_player.id, **payload.dict())
     session.add(quest)
-    session.commit()
-    session.refresh(quest)
+    await session.commit()
     return quest
 
 
+@router.post("/batch", response_model=QuestBatchResult)
+async def batch_update_quests(
+    payload: QuestBatchRequest,
+    current_player: Player = Depends(get_current_player),
+    session: AsyncSession = Depends(get_async_session),
+) -> QuestBatchResult:
+    """Complete or fail many quests in one request, for clients syncing offline activity."""
+    result = await apply_quest_batch_async(session, current_player, payload.operations)
+    await session.commit()
+    return result
+
+
 @router.post("/{quest_id}/complete", response_model=RewardResultRead)
-def complete_player_quest(
+async def complete_player_quest(
     quest_id: int,
     current_player: Player = Depends(get_current_player),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
 ) -> RewardResultRead:
-    quest = session.get(Quest, quest_id)
+    quest = await session.get(Quest, quest_id)
     if not quest or quest.player_id != current_player.id:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Quest not found")
     if quest.status != QuestStatus.ACTIVE:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Quest is not active")
-    complete_quest(session, quest)
-    rewards = apply_quest_rewards(session, current_player, quest)
+    await complete_quest_async(session, quest)
+    rewards = await apply_quest_rewards_async(session, current_player, quest)
+    await session.commit()
     return RewardResultRead(**rewards.__dict__)
 
 
 @router.post("/{quest_id}/fail", status_code=status.HTTP_204_NO_CONTENT)
-def fail_quest(
+async def fail_quest(
     quest_id: int,
     current_player: Player = Depends(get_current_player),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
 ) -> None:
-    quest = session.get(Quest, quest_id)
+    quest = await session.get(Quest, quest_id)
     if not quest or quest.player_id != current_player.id:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Quest not found")
+    if quest.status != QuestStatus.FAILED:
+        await record_quests_failed_async(
+            session, current_player.id, previously_completed=int(quest.status == QuestStatus.COMPLETED)
+        )
     quest.status = QuestStatus.FAILED
     session.add(quest)
-    session.commit()
     if quest.quest_type == QuestType.DAILY:
         current_player.daily_streak = 0
-    current_player.xp = max(current_player.xp - 250, 0)
-    current_player.level = level_from_xp(current_player.xp).level
-    session.add(current_player)
-    session.commit()
-    trigger_penalty_quest(session, current_player)
+    totals = RewardTotals()
+    totals.add_failure()
+    apply_reward_totals(session, current_player, totals, f"Quest failed: {quest.title}")
+    # As in the deadline sweeper, failing a penalty quest does not start another one.
+    if quest.quest_type != QuestType.PENALTY:
+        await trigger_penalty_quest_async(session, current_player)
+    await session.commit()
 
 
 @router.post("/penalty", response_model=QuestRead)
-def activate_penalty(current_player: Player = Depends(get_current_player), session: Session = Depends(get_session)) -> Quest:
-    return trigger_penalty_quest(session, current_player)
+async def activate_penalty(current_player: Player = Depends(get_current_player), session: AsyncSession = Depends(get_async_session)) -> Quest:
+    quest = await trigger_penalty_quest_async(session, current_player)
+    await session.commit()
+    return quest
 
 
 @router.post("/emergency", response_model=QuestRead)
-def create_emergency_quest(
+async def create_emergency_quest(
     payload: EmergencyQuestRequest,
     current_player: Player = Depends(get_current_player),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
 ) -> Quest:
-    return trigger_emergency_quest(session, current_player, payload.description, payload.duration_minutes, payload.priority)
+    quest = await trigger_emergency_quest_async(
+        session, current_player, payload.description, payload.duration_minutes, payload.priority
+    )
+    await session.commit()
+    return quest
 
 
-@router.get("/history", response_model=List[QuestRead])
-def quest_history(
+@router.get("/history", response_model=QuestPage)
+async def quest_history(
+    cursor: Optional[str] = None,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    fields: Optional[str] = Query(default=None, description="Comma-separated QuestRead fields to return"),
     current_player: Player = Depends(get_current_player),
-    session: Session = Depends(get_session),
-) -> List[Quest]:
-    statement = select(Quest).where(Quest.player_id == current_player.id).order_by(Quest.started_at.desc())
-    quests = session.exec(statement).all()
-    return quests
+    session: AsyncSession = Depends(get_async_session),
+) -> Union[dict[str, Any], Response]:
+    return await _quest_page(session, [Quest.player_id == current_player.id], fields, cursor, limit)
+
+
+async def _stream_history(player_id: int) -> AsyncIterator[bytes]:
+    # The request session is closed before a streamed body is sent, so the export owns its own.
+    async with async_session_scope() as session:
+        columns = quest_serializer.columns(Quest, quest_serializer.fields)
+        statement = newest_first(select(*columns).where(Quest.player_id == player_id))
+        rows = await session.stream(statement.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        fast = fast_path()
+        async for row in rows:
+            line = quest_serializer.row(row)
+            yield (orjson.dumps(line) if fast else QuestRead.model_validate(line).model_dump_json().encode()) + b"\n"
+
+
+@router.get("/history/export")
+async def export_quest_history(current_player: Player = Depends(get_current_player)) -> StreamingResponse:
+    return StreamingResponse(
+        _stream_history(current_player.id),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="quest-history.ndjson"'},
+    )
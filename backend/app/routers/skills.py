@@ -2,49 +2,63 @@ from __future__ import annotations
 
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session, select
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy.orm import selectinload
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from ..database import get_session
+from ..database import get_async_session
 from ..models import Player, PlayerSkill, Skill
 from ..schemas import PlayerSkillRead, SkillRead
+from ..services.catalog import catalog_cache
+from ..utils.etag import cached_json_response
 from ..utils.security import get_current_player
 
 router = APIRouter(prefix="/skills", tags=["skills"])
 
 
 @router.get("/", response_model=List[SkillRead])
-def list_skills(session: Session = Depends(get_session)) -> List[Skill]:
-    return session.exec(select(Skill)).all()
+async def list_skills(request: Request, session: AsyncSession = Depends(get_async_session)) -> Response:
+    catalog = await catalog_cache.snapshot(session)
+    return cached_json_response(request, catalog.skills_body, catalog.skills_etag)
 
 
 @router.get("/me", response_model=List[PlayerSkillRead])
-def list_player_skills(
+async def list_player_skills(
     current_player: Player = Depends(get_current_player),
-    session: Session = Depends(get_session),
-) -> List[PlayerSkill]:
-    statement = select(PlayerSkill).where(PlayerSkill.player_id == current_player.id)
-    return session.exec(statement).all()
+    session: AsyncSession = Depends(get_async_session),
+) -> List[PlayerSkillRead]:
+    statement = select(PlayerSkill.id, PlayerSkill.skill_id, PlayerSkill.level, PlayerSkill.equipped).where(
+        PlayerSkill.player_id == current_player.id
+    )
+    rows = (await session.execute(statement)).all()
+    # Skill details come from the in-process catalog rather than a second query.
+    skills = (await catalog_cache.snapshot(session)).skills
+    return [
+        PlayerSkillRead(id=row.id, skill=skills[row.skill_id], level=row.level, equipped=row.equipped) for row in rows
+    ]
 
 
 @router.post("/unlock/{skill_id}", response_model=PlayerSkillRead)
-def unlock_skill(
+async def unlock_skill(
     skill_id: int,
     current_player: Player = Depends(get_current_player),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
 ) -> PlayerSkill:
-    skill = session.get(Skill, skill_id)
+    skill = await session.get(Skill, skill_id)
     if not skill:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Skill not found")
     if current_player.level < skill.unlock_level:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Level too low for skill")
-    existing = session.exec(
-        select(PlayerSkill).where(PlayerSkill.player_id == current_player.id, PlayerSkill.skill_id == skill_id)
-    ).first()
+    statement = (
+        select(PlayerSkill)
+        .where(PlayerSkill.player_id == current_player.id, PlayerSkill.skill_id == skill_id)
+        .options(selectinload(PlayerSkill.skill))
+    )
+    existing = (await session.exec(statement)).first()
     if existing:
         return existing
-    player_skill = PlayerSkill(player_id=current_player.id, skill_id=skill_id)
+    player_skill = PlayerSkill(player_id=current_player.id, skill_id=skill_id, skill=skill)
     session.add(player_skill)
-    session.commit()
-    session.refresh(player_skill)
+    await session.commit()
     return player_skill
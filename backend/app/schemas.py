@@ -1,9 +1,10 @@
 from __future__ import annotations
 
+import enum
 from datetime import datetime
 from typing import Optional
 
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 
 from .models import ItemCategory, QuestStatus, QuestType, Rank, SkillType
 
@@ -17,6 +18,18 @@ class PlayerCreate(BaseModel):
     username: str
     email: EmailStr
     password: str
+    timezone: str = "UTC"
+
+
+class EffectiveStatsRead(BaseModel):
+    strength: int
+    agility: int
+    intelligence: int
+    vitality: int
+    sense: int
+
+    class Config:
+        from_attributes = True
 
 
 class PlayerRead(BaseModel):
@@ -37,6 +50,8 @@ class PlayerRead(BaseModel):
     best_streak: int
     rank: Rank
     class_name: Optional[str]
+    timezone: str
+    effective_stats: Optional[EffectiveStatsRead] = None
 
     class Config:
         from_attributes = True
@@ -69,6 +84,11 @@ class QuestRead(BaseModel):
         from_attributes = True
 
 
+class QuestPage(BaseModel):
+    items: list[QuestRead]
+    next_cursor: Optional[str] = None
+
+
 class QuestCreate(BaseModel):
     title: str
     description: str
@@ -137,6 +157,33 @@ class RewardResultRead(BaseModel):
     new_rank: str
 
 
+class QuestBatchAction(str, enum.Enum):
+    COMPLETE = "complete"
+    FAIL = "fail"
+
+
+class QuestBatchOperation(BaseModel):
+    quest_id: int
+    action: QuestBatchAction
+
+
+class QuestBatchRequest(BaseModel):
+    operations: list[QuestBatchOperation] = Field(min_length=1, max_length=100)
+
+
+class QuestBatchItemResult(BaseModel):
+    quest_id: int
+    action: QuestBatchAction
+    ok: bool
+    status: Optional[QuestStatus] = None
+    detail: Optional[str] = None
+
+
+class QuestBatchResult(BaseModel):
+    results: list[QuestBatchItemResult]
+    rewards: RewardResultRead
+
+
 class EmergencyQuestRequest(BaseModel):
     description: str
     duration_minutes: int
@@ -145,7 +192,7 @@ class EmergencyQuestRequest(BaseModel):
 
 class ShopPurchaseRequest(BaseModel):
     item_id: int
-    quantity: int = 1
+    quantity: int = Field(default=1, ge=1)
 
 
 class AnalyticsRead(BaseModel):
@@ -157,6 +204,27 @@ class AnalyticsRead(BaseModel):
     average_daily_xp: float
 
 
+class HistoryResolution(str, enum.Enum):
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+
+
+class AnalyticsHistoryPoint(BaseModel):
+    bucket: str
+    captured_at: datetime
+    level: int
+    xp: int
+    strength: int
+    agility: int
+    intelligence: int
+    vitality: int
+    sense: int
+    mana: int
+    quests_completed: int
+    quests_failed: int
+
+
 class AchievementRead(BaseModel):
     id: int
     name: str
@@ -165,3 +233,41 @@ class AchievementRead(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class LevelCurveEntry(BaseModel):
+    level: int
+    xp_required: int
+    total_xp: int
+
+
+class LevelingCurveRead(BaseModel):
+    base_xp: int
+    xp_scale: float
+    levels: list[LevelCurveEntry]
+
+
+class LeaderboardEntry(BaseModel):
+    position: int
+    player_id: int
+    username: str
+    level: int
+    xp: int
+    rank: Rank
+
+
+class LeaderboardPage(BaseModel):
+    total: int
+    entries: list[LeaderboardEntry]
+
+
+class LeaderboardPosition(BaseModel):
+    total: int
+    entry: LeaderboardEntry
+
+
+class DashboardRead(BaseModel):
+    player: PlayerRead
+    daily_quest: Optional[QuestRead]
+    active_quests: list[QuestRead]
+    analytics: AnalyticsRead
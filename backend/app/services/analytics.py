@@ -0,0 +1,294 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+from typing import Optional, Sequence
+
+from sqlalchemy import Integer, String, and_, cast, exists, func, insert, or_
+from sqlalchemy.sql.elements import ColumnElement
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlmodel.sql.expression import Select
+
+from ..config import get_settings
+from ..models import AnalyticsSnapshot, Player, PlayerStats, Quest, QuestStatus
+from ..schemas import AnalyticsHistoryPoint, AnalyticsRead, HistoryResolution
+
+settings = get_settings()
+
+BACKFILL_BATCH_SIZE = 500
+
+
+def _window_start(today: date) -> date:
+    return today - timedelta(days=settings.analytics_window_days - 1)
+
+
+def _prune(daily_xp: dict[str, int], today: date) -> dict[str, int]:
+    cutoff = _window_start(today).isoformat()
+    return {day: xp for day, xp in daily_xp.items() if day >= cutoff}
+
+
+async def get_or_create_stats_async(session: AsyncSession, player_id: int) -> PlayerStats:
+    stats = await session.get(PlayerStats, player_id)
+    if stats is None:
+        stats = PlayerStats(player_id=player_id)
+        session.add(stats)
+    return stats
+
+
+def _count_completion(stats: PlayerStats, quest: Quest) -> None:
+    today = datetime.utcnow().date()
+    day = (quest.completed_at or datetime.utcnow()).date()
+    # Reassign rather than mutate in place so the JSON column is flagged dirty.
+    daily_xp = _prune(stats.daily_xp or {}, today)
+    if day >= _window_start(today):
+        daily_xp[day.isoformat()] = daily_xp.get(day.isoformat(), 0) + quest.xp_reward
+    stats.daily_xp = daily_xp
+    stats.quests_completed += 1
+
+
+def _count_failures(stats: PlayerStats, count: int, previously_completed: int) -> None:
+    stats.quests_failed += count
+    stats.quests_completed = max(stats.quests_completed - previously_completed, 0)
+
+
+async def record_quest_completed_async(session: AsyncSession, quest: Quest) -> PlayerStats:
+    """Count a completion and bucket its XP; the caller commits with the quest change."""
+    stats = await get_or_create_stats_async(session, quest.player_id)
+    _count_completion(stats, quest)
+    session.add(stats)
+    return stats
+
+
+async def record_quests_failed_async(
+    session: AsyncSession, player_id: int, count: int = 1, previously_completed: int = 0
+) -> PlayerStats:
+    stats = await get_or_create_stats_async(session, player_id)
+    _count_failures(stats, count, previously_completed)
+    session.add(stats)
+    return stats
+
+
+async def record_quest_outcomes_async(
+    session: AsyncSession, player_id: int, completed: Sequence[Quest], failed: int, previously_completed: int
+) -> PlayerStats:
+    """Count a batch of completions and failures for one player against a single aggregate load."""
+    stats = await get_or_create_stats_async(session, player_id)
+    for quest in completed:
+        _count_completion(stats, quest)
+    if failed or previously_completed:
+        _count_failures(stats, failed, previously_completed)
+    session.add(stats)
+    return stats
+
+
+def record_failures_bulk(session: Session, failures: dict[int, int]) -> None:
+    """Add failure counts for many players, loading their aggregates in chunks."""
+    player_ids = sorted(failures)
+    for offset in range(0, len(player_ids), BACKFILL_BATCH_SIZE):
+        chunk = player_ids[offset : offset + BACKFILL_BATCH_SIZE]
+        existing = {
+            stats.player_id: stats
+            for stats in session.exec(select(PlayerStats).where(PlayerStats.player_id.in_(chunk))).all()
+        }
+        for player_id in chunk:
+            stats = existing.get(player_id) or PlayerStats(player_id=player_id)
+            stats.quests_failed += failures[player_id]
+            session.add(stats)
+
+
+def average_daily_xp(stats: Optional[PlayerStats], today: Optional[date] = None) -> float:
+    if stats is None:
+        return 0.0
+    window = _prune(stats.daily_xp or {}, today or datetime.utcnow().date())
+    return sum(window.values()) / settings.analytics_window_days
+
+
+def analytics_read(player: Player, stats: Optional[PlayerStats]) -> AnalyticsRead:
+    return AnalyticsRead(
+        level=player.level,
+        xp=player.xp,
+        quests_completed=stats.quests_completed if stats else 0,
+        quests_failed=stats.quests_failed if stats else 0,
+        streak=player.daily_streak,
+        average_daily_xp=average_daily_xp(stats),
+    )
+
+
+def backfill_player_stats(session: Session) -> int:
+    """Rebuild every player's aggregate from the quest table. Returns the number of players written."""
+    today = datetime.utcnow().date()
+    window_start = datetime.combine(_window_start(today), datetime.min.time())
+    written = 0
+    last_id = 0
+    while True:
+        player_ids = session.exec(
+            select(Player.id).where(Player.id > last_id).order_by(Player.id).limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not player_ids:
+            break
+        last_id = player_ids[-1]
+
+        counts: dict[int, dict[QuestStatus, int]] = {player_id: {} for player_id in player_ids}
+        count_rows = session.exec(
+            select(Quest.player_id, Quest.status, func.count())
+            .where(Quest.player_id.in_(player_ids), Quest.status.in_([QuestStatus.COMPLETED, QuestStatus.FAILED]))
+            .group_by(Quest.player_id, Quest.status)
+        ).all()
+        for player_id, quest_status, total in count_rows:
+            counts[player_id][QuestStatus(quest_status)] = total
+
+        buckets: dict[int, dict[str, int]] = {player_id: {} for player_id in player_ids}
+        day = func.date(Quest.completed_at)
+        xp_rows = session.exec(
+            select(Quest.player_id, day, func.sum(Quest.xp_reward))
+            .where(Quest.player_id.in_(player_ids), Quest.completed_at >= window_start)
+            .group_by(Quest.player_id, day)
+        ).all()
+        for player_id, bucket_day, xp in xp_rows:
+            buckets[player_id][str(bucket_day)] = int(xp)
+
+        existing = {
+            stats.player_id: stats
+            for stats in session.exec(select(PlayerStats).where(PlayerStats.player_id.in_(player_ids))).all()
+        }
+        for player_id in player_ids:
+            stats = existing.get(player_id) or PlayerStats(player_id=player_id)
+            stats.quests_completed = counts[player_id].get(QuestStatus.COMPLETED, 0)
+            stats.quests_failed = counts[player_id].get(QuestStatus.FAILED, 0)
+            stats.daily_xp = buckets[player_id]
+            session.add(stats)
+        session.commit()
+        written += len(player_ids)
+    return written
+
+
+def capture_snapshots(session: Session, batch_size: Optional[int] = None) -> int:
+    """Snapshot every player whose profile or stats changed since their latest snapshot.
+
+    Players are walked in id order in chunks and each chunk is written with one bulk insert.
+    Returns the number of snapshots written.
+    """
+    batch_size = batch_size or settings.snapshot_batch_size
+    unchanged = exists().where(
+        AnalyticsSnapshot.player_id == Player.id,
+        AnalyticsSnapshot.captured_at >= Player.updated_at,
+        or_(PlayerStats.updated_at.is_(None), AnalyticsSnapshot.captured_at >= PlayerStats.updated_at),
+    )
+    written = 0
+    last_id = 0
+    while True:
+        captured_at = datetime.utcnow()
+        rows = session.exec(
+            select(Player, PlayerStats)
+            .outerjoin(PlayerStats, PlayerStats.player_id == Player.id)
+            .where(Player.id > last_id, ~unchanged)
+            .order_by(Player.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            break
+        last_id = rows[-1][0].id
+        session.execute(
+            insert(AnalyticsSnapshot),
+            [
+                {
+                    "player_id": player.id,
+                    "captured_at": captured_at,
+                    "level": player.level,
+                    "xp": player.xp,
+                    "strength": player.strength,
+                    "agility": player.agility,
+                    "intelligence": player.intelligence,
+                    "vitality": player.vitality,
+                    "sense": player.sense,
+                    "mana": player.mana,
+                    "quests_completed": stats.quests_completed if stats else 0,
+                    "quests_failed": stats.quests_failed if stats else 0,
+                }
+                for player, stats in rows
+            ],
+        )
+        session.commit()
+        session.expunge_all()
+        written += len(rows)
+    return written
+
+
+# Weeks are ISO 8601 weeks (starting Monday, numbered within the ISO year) on every backend.
+_BUCKET_FORMATS = {
+    "sqlite": {
+        HistoryResolution.DAY: "%Y-%m-%d",
+        HistoryResolution.MONTH: "%Y-%m",
+    },
+    "postgresql": {
+        HistoryResolution.DAY: "YYYY-MM-DD",
+        HistoryResolution.WEEK: 'IYYY-"W"IW',
+        HistoryResolution.MONTH: "YYYY-MM",
+    },
+}
+
+
+def _sqlite_iso_week(column: ColumnElement[datetime]) -> ColumnElement[str]:
+    # SQLite only gained %G/%V in 3.46, so derive the ISO week from the week's Thursday, which
+    # always falls in the ISO year the week belongs to.
+    thursday = func.date(column, "-3 days", "weekday 4")
+    week = (cast(func.strftime("%j", thursday), Integer) - 1) // 7 + 1
+    return func.strftime("%Y", thursday, type_=String).concat("-W").concat(func.printf("%02d", week))
+
+
+def _bucket_expression(dialect: str, resolution: HistoryResolution) -> ColumnElement[str]:
+    if dialect == "sqlite":
+        if resolution == HistoryResolution.WEEK:
+            return _sqlite_iso_week(AnalyticsSnapshot.captured_at)
+        return func.strftime(_BUCKET_FORMATS["sqlite"][resolution], AnalyticsSnapshot.captured_at)
+    return func.to_char(AnalyticsSnapshot.captured_at, _BUCKET_FORMATS["postgresql"][resolution])
+
+
+def _history_statement(
+    dialect: str, player_id: int, resolution: HistoryResolution, limit: int
+) -> Select[tuple[str, AnalyticsSnapshot]]:
+    bucket = _bucket_expression(dialect, resolution).label("bucket")
+    latest = (
+        select(bucket, func.max(AnalyticsSnapshot.captured_at).label("captured_at"))
+        .where(AnalyticsSnapshot.player_id == player_id)
+        .group_by(bucket)
+        .order_by(bucket.desc())
+        .limit(limit)
+        .subquery()
+    )
+    return (
+        select(latest.c.bucket, AnalyticsSnapshot)
+        .join(
+            AnalyticsSnapshot,
+            and_(AnalyticsSnapshot.player_id == player_id, AnalyticsSnapshot.captured_at == latest.c.captured_at),
+        )
+        .order_by(latest.c.bucket)
+    )
+
+
+def _history_points(rows: Sequence[tuple[str, AnalyticsSnapshot]]) -> list[AnalyticsHistoryPoint]:
+    return [
+        AnalyticsHistoryPoint(
+            bucket=bucket_key,
+            captured_at=snapshot.captured_at,
+            level=snapshot.level,
+            xp=snapshot.xp,
+            strength=snapshot.strength,
+            agility=snapshot.agility,
+            intelligence=snapshot.intelligence,
+            vitality=snapshot.vitality,
+            sense=snapshot.sense,
+            mana=snapshot.mana,
+            quests_completed=snapshot.quests_completed,
+            quests_failed=snapshot.quests_failed,
+        )
+        for bucket_key, snapshot in rows
+    ]
+
+
+async def snapshot_history_async(
+    session: AsyncSession, player_id: int, resolution: HistoryResolution, limit: int
+) -> list[AnalyticsHistoryPoint]:
+    """Return the latest snapshot per time bucket, newest ``limit`` buckets in chronological order."""
+    statement = _history_statement(session.get_bind().dialect.name, player_id, resolution, limit)
+    return _history_points((await session.exec(statement)).all())
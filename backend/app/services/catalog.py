@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from threading import Lock
+from typing import Iterable, Optional
+
+from pydantic import TypeAdapter
+from sqlalchemy import event
+from sqlalchemy.orm import ORMExecuteState, Session as OrmSession
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ..config import get_settings
+from ..models import Item, Skill
+from ..schemas import ItemRead, SkillRead
+from ..utils.commit_hooks import call_after_commit
+from ..utils.etag import content_etag
+from ..utils.sampling import AliasTable
+
+settings = get_settings()
+
+CATALOG_MODELS = (Item, Skill)
+
+_items_adapter = TypeAdapter(list[ItemRead])
+_skills_adapter = TypeAdapter(list[SkillRead])
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """Immutable view of the Item and Skill tables at one catalog version."""
+
+    version: int
+    items: dict[int, ItemRead]
+    skills: dict[int, SkillRead]
+    items_body: bytes
+    items_etag: str
+    skills_body: bytes
+    skills_etag: str
+    loot_items: tuple[ItemRead, ...]
+    loot_table: Optional[AliasTable]
+
+    def draw_loot(self, count: int = 1) -> list[ItemRead]:
+        if self.loot_table is None:
+            return []
+        return [self.loot_items[index] for index in self.loot_table.sample_many(count)]
+
+
+def _build_snapshot(version: int, items: list[ItemRead], skills: list[SkillRead]) -> CatalogSnapshot:
+    weighted = [(item, settings.loot_category_weights.get(item.category.value, 0)) for item in items]
+    loot = [(item, weight) for item, weight in weighted if weight > 0]
+    items_body = _items_adapter.dump_json(items)
+    skills_body = _skills_adapter.dump_json(skills)
+    return CatalogSnapshot(
+        version=version,
+        items={item.id: item for item in items},
+        skills={skill.id: skill for skill in skills},
+        items_body=items_body,
+        # Content hashes rather than the version number, so every worker process agrees on the tag.
+        items_etag=content_etag(items_body),
+        skills_body=skills_body,
+        skills_etag=content_etag(skills_body),
+        loot_items=tuple(item for item, _ in loot),
+        # Built once per catalog version so each draw is O(1) regardless of catalog size.
+        loot_table=AliasTable([weight for _, weight in loot]) if loot else None,
+    )
+
+
+class CatalogCache:
+    """Process-local copy of the item and skill catalog, reloaded whenever its version is bumped.
+
+    Committed writes to ``Item`` or ``Skill`` through any session bump the version (see the session
+    hooks below); writes made by another process are picked up after :meth:`bump` or a restart.
+    """
+
+    def __init__(self) -> None:
+        self.version = 0
+        self.loads = 0
+        self.hits = 0
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._lock = Lock()
+
+    def bump(self) -> int:
+        with self._lock:
+            self.version += 1
+            return self.version
+
+    async def snapshot(self, session: AsyncSession) -> CatalogSnapshot:
+        current = self._snapshot
+        if current is not None and current.version == self.version:
+            self.hits += 1
+            return current
+        version = self.version
+        items = (await session.exec(select(Item).order_by(Item.id))).all()
+        skills = (await session.exec(select(Skill).order_by(Skill.id))).all()
+        snapshot = _build_snapshot(
+            version,
+            [ItemRead.model_validate(item) for item in items],
+            [SkillRead.model_validate(skill) for skill in skills],
+        )
+        with self._lock:
+            self.loads += 1
+            # A write committed while loading leaves the version ahead, so the next caller reloads.
+            if self.version == version:
+                self._snapshot = snapshot
+        return snapshot
+
+    def stats(self) -> dict[str, int]:
+        return {"version": self.version, "hits": self.hits, "loads": self.loads}
+
+
+catalog_cache = CatalogCache()
+
+
+def _touches_catalog(instances: Iterable[object]) -> bool:
+    return any(isinstance(instance, CATALOG_MODELS) for instance in instances)
+
+
+@event.listens_for(OrmSession, "after_flush")
+def _flag_catalog_flush(session: OrmSession, flush_context) -> None:  # type: ignore[no-untyped-def]
+    if _touches_catalog(session.new) or _touches_catalog(session.dirty) or _touches_catalog(session.deleted):
+        call_after_commit(session, catalog_cache.bump)
+
+
+@event.listens_for(OrmSession, "do_orm_execute")
+def _flag_catalog_statement(state: ORMExecuteState) -> None:
+    # Bulk insert/update/delete statements bypass the flush, so catch them here.
+    if (state.is_insert or state.is_update or state.is_delete) and state.bind_mapper is not None:
+        if state.bind_mapper.class_ in CATALOG_MODELS:
+            call_after_commit(state.session, catalog_cache.bump)
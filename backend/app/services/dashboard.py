@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import and_, or_
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ..models import Player, PlayerEffectiveStats, PlayerStats, Quest, QuestStatus, QuestType
+from ..schemas import DashboardRead, EffectiveStatsRead, PlayerRead, QuestRead
+from .analytics import analytics_read
+from .effective_stats import rebuild_effective_stats
+from .quests import daily_cycle, generate_daily_quest
+
+
+async def build_dashboard(session: AsyncSession, player: Player) -> DashboardRead:
+    """Everything the dashboard shows for ``player`` in two statements on the request's transaction.
+
+    One query reads today's daily quest together with the active quests, and one reads the
+    analytics counters and effective stats by primary key. A missing daily quest or effective
+    stats record is created and left for the caller to commit, as on the single endpoints.
+    """
+    now = datetime.utcnow()
+    cycle_start, _ = daily_cycle(player.timezone, now)
+    # Same visibility rule as /quests/active: expired quests wait for the deadline sweeper.
+    is_active = and_(Quest.status == QuestStatus.ACTIVE, or_(Quest.deadline.is_(None), Quest.deadline >= now))
+    is_daily = and_(Quest.quest_type == QuestType.DAILY, Quest.started_at >= cycle_start)
+    quests = (
+        await session.exec(
+            select(Quest).where(Quest.player_id == player.id, or_(is_active, is_daily)).order_by(Quest.started_at)
+        )
+    ).all()
+    daily = next((quest for quest in quests if quest.quest_type == QuestType.DAILY and quest.started_at >= cycle_start), None)
+    active = [
+        quest
+        for quest in quests
+        if quest.status == QuestStatus.ACTIVE and (quest.deadline is None or quest.deadline >= now)
+    ]
+    if daily is None:
+        # Normally created by the rollover job; this only covers players who joined mid-cycle.
+        daily = generate_daily_quest(player)
+        session.add(daily)
+        await session.flush()
+        active.append(daily)
+
+    stats, effective = (
+        await session.exec(
+            select(PlayerStats, PlayerEffectiveStats)
+            .select_from(Player)
+            .outerjoin(PlayerStats, PlayerStats.player_id == Player.id)
+            .outerjoin(PlayerEffectiveStats, PlayerEffectiveStats.player_id == Player.id)
+            .where(Player.id == player.id)
+        )
+    ).one()
+    if effective is None:
+        effective = await rebuild_effective_stats(session, player)
+
+    profile = PlayerRead.model_validate(player)
+    profile.effective_stats = EffectiveStatsRead.model_validate(effective)
+    return DashboardRead(
+        player=profile,
+        daily_quest=QuestRead.model_validate(daily),
+        active_quests=[QuestRead.model_validate(quest) for quest in active],
+        analytics=analytics_read(player, stats),
+    )
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Mapping, Optional
+
+from sqlalchemy import func, update
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlmodel.sql.expression import Select
+
+from ..models import InventoryItem, Item, Player, PlayerEffectiveStats
+from ..schemas import EffectiveStatsRead, ItemRead
+
+STAT_NAMES = ("strength", "agility", "intelligence", "vitality", "sense")
+CHECK_BATCH_SIZE = 500
+
+_effective = PlayerEffectiveStats.__table__
+
+
+@dataclass(frozen=True)
+class StatsMismatch:
+    player_id: int
+    stored: Optional[dict[str, int]]
+    expected: dict[str, int]
+
+
+def initial_effective_stats(player: Player) -> PlayerEffectiveStats:
+    """Record for a player with nothing equipped, created alongside the player."""
+    return PlayerEffectiveStats(player_id=player.id, **{name: getattr(player, name) for name in STAT_NAMES})
+
+
+def item_bonuses(item: ItemRead, units: int = 1) -> dict[str, int]:
+    return {name: getattr(item, f"{name}_bonus") * units for name in STAT_NAMES}
+
+
+def _equipped_bonus_statement(player_ids: list[int]) -> Select[tuple]:
+    """Per-player sums of equipped bonuses, weighted by stack quantity."""
+    return (
+        select(
+            InventoryItem.player_id,
+            *(func.sum(InventoryItem.quantity * getattr(Item, f"{name}_bonus")) for name in STAT_NAMES),
+        )
+        .join(Item, Item.id == InventoryItem.item_id)
+        .where(InventoryItem.player_id.in_(player_ids), InventoryItem.equipped.is_(True))
+        .group_by(InventoryItem.player_id)
+    )
+
+
+def _expected(player: Player, bonuses: Optional[tuple]) -> dict[str, int]:
+    return {
+        name: getattr(player, name) + (int(bonuses[index] or 0) if bonuses else 0)
+        for index, name in enumerate(STAT_NAMES)
+    }
+
+
+async def rebuild_effective_stats(session: AsyncSession, player: Player) -> PlayerEffectiveStats:
+    """Recompute one player's record from base stats and equipped inventory; the caller commits."""
+    await session.flush()
+    bonuses = (await session.exec(_equipped_bonus_statement([player.id]))).first()
+    expected = _expected(player, bonuses[1:] if bonuses else None)
+    stats = await session.get(PlayerEffectiveStats, player.id)
+    if stats is None:
+        stats = PlayerEffectiveStats(player_id=player.id)
+    for name, value in expected.items():
+        setattr(stats, name, value)
+    session.add(stats)
+    return stats
+
+
+async def shift_effective_stats(
+    session: AsyncSession, player: Player, deltas: Mapping[str, int]
+) -> EffectiveStatsRead:
+    """Add ``deltas`` to the stored record with one atomic UPDATE, rebuilding it if it is missing."""
+    # The profile embeds these stats, so its player-derived ETag has to move with them.
+    player.updated_at = datetime.utcnow()
+    session.add(player)
+    result = await session.execute(
+        update(_effective)
+        .where(_effective.c.player_id == player.id)
+        .values({name: _effective.c[name] + delta for name, delta in deltas.items()})
+        .returning(*_effective.c)
+    )
+    row = result.first()
+    if row is None:
+        # Players created before the record existed get it built on first use.
+        return EffectiveStatsRead.model_validate(await rebuild_effective_stats(session, player))
+    return EffectiveStatsRead.model_validate(dict(row._mapping))
+
+
+async def get_effective_stats(session: AsyncSession, player: Player) -> EffectiveStatsRead:
+    """Read the stored record; a missing one is rebuilt and left pending for the caller to commit."""
+    stats = await session.get(PlayerEffectiveStats, player.id)
+    if stats is None:
+        stats = await rebuild_effective_stats(session, player)
+    return EffectiveStatsRead.model_validate(stats)
+
+
+def check_effective_stats(session: Session, fix: bool = False, batch_size: int = CHECK_BATCH_SIZE) -> list[StatsMismatch]:
+    """Recompute every player's effective stats from scratch and report records that disagree.
+
+    With ``fix`` the stored records are overwritten (or created) with the recomputed values,
+    committing once per batch of players.
+    """
+    mismatches: list[StatsMismatch] = []
+    last_id = 0
+    while True:
+        players = session.exec(select(Player).where(Player.id > last_id).order_by(Player.id).limit(batch_size)).all()
+        if not players:
+            break
+        last_id = players[-1].id
+        player_ids = [player.id for player in players]
+        bonuses = {row[0]: row[1:] for row in session.exec(_equipped_bonus_statement(player_ids)).all()}
+        stored = {
+            stats.player_id: stats
+            for stats in session.exec(
+                select(PlayerEffectiveStats).where(PlayerEffectiveStats.player_id.in_(player_ids))
+            ).all()
+        }
+        for player in players:
+            expected = _expected(player, bonuses.get(player.id))
+            record = stored.get(player.id)
+            current = {name: getattr(record, name) for name in STAT_NAMES} if record else None
+            if current == expected:
+                continue
+            mismatches.append(StatsMismatch(player_id=player.id, stored=current, expected=expected))
+            if fix:
+                record = record or PlayerEffectiveStats(player_id=player.id)
+                for name, value in expected.items():
+                    setattr(record, name, value)
+                session.add(record)
+        if fix:
+            session.commit()
+        session.expunge_all()
+    return mismatches
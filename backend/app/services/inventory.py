@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from typing import Mapping, Sequence, Union
+
+from sqlalchemy import Row, delete, func, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ..models import InventoryItem, Player
+from ..schemas import InventoryItemRead, ItemRead
+
+COMPACTION_BATCH_SIZE = 500
+
+STACK_KEY = ("player_id", "item_id", "equipped")
+
+_inventory = InventoryItem.__table__
+_UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def stack_read(stack: Union[InventoryItem, Row], item: ItemRead) -> InventoryItemRead:
+    """Build the response for a stack from an ORM row or an upsert's RETURNING row plus its catalog item."""
+    return InventoryItemRead(id=stack.id, item=item, quantity=stack.quantity, equipped=stack.equipped)
+
+
+async def grant_items(
+    session: AsyncSession, player_id: int, quantities: Mapping[int, int], equipped: bool = False
+) -> Sequence[Row]:
+    """Add ``quantities`` (item id -> count) to the player's stacks with one upsert.
+
+    Returns ``(id, item_id, quantity, equipped)`` for every touched stack; the caller commits.
+    """
+    insert = _UPSERT_INSERTS[session.get_bind().dialect.name]
+    statement = insert(_inventory).values(
+        [
+            {"player_id": player_id, "item_id": item_id, "quantity": quantity, "equipped": equipped}
+            for item_id, quantity in quantities.items()
+        ]
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=list(STACK_KEY),
+        set_={"quantity": _inventory.c.quantity + statement.excluded.quantity},
+    ).returning(_inventory.c.id, _inventory.c.item_id, _inventory.c.quantity, _inventory.c.equipped)
+    return (await session.execute(statement)).all()
+
+
+def compact_inventory(session: Session, batch_size: int = COMPACTION_BATCH_SIZE) -> int:
+    """Merge duplicate ``(player_id, item_id, equipped)`` rows into their oldest row, one player batch at a time.
+
+    Quantities are summed into the surviving row and each batch commits on its own, so the job
+    can run against a live database. Returns the number of rows removed.
+    """
+    removed = 0
+    last_id = 0
+    while True:
+        player_ids = session.exec(
+            select(Player.id).where(Player.id > last_id).order_by(Player.id).limit(batch_size)
+        ).all()
+        if not player_ids:
+            break
+        last_id = player_ids[-1]
+
+        stack = (InventoryItem.player_id, InventoryItem.item_id, InventoryItem.equipped)
+        duplicates = session.exec(
+            select(func.min(InventoryItem.id), func.sum(InventoryItem.quantity))
+            .where(InventoryItem.player_id.in_(player_ids))
+            .group_by(*stack)
+            .having(func.count() > 1)
+        ).all()
+        if duplicates:
+            session.execute(
+                update(InventoryItem), [{"id": keeper, "quantity": total} for keeper, total in duplicates]
+            )
+            keepers = (
+                select(func.min(InventoryItem.id)).where(InventoryItem.player_id.in_(player_ids)).group_by(*stack)
+            )
+            result = session.execute(
+                delete(InventoryItem).where(InventoryItem.player_id.in_(player_ids), InventoryItem.id.not_in(keepers))
+            )
+            removed += result.rowcount or 0
+        session.commit()
+    return removed
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from threading import Lock
+from typing import Iterable, Optional, Union
+
+from sqlalchemy.orm import Session as OrmSession
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ..models import Player
+from ..utils.commit_hooks import call_after_commit
+from ..utils.order_statistics import OrderStatisticTree
+
+
+@dataclass(frozen=True)
+class Standing:
+    player_id: int
+    level: int
+    xp: int
+
+
+def _key(player_id: int, level: int, xp: int) -> tuple[int, int, int]:
+    # Ascending key order is the leaderboard order: highest level, then most XP, then oldest player.
+    return (-level, -xp, player_id)
+
+
+def _standing(key: tuple[int, int, int]) -> Standing:
+    return Standing(player_id=key[2], level=-key[0], xp=-key[1])
+
+
+class Leaderboard:
+    """Process-local ranking of every player by level and XP.
+
+    Positions are zero-based. ``bounds`` turns a level range into a position range, so a rank
+    bracket is just a contiguous slice of the global ordering.
+    """
+
+    def __init__(self) -> None:
+        self._tree: OrderStatisticTree[tuple[int, int, int]] = OrderStatisticTree()
+        self._keys: dict[int, tuple[int, int, int]] = {}
+        self._lock = Lock()
+        self.updates = 0
+        self.reloads = 0
+
+    def replace(self, standings: Iterable[tuple[int, int, int]]) -> None:
+        """Swap in a full ranking of ``(player_id, level, xp)`` rows read from the database."""
+        keys = {player_id: _key(player_id, level, xp) for player_id, level, xp in standings}
+        tree = OrderStatisticTree(keys.values())
+        with self._lock:
+            self._tree, self._keys = tree, keys
+            self.reloads += 1
+
+    def update(self, player_id: int, level: int, xp: int) -> None:
+        key = _key(player_id, level, xp)
+        with self._lock:
+            previous = self._keys.get(player_id)
+            if previous == key:
+                return
+            if previous is not None:
+                self._tree.discard(previous)
+            self._tree.add(key)
+            self._keys[player_id] = key
+            self.updates += 1
+
+    def position(self, player_id: int) -> Optional[int]:
+        with self._lock:
+            key = self._keys.get(player_id)
+            return None if key is None else self._tree.count_less(key)
+
+    def bounds(self, min_level: Optional[int] = None, max_level: Optional[int] = None) -> tuple[int, int]:
+        """Position range ``[start, stop)`` of players whose level lies in ``[min_level, max_level]``."""
+        with self._lock:
+            # A one-element tuple sorts before every full key sharing its first element.
+            start = 0 if max_level is None else self._tree.count_less((-max_level,))
+            stop = len(self._tree) if min_level is None else self._tree.count_less((1 - min_level,))
+        return start, max(start, stop)
+
+    def slice(self, start: int, stop: int) -> list[Standing]:
+        with self._lock:
+            return [_standing(key) for key in self._tree.slice(start, stop)]
+
+    def __len__(self) -> int:
+        return len(self._tree)
+
+    def stats(self) -> dict[str, int]:
+        return {"players": len(self), "updates": self.updates, "reloads": self.reloads}
+
+
+global_leaderboard = Leaderboard()
+
+
+def load_leaderboard(session: Session) -> int:
+    """Rebuild the in-memory leaderboard from the ``(level, xp)`` index. Returns the player count."""
+    rows = session.exec(select(Player.id, Player.level, Player.xp).order_by(Player.level.desc(), Player.xp.desc())).all()
+    global_leaderboard.replace(rows)
+    return len(rows)
+
+
+def track_player(session: Union[OrmSession, AsyncSession], player: Player) -> None:
+    """Move ``player`` to their new place on the leaderboard once the session commits."""
+    player_id, level, xp = player.id, player.level, player.xp
+    call_after_commit(session, lambda: global_leaderboard.update(player_id, level, xp))
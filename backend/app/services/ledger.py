@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Union
+
+from sqlalchemy.orm import Session as OrmSession
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ..config import get_settings
+from ..utils.batching import BatchWriter
+from ..utils.commit_hooks import call_after_commit
+
+settings = get_settings()
+
+
+@dataclass(frozen=True)
+class LedgerEntry:
+    """One XP/currency change, written to the ``Transaction`` table by the ledger writer."""
+
+    player_id: int
+    description: str
+    delta_xp: int = 0
+    delta_currency: int = 0
+    created_at: datetime = field(default_factory=datetime.utcnow)
+
+
+ledger_writer: BatchWriter[LedgerEntry] = BatchWriter(
+    "ledger-writer",
+    batch_size=settings.ledger_batch_size,
+    flush_interval_seconds=settings.ledger_flush_seconds,
+    max_queue=settings.ledger_max_queue,
+)
+
+
+def record_ledger_entry(session: Union[OrmSession, AsyncSession], entry: LedgerEntry) -> None:
+    """Stage ``entry`` on the session; it reaches the ledger queue only if the session commits."""
+    call_after_commit(session, lambda: ledger_writer.push([entry]))
@@ -1,11 +1,15 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import Optional, Union
 
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from ..models import Player, Quest, QuestType, Rank
 from ..utils.leveling import level_from_xp
+from .leaderboard import track_player
+from .ledger import LedgerEntry, record_ledger_entry
 
 
 @dataclass
@@ -37,27 +41,105 @@ def _calculate_rank(level: int) -> str:
     return rank
 
 
-def apply_quest_rewards(session: Session, player: Player, quest: Quest) -> RewardResult:
-    xp_before = player.xp
+def rank_for_level(level: int) -> Rank:
+    return Rank(_calculate_rank(level))
+
+
+def rank_level_range(rank: Rank) -> tuple[Optional[int], Optional[int]]:
+    """Levels covered by ``rank`` as ``(min_level, max_level)``; ``None`` leaves that end open."""
+    names = [name for name, _ in RANK_THRESHOLDS]
+    index = names.index(rank.value)
+    min_level = RANK_THRESHOLDS[index][1] if index > 0 else None
+    max_level = RANK_THRESHOLDS[index + 1][1] - 1 if index + 1 < len(RANK_THRESHOLDS) else None
+    return min_level, max_level
+
+
+# Every completion also restores a little mana; every failure costs a fixed amount of XP.
+QUEST_MANA_REWARD = 10
+FAIL_XP_PENALTY = 250
+
+
+@dataclass
+class RewardTotals:
+    """Summed reward deltas, so many quest outcomes can be applied to a player at once."""
+
+    xp: int = 0
+    stat_points: int = 0
+    currency: int = 0
+    mana: int = 0
+
+    def add_completion(self, quest: Quest) -> None:
+        self.xp += quest.xp_reward
+        self.stat_points += quest.stat_reward
+        self.currency += quest.currency_reward
+        self.mana += QUEST_MANA_REWARD
+
+    def add_failure(self) -> None:
+        self.xp -= FAIL_XP_PENALTY
+
+
+def _grant(player: Player, totals: RewardTotals) -> RewardResult:
     level_before = player.level
-    player.xp += quest.xp_reward
-    player.stat_points += quest.stat_reward
-    player.mana += 10
-    player.currency += quest.currency_reward
+    player.xp = max(player.xp + totals.xp, 0)
+    player.stat_points += totals.stat_points
+    player.mana += totals.mana
+    player.currency += totals.currency
     player.level = level_from_xp(player.xp).level
-    levels_gained = max(player.level - level_before, 0)
-    leveled_up = player.level > level_before
     new_rank = _calculate_rank(player.level)
     player.rank = Rank(new_rank)
+    return RewardResult(
+        leveled_up=player.level > level_before,
+        levels_gained=max(player.level - level_before, 0),
+        stat_points_awarded=totals.stat_points,
+        new_rank=new_rank,
+    )
+
+
+def _grant_rewards(player: Player, quest: Quest) -> RewardResult:
+    totals = RewardTotals()
+    totals.add_completion(quest)
+    rewards = _grant(player, totals)
     if quest.quest_type == QuestType.DAILY:
         player.daily_streak += 1
         player.best_streak = max(player.best_streak, player.daily_streak)
+    return rewards
+
+
+def _reward_entry(player: Player, quest: Quest) -> LedgerEntry:
+    return LedgerEntry(
+        player_id=player.id,
+        description=f"Quest completed: {quest.title}",
+        delta_xp=quest.xp_reward,
+        delta_currency=quest.currency_reward,
+    )
+
+
+async def apply_quest_rewards_async(session: AsyncSession, player: Player, quest: Quest) -> RewardResult:
+    rewards = _grant_rewards(player, quest)
     session.add(player)
-    session.commit()
-    session.refresh(player)
-    return RewardResult(
-        leveled_up=leveled_up,
-        levels_gained=levels_gained,
-        stat_points_awarded=quest.stat_reward,
-        new_rank=new_rank,
+    record_ledger_entry(session, _reward_entry(player, quest))
+    track_player(session, player)
+    return rewards
+
+
+def apply_reward_totals(
+    session: Union[Session, AsyncSession], player: Player, totals: RewardTotals, description: str
+) -> RewardResult:
+    """Apply summed deltas with a single level and rank recalculation and one ledger entry.
+
+    XP is clamped at zero once, after the whole sum, rather than after each failure.
+    """
+    xp_before, currency_before = player.xp, player.currency
+    rewards = _grant(player, totals)
+    session.add(player)
+    record_ledger_entry(
+        session,
+        LedgerEntry(
+            player_id=player.id,
+            description=description,
+            delta_xp=player.xp - xp_before,
+            delta_currency=player.currency - currency_before,
+        ),
     )
+    track_player(session, player)
+    return rewards
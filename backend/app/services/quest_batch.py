@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Sequence
+
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ..models import Player, Quest, QuestStatus, QuestType
+from ..schemas import QuestBatchAction, QuestBatchItemResult, QuestBatchOperation, QuestBatchResult, RewardResultRead
+from .analytics import record_quest_outcomes_async
+from .progression import RewardTotals, apply_reward_totals
+from .quests import trigger_penalty_quest_async
+
+
+async def apply_quest_batch_async(
+    session: AsyncSession, player: Player, operations: Sequence[QuestBatchOperation]
+) -> QuestBatchResult:
+    """Apply many complete/fail operations for ``player`` as one unit of work; the caller commits.
+
+    Operations run in order against the player's quests, loaded with one ``IN`` query, and
+    follow the same rules as the single-quest endpoints. An operation that does not apply is
+    reported in its result and skipped. Rewards and penalties are summed and applied once, a
+    failed daily resets the streak where it falls in the sequence, and at most one penalty quest
+    is issued, as the deadline sweeper does. Failing a penalty quest never issues another.
+    """
+    quest_ids = {operation.quest_id for operation in operations}
+    statement = select(Quest).where(Quest.id.in_(quest_ids), Quest.player_id == player.id)
+    quests = {quest.id: quest for quest in (await session.exec(statement)).all()}
+
+    now = datetime.utcnow()
+    totals = RewardTotals()
+    completed: list[Quest] = []
+    failed = previously_completed = 0
+    penalised = False
+    results: list[QuestBatchItemResult] = []
+    for operation in operations:
+        quest = quests.get(operation.quest_id)
+        if quest is None:
+            results.append(
+                QuestBatchItemResult(quest_id=operation.quest_id, action=operation.action, ok=False, detail="Quest not found")
+            )
+            continue
+        if operation.action == QuestBatchAction.COMPLETE:
+            if quest.status != QuestStatus.ACTIVE:
+                results.append(
+                    QuestBatchItemResult(
+                        quest_id=quest.id,
+                        action=operation.action,
+                        ok=False,
+                        status=quest.status,
+                        detail="Quest is not active",
+                    )
+                )
+                continue
+            quest.status = QuestStatus.COMPLETED
+            quest.completed_at = now
+            completed.append(quest)
+            totals.add_completion(quest)
+            if quest.quest_type == QuestType.DAILY:
+                player.daily_streak += 1
+                player.best_streak = max(player.best_streak, player.daily_streak)
+        else:
+            if quest.status != QuestStatus.FAILED:
+                failed += 1
+                previously_completed += int(quest.status == QuestStatus.COMPLETED)
+            quest.status = QuestStatus.FAILED
+            totals.add_failure()
+            if quest.quest_type == QuestType.DAILY:
+                player.daily_streak = 0
+            penalised = penalised or quest.quest_type != QuestType.PENALTY
+        session.add(quest)
+        results.append(QuestBatchItemResult(quest_id=quest.id, action=operation.action, ok=True, status=quest.status))
+
+    if completed or failed or previously_completed:
+        await record_quest_outcomes_async(session, player.id, completed, failed, previously_completed)
+    applied = sum(result.ok for result in results)
+    if not applied:
+        unchanged = RewardResultRead(leveled_up=False, levels_gained=0, stat_points_awarded=0, new_rank=player.rank.value)
+        return QuestBatchResult(results=results, rewards=unchanged)
+    rewards = apply_reward_totals(
+        session, player, totals, f"Quest batch: {len(completed)} completed, {applied - len(completed)} failed"
+    )
+    if penalised:
+        await trigger_penalty_quest_async(session, player)
+    return QuestBatchResult(results=results, rewards=RewardResultRead(**rewards.__dict__))
@@ -1,12 +1,20 @@
 from __future__ import annotations
 
 from datetime import datetime, timedelta
-from typing import Iterable
+from typing import Iterable, Optional
 
 import pendulum
+from sqlalchemy import event, exists, insert, literal, update
+from sqlalchemy.orm import Session as OrmSession
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlmodel.sql.expression import SelectOfScalar
 
+from ..config import get_settings
 from ..models import Player, Quest, QuestStatus, QuestType
+from .analytics import record_failures_bulk, record_quest_completed_async
+
+settings = get_settings()
 
 DAILY_TASKS = [
     ("100 push-ups", "Complete one hundred push-ups."),
@@ -21,81 +29,176 @@ def _base_daily_description() -> str:
     return f"Complete the following preparation routine today:\n{steps}"
 
 
+def _daily_quest_values() -> dict[str, object]:
+    return {
+        "title": "Preparation To Become Powerful",
+        "description": _base_daily_description(),
+        "quest_type": QuestType.DAILY,
+        "status": QuestStatus.ACTIVE,
+        "xp_reward": 750,
+        "stat_reward": 5,
+        "loot_box_reward": True,
+        "currency_reward": 150,
+        "difficulty": "D",
+    }
+
+
+def daily_cycle(timezone: str, now: Optional[datetime] = None) -> tuple[datetime, datetime]:
+    """Return the naive-UTC ``(start, end)`` of the daily cycle containing ``now`` in ``timezone``.
+
+    Cycles begin at ``Settings.daily_reset_hour`` local time rather than midnight.
+    """
+    local_now = pendulum.instance(now or datetime.utcnow(), tz="UTC").in_timezone(timezone)
+    start = local_now.start_of("day").add(hours=settings.daily_reset_hour)
+    if local_now < start:
+        start = start.subtract(days=1)
+    end = start.add(days=1)
+    return start.in_timezone("UTC").naive(), end.in_timezone("UTC").naive()
+
+
 def generate_daily_quest(player: Player) -> Quest:
-    today = pendulum.now().start_of("day")
-    deadline = today.add(days=1)
-    return Quest(
-        player_id=player.id,
-        title="Preparation To Become Powerful",
-        description=_base_daily_description(),
-        quest_type=QuestType.DAILY,
-        xp_reward=750,
-        stat_reward=5,
-        loot_box_reward=True,
-        currency_reward=150,
-        deadline=deadline,
-        difficulty="D",
-    )
+    _, deadline = daily_cycle(player.timezone)
+    return Quest(player_id=player.id, deadline=deadline, **_daily_quest_values())
 
 
-def ensure_daily_quest(session: Session, player: Player) -> Quest:
-    today = pendulum.now().start_of("day")
-    statement = select(Quest).where(
+def _current_daily_statement(player: Player) -> SelectOfScalar[Quest]:
+    cycle_start, _ = daily_cycle(player.timezone)
+    return select(Quest).where(
         Quest.player_id == player.id,
         Quest.quest_type == QuestType.DAILY,
-        Quest.started_at >= today.naive(),
+        Quest.started_at >= cycle_start,
     )
-    quest = session.exec(statement).one_or_none()
+
+
+async def ensure_daily_quest_async(session: AsyncSession, player: Player) -> Quest:
+    quest = (await session.exec(_current_daily_statement(player))).first()
     if quest:
         return quest
 
+    # Normally created by the rollover job; this only covers players who joined mid-cycle.
     quest = generate_daily_quest(player)
     session.add(quest)
-    session.commit()
-    session.refresh(quest)
+    await session.flush()
     return quest
 
 
-def complete_quest(session: Session, quest: Quest) -> Quest:
-    quest.status = QuestStatus.COMPLETED
-    quest.completed_at = datetime.utcnow()
-    session.add(quest)
-    session.commit()
-    session.refresh(quest)
-    return quest
-
+def rollover_daily_quests(session: Session, timezone: str, now: Optional[datetime] = None) -> int:
+    """Create the current cycle's daily quest for every player in ``timezone`` with one INSERT ... SELECT.
 
-def fail_expired_quests(session: Session, quests: Iterable[Quest]) -> None:
-    for quest in quests:
-        if quest.deadline and quest.deadline < datetime.utcnow() and quest.status == QuestStatus.ACTIVE:
-            quest.status = QuestStatus.FAILED
-            session.add(quest)
-    session.commit()
+    Players who already have a daily quest for the cycle are skipped, so re-running is harmless.
+    """
+    now = now or datetime.utcnow()
+    cycle_start, cycle_end = daily_cycle(timezone, now)
+    columns = Quest.__table__.c
+    values = {**_daily_quest_values(), "deadline": cycle_end, "started_at": max(now, cycle_start)}
+    already_issued = exists().where(
+        Quest.player_id == Player.id,
+        Quest.quest_type == QuestType.DAILY,
+        Quest.started_at >= cycle_start,
+    )
+    # Same predicate as the insert, so it must run first while no quest exists yet.
+    session.execute(
+        update(Player)
+        .where(Player.timezone == timezone, ~already_issued)
+        .values(quest_version=Player.quest_version + 1)
+    )
+    source = select(
+        Player.id, *(literal(value, type_=columns[name].type) for name, value in values.items())
+    ).where(Player.timezone == timezone, ~already_issued)
+    result = session.execute(insert(Quest).from_select(["player_id", *values], source))
+    return result.rowcount or 0
 
 
-def trigger_penalty_quest(session: Session, player: Player) -> Quest:
-    deadline = datetime.utcnow() + timedelta(hours=4)
-    quest = Quest(
-        player_id=player.id,
-        title="Survival Quest",
-        description="Survive the penalty zone for four hours. Endure high intensity interval training and mental resilience drills.",
-        quest_type=QuestType.PENALTY,
-        xp_reward=500,
-        stat_reward=2,
-        loot_box_reward=False,
-        currency_reward=0,
-        deadline=deadline,
-        difficulty="B",
-    )
+async def complete_quest_async(session: AsyncSession, quest: Quest) -> Quest:
+    quest.status = QuestStatus.COMPLETED
+    quest.completed_at = datetime.utcnow()
     session.add(quest)
-    session.commit()
-    session.refresh(quest)
+    await record_quest_completed_async(session, quest)
     return quest
 
 
-def trigger_emergency_quest(session: Session, player: Player, description: str, duration_minutes: int, priority: str = "A") -> Quest:
+SWEEP_CHUNK_SIZE = 500
+
+
+def bump_quest_versions(session: Session, player_ids: Iterable[int]) -> None:
+    """Invalidate the quest validators of players whose quests a bulk statement changed.
+
+    Quest changes that go through the ORM are picked up by the flush hook below instead.
+    """
+    ids = sorted(set(player_ids))
+    for offset in range(0, len(ids), SWEEP_CHUNK_SIZE):
+        session.execute(
+            update(Player)
+            .where(Player.id.in_(ids[offset : offset + SWEEP_CHUNK_SIZE]))
+            .values(quest_version=Player.quest_version + 1)
+        )
+
+
+def _penalty_quest_values(now: datetime) -> dict[str, object]:
+    return {
+        "title": "Survival Quest",
+        "description": "Survive the penalty zone for four hours. Endure high intensity interval training and mental resilience drills.",
+        "quest_type": QuestType.PENALTY,
+        "status": QuestStatus.ACTIVE,
+        "xp_reward": 500,
+        "stat_reward": 2,
+        "loot_box_reward": False,
+        "currency_reward": 0,
+        "deadline": now + timedelta(hours=4),
+        "started_at": now,
+        "difficulty": "B",
+    }
+
+
+def sweep_expired_quests(session: Session, now: Optional[datetime] = None) -> int:
+    """Fail every active quest past its deadline with one set-based UPDATE.
+
+    Players who let a daily lapse lose their streak, and every player with an expired
+    non-penalty quest is sent to the penalty zone; both are applied in bulk. Returns the
+    number of quests failed.
+    """
+    now = now or datetime.utcnow()
+    expired = session.execute(
+        update(Quest)
+        .where(Quest.status == QuestStatus.ACTIVE, Quest.deadline < now)
+        .values(status=QuestStatus.FAILED)
+        .returning(Quest.player_id, Quest.quest_type)
+    ).all()
+    if not expired:
+        return 0
+
+    failures: dict[int, int] = {}
+    streak_resets: set[int] = set()
+    penalised: set[int] = set()
+    for player_id, quest_type in expired:
+        failures[player_id] = failures.get(player_id, 0) + 1
+        if quest_type == QuestType.DAILY:
+            streak_resets.add(player_id)
+        if quest_type != QuestType.PENALTY:
+            penalised.add(player_id)
+
+    reset_ids = sorted(streak_resets)
+    for offset in range(0, len(reset_ids), SWEEP_CHUNK_SIZE):
+        session.execute(
+            update(Player)
+            .where(Player.id.in_(reset_ids[offset : offset + SWEEP_CHUNK_SIZE]))
+            .values(daily_streak=0)
+        )
+    if penalised:
+        penalty = _penalty_quest_values(now)
+        session.execute(insert(Quest), [{"player_id": player_id, **penalty} for player_id in sorted(penalised)])
+    bump_quest_versions(session, failures)
+    record_failures_bulk(session, failures)
+    return len(expired)
+
+
+def _penalty_quest(player: Player) -> Quest:
+    return Quest(player_id=player.id, **_penalty_quest_values(datetime.utcnow()))
+
+
+def _emergency_quest(player: Player, description: str, duration_minutes: int, priority: str) -> Quest:
     deadline = datetime.utcnow() + timedelta(minutes=duration_minutes)
-    quest = Quest(
+    return Quest(
         player_id=player.id,
         title="Kill the Enemies",
         description=description,
@@ -107,7 +210,30 @@ def trigger_emergency_quest(session: Session, player: Player, description: str,
         deadline=deadline,
         difficulty=priority,
     )
+
+
+async def trigger_penalty_quest_async(session: AsyncSession, player: Player) -> Quest:
+    quest = _penalty_quest(player)
+    session.add(quest)
+    await session.flush()
+    return quest
+
+
+async def trigger_emergency_quest_async(
+    session: AsyncSession, player: Player, description: str, duration_minutes: int, priority: str = "A"
+) -> Quest:
+    quest = _emergency_quest(player, description, duration_minutes, priority)
     session.add(quest)
-    session.commit()
-    session.refresh(quest)
+    await session.flush()
     return quest
+
+
+@event.listens_for(OrmSession, "before_flush")
+def _bump_versions_for_flushed_quests(session: OrmSession, flush_context, instances) -> None:  # type: ignore[no-untyped-def]
+    changed = [*session.new, *(obj for obj in session.dirty if session.is_modified(obj)), *session.deleted]
+    player_ids = {obj.player_id for obj in changed if isinstance(obj, Quest) and obj.player_id is not None}
+    for player_id in player_ids:
+        # Usually already in the identity map as the current player, so no extra query.
+        player = session.get(Player, player_id)
+        if player is not None:
+            player.quest_version = (player.quest_version or 0) + 1
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timezone as dt_timezone
+from typing import Optional
+
+from sqlmodel import Session, select
+
+from ..models import Player
+from .quests import daily_cycle, rollover_daily_quests
+
+logger = logging.getLogger(__name__)
+
+SLOT_SECONDS = 15 * 60  # UTC offsets are multiples of 15 minutes.
+WHEEL_SLOTS = 24 * 60 * 60 // SLOT_SECONDS
+
+
+def _slot_for(moment: datetime) -> int:
+    return int(moment.replace(tzinfo=dt_timezone.utc).timestamp()) // SLOT_SECONDS
+
+
+class RolloverWheel:
+    """Timing wheel that fires each timezone bucket's daily rollover once per cycle.
+
+    Every timezone sits in the slot of its next local reset. ``tick`` walks the slots between
+    the previous tick and now, runs the bulk rollover for each due bucket, and re-schedules it
+    for its following reset, so a bucket is never fired twice for the same cycle.
+    """
+
+    def __init__(self) -> None:
+        self._slots: list[dict[str, datetime]] = [{} for _ in range(WHEEL_SLOTS)]
+        self._scheduled: dict[str, datetime] = {}
+        self._cursor: Optional[int] = None
+
+    def schedule(self, timezone: str, now: datetime) -> None:
+        _, fire_at = daily_cycle(timezone, now)
+        previous = self._scheduled.get(timezone)
+        if previous is not None:
+            self._slots[_slot_for(previous) % WHEEL_SLOTS].pop(timezone, None)
+        self._scheduled[timezone] = fire_at
+        self._slots[_slot_for(fire_at) % WHEEL_SLOTS][timezone] = fire_at
+
+    def sync_timezones(self, session: Session, now: datetime) -> list[str]:
+        """Schedule timezones that appeared since the last tick and return them."""
+        timezones = session.exec(select(Player.timezone).distinct()).all()
+        added = [timezone for timezone in timezones if timezone not in self._scheduled]
+        for timezone in added:
+            self.schedule(timezone, now)
+        return added
+
+    def tick(self, session: Session, now: Optional[datetime] = None) -> int:
+        now = now or datetime.utcnow()
+        created = 0
+        # New buckets are rolled over immediately so they do not wait a full day for a quest.
+        for timezone in self.sync_timezones(session, now):
+            created += rollover_daily_quests(session, timezone, now)
+            session.commit()
+
+        current = _slot_for(now)
+        # The current slot is re-read on the next tick in case part of it was still in the future.
+        start = current if self._cursor is None else self._cursor
+        # A stalled loop never needs to revisit more than one revolution of the wheel.
+        for slot in range(max(start, current - WHEEL_SLOTS + 1), current + 1):
+            bucket = self._slots[slot % WHEEL_SLOTS]
+            for timezone, fire_at in list(bucket.items()):
+                if fire_at > now:
+                    continue
+                created += rollover_daily_quests(session, timezone, now)
+                session.commit()
+                self.schedule(timezone, now)
+        self._cursor = current
+        if created:
+            logger.info("Daily rollover created %s quests", created)
+        return created
+
+
+rollover_wheel = RolloverWheel()
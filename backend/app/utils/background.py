@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicTask:
+    """Run a blocking job on a worker thread every ``interval_seconds`` while the app is up."""
+
+    def __init__(self, name: str, job: Callable[[], object], interval_seconds: float) -> None:
+        self.name = name
+        self.job = job
+        self.interval_seconds = interval_seconds
+        self.runs = 0
+        self.failures = 0
+        self._task: Optional[asyncio.Task[None]] = None
+
+    async def _loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            await self.run_once()
+
+    async def run_once(self) -> None:
+        try:
+            await asyncio.to_thread(self.job)
+            self.runs += 1
+        except Exception:  # pragma: no cover - logged and retried on the next tick
+            self.failures += 1
+            logger.exception("Background job %s failed", self.name)
+
+    def start(self) -> None:
+        if self._task is None and self.interval_seconds > 0:
+            self._task = asyncio.get_running_loop().create_task(self._loop(), name=self.name)
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
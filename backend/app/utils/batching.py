@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import deque
+from threading import Lock
+from typing import Awaitable, Callable, Generic, Iterable, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class BatchWriter(Generic[T]):
+    """In-memory write-behind queue drained to ``sink`` in batches.
+
+    A flush runs every ``flush_interval_seconds`` or as soon as ``batch_size`` items are waiting,
+    whichever comes first. A batch the sink rejects goes back to the front of the queue for the
+    next attempt. Beyond ``max_queue`` the oldest items are dropped and counted, so a database
+    outage cannot exhaust memory. ``stop`` drains everything still queued.
+    """
+
+    def __init__(self, name: str, batch_size: int, flush_interval_seconds: float, max_queue: int) -> None:
+        self.name = name
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_queue = max_queue
+        self.written = 0
+        self.batches = 0
+        self.failures = 0
+        self.dropped = 0
+        self._queue: deque[T] = deque()
+        self._lock = Lock()
+        self._sink: Optional[Callable[[list[T]], Awaitable[None]]] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stopping = False
+        self._task: Optional[asyncio.Task[None]] = None
+
+    def push(self, items: Iterable[T]) -> None:
+        with self._lock:
+            self._queue.extend(items)
+            overflow = len(self._queue) - self.max_queue
+            for _ in range(overflow):
+                self._queue.popleft()
+            depth = len(self._queue)
+        if overflow > 0:
+            self.dropped += overflow
+            logger.warning("%s queue full, dropped %s oldest entries", self.name, overflow)
+        if depth >= self.batch_size:
+            self._wake()
+
+    def _wake(self) -> None:
+        if self._loop is None or self._wakeup is None or self._loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            self._wakeup.set()
+        else:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def start(self, sink: Callable[[list[T]], Awaitable[None]]) -> None:
+        if self._task is not None:
+            return
+        self._sink = sink
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._task = self._loop.create_task(self._run(), name=self.name)
+
+    async def _run(self) -> None:
+        assert self._wakeup is not None
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def flush(self) -> int:
+        """Write everything queued so far, one batch per sink call. Returns the number of items written."""
+        if self._sink is None:
+            return 0
+        written = 0
+        while True:
+            with self._lock:
+                batch = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+            if not batch:
+                return written
+            try:
+                await self._sink(batch)
+            except Exception:  # pragma: no cover - retried on the next flush
+                with self._lock:
+                    self._queue.extendleft(reversed(batch))
+                self.failures += 1
+                logger.exception("%s failed to write a batch of %s", self.name, len(batch))
+                return written
+            self.batches += 1
+            self.written += len(batch)
+            written += len(batch)
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        # Let an in-flight batch finish rather than cancelling it half-written.
+        self._stopping = True
+        self._wake()
+        await self._task
+        self._task = None
+        await self.flush()
+
+    @property
+    def depth(self) -> int:
+        return len(self._queue)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "depth": self.depth,
+            "written": self.written,
+            "batches": self.batches,
+            "failures": self.failures,
+            "dropped": self.dropped,
+        }
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import logging
+from typing import Callable, Union
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session as OrmSession
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+_CALLBACKS = "after_commit_callbacks"
+
+
+def call_after_commit(session: Union[OrmSession, AsyncSession], callback: Callable[[], None]) -> None:
+    """Run ``callback`` once the session's current transaction commits; a rollback discards it.
+
+    For in-process side effects (caches, queues, rankings) that must never reflect data the
+    database did not keep.
+    """
+    session.info.setdefault(_CALLBACKS, []).append(callback)
+
+
+@event.listens_for(OrmSession, "after_commit")
+def _run_callbacks(session: OrmSession) -> None:
+    for callback in session.info.pop(_CALLBACKS, ()):
+        try:
+            callback()
+        except Exception:  # pragma: no cover - the commit already happened; never fail it here
+            logger.exception("after-commit callback %r failed", callback)
+
+
+@event.listens_for(OrmSession, "after_soft_rollback")
+def _discard_callbacks(session: OrmSession, previous_transaction) -> None:  # type: ignore[no-untyped-def]
+    session.info.pop(_CALLBACKS, None)
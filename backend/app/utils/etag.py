@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import hashlib
+
+from fastapi import Request, Response, status
+
+from ..models import Player
+
+
+def content_etag(body: bytes) -> str:
+    # Weak, because gzip may change the bytes on the wire while the representation stays the same.
+    return 'W/"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def weak_etag(*parts: object) -> str:
+    """Weak validator derived from version markers (ids, timestamps, counters) instead of the body."""
+    digest = hashlib.sha256("|".join(str(part) for part in parts).encode()).hexdigest()[:32]
+    return f'W/"{digest}"'
+
+
+def player_etag(player: Player, *scope: object) -> str:
+    """Validator for a per-player read model, from columns already loaded with the player.
+
+    ``updated_at`` moves on any write to the player row and ``quest_version`` on any change to
+    their quests, so a match can be answered with 304 before the endpoint queries anything else.
+    """
+    return weak_etag(player.id, player.updated_at.isoformat(), player.quest_version, *scope)
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Apply the weak comparison ``If-None-Match`` uses to decide whether the client copy is current."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in header.split(","))
+
+
+def validator_headers(etag: str, private: bool = False) -> dict[str, str]:
+    # no-cache lets clients store the body but makes them revalidate on every use.
+    if private:
+        return {"ETag": etag, "Cache-Control": "private, no-cache", "Vary": "Authorization"}
+    return {"ETag": etag, "Cache-Control": "no-cache"}
+
+
+def not_modified(etag: str, private: bool = False) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=validator_headers(etag, private))
+
+
+def cached_json_response(request: Request, body: bytes, etag: str) -> Response:
+    """Serve pre-serialised JSON, or an empty 304 when the client already holds ``etag``."""
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    return Response(content=body, media_type="application/json", headers=validator_headers(etag))
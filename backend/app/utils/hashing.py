@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from threading import BoundedSemaphore, Lock
+from typing import Any, Callable, Optional
+
+from passlib.context import CryptContext
+
+from ..config import get_settings
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+settings = get_settings()
+
+
+class HashingPoolSaturated(Exception):
+    """Raised when the hashing pool queue is full and a request should back off."""
+
+
+def _timed_call(fn: Callable[..., Any], *args: Any) -> tuple[float, Any]:
+    started = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - started, result
+
+
+def _hash_password(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def _verify_password(plain_password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+class HashingPool:
+    """Size-limited process pool for bcrypt work with a bounded admission queue.
+
+    At most ``workers + queue_size`` hashes may be pending at once; further calls fail
+    fast with :class:`HashingPoolSaturated` instead of piling up behind the pool.
+    """
+
+    def __init__(self, name: str, workers: int, queue_size: int) -> None:
+        self.name = name
+        self.workers = workers
+        self.queue_size = queue_size
+        self._slots = BoundedSemaphore(workers + queue_size)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = Lock()
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+        self._wait_seconds = 0.0
+        self._run_seconds = 0.0
+        self._max_latency = 0.0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # Spawned workers avoid inheriting the server's threads and open connections.
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise HashingPoolSaturated(self.name)
+        with self._lock:
+            self._in_flight += 1
+        started = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            run_seconds, result = await loop.run_in_executor(self._get_executor(), _timed_call, fn, *args)
+        finally:
+            latency = time.perf_counter() - started
+            self._slots.release()
+            with self._lock:
+                self._in_flight -= 1
+        with self._lock:
+            self._completed += 1
+            self._run_seconds += run_seconds
+            self._wait_seconds += max(latency - run_seconds, 0.0)
+            self._max_latency = max(self._max_latency, latency)
+        return result
+
+    async def hash_password(self, password: str) -> str:
+        return await self.run(_hash_password, password)
+
+    async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        return await self.run(_verify_password, plain_password, hashed_password)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def stats(self) -> dict[str, int | float]:
+        with self._lock:
+            completed = self._completed
+            return {
+                "workers": self.workers,
+                "queue_size": self.queue_size,
+                "in_flight": self._in_flight,
+                "completed": completed,
+                "rejected": self._rejected,
+                "avg_wait_seconds": self._wait_seconds / completed if completed else 0.0,
+                "avg_run_seconds": self._run_seconds / completed if completed else 0.0,
+                "max_latency_seconds": self._max_latency,
+            }
+
+
+hashing_pool = HashingPool(
+    "bcrypt", workers=settings.hash_pool_workers, queue_size=settings.hash_pool_queue_size
+)
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+from bisect import bisect_right
 from dataclasses import dataclass
+from threading import Lock
+from typing import Iterable
 
 
 @dataclass
@@ -13,25 +16,62 @@ class LevelInfo:
 BASE_XP = 500
 XP_SCALE = 1.25
 
+# _LEVEL_XP[i] is the XP needed to clear level i and _THRESHOLDS[i] the cumulative XP
+# needed to reach level i + 1. Index 0 is a sentinel so that levels index directly.
+_LEVEL_XP: list[int] = [0, BASE_XP]
+_THRESHOLDS: list[int] = [0, BASE_XP]
+_curve_lock = Lock()
+
+
+def _extend_curve(level: int | None = None, xp: int | None = None) -> None:
+    """Grow the precomputed curve until it covers ``level`` and/or ``xp``."""
+
+    # Readers run without the lock, so coverage is judged by _THRESHOLDS, which the writer
+    # appends to last: any level it covers already has its _LEVEL_XP entry.
+    def covered() -> bool:
+        return (level is None or len(_THRESHOLDS) > level) and (xp is None or _THRESHOLDS[-1] > xp)
+
+    if covered():
+        return
+    with _curve_lock:
+        while not covered():
+            _LEVEL_XP.append(int(_LEVEL_XP[-1] * XP_SCALE))
+            _THRESHOLDS.append(_THRESHOLDS[-1] + _LEVEL_XP[-1])
+
 
 def xp_required_for_level(level: int) -> int:
-    xp = BASE_XP
-    for _ in range(1, level):
-        xp = int(xp * XP_SCALE)
-    return xp
+    if level < 1:
+        return BASE_XP
+    _extend_curve(level=level)
+    return _LEVEL_XP[level]
 
 
 def total_xp_to_reach(level: int) -> int:
-    total = 0
-    for i in range(1, level + 1):
-        total += xp_required_for_level(i)
-    return total
+    if level < 1:
+        return 0
+    _extend_curve(level=level)
+    return _THRESHOLDS[level]
+
+
+def _lookup(xp: int) -> LevelInfo:
+    level = max(bisect_right(_THRESHOLDS, xp), 1)
+    return LevelInfo(level=level, xp_for_next=_THRESHOLDS[level] - xp, total_xp_required=_THRESHOLDS[level])
 
 
 def level_from_xp(xp: int) -> LevelInfo:
-    level = 1
-    xp_pool = xp
-    while xp_pool >= xp_required_for_level(level):
-        xp_pool -= xp_required_for_level(level)
-        level += 1
-    return LevelInfo(level=level, xp_for_next=xp_required_for_level(level) - xp_pool, total_xp_required=total_xp_to_reach(level))
+    _extend_curve(xp=xp)
+    return _lookup(xp)
+
+
+def levels_from_xp(xp_values: Iterable[int]) -> list[LevelInfo]:
+    """Resolve many XP totals at once, growing the curve a single time for the batch."""
+    values = list(xp_values)
+    if values:
+        _extend_curve(xp=max(values))
+    return [_lookup(xp) for xp in values]
+
+
+def xp_curve(max_level: int) -> list[tuple[int, int, int]]:
+    """Return ``(level, xp_required, total_xp)`` rows for levels 1..max_level."""
+    _extend_curve(level=max_level)
+    return [(level, _LEVEL_XP[level], _THRESHOLDS[level]) for level in range(1, max_level + 1)]
@@ -0,0 +1,283 @@
+from __future__ import annotations
+
+import math
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Optional, Sequence, TypeVar
+
+# ASGI callables, spelled out to avoid depending on starlette's private typing module.
+Scope = dict[str, Any]
+Receive = Callable[[], Any]
+Send = Callable[[dict[str, Any]], Any]
+
+Labels = tuple[str, ...]
+# ``(name suffix, labels, value)``; the suffix is "" except for histogram series.
+Sample = tuple[str, dict[str, str], float]
+# ``(name, type, description, samples)`` for one metric, as rendered on a scrape.
+Family = tuple[str, str, str, list[Sample]]
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+CHECKOUT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+class _Sharded:
+    """Per-thread storage so recording never takes a lock.
+
+    Each thread writes only to its own shard; a scrape merges every shard. A thread's shard is
+    registered under a lock once, the first time that thread records anything.
+    """
+
+    type = "untyped"
+
+    def __init__(self, name: str, description: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.description = description
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards: list[dict[Labels, Any]] = []
+        self._register = threading.Lock()
+
+    def _shard(self) -> dict[Labels, Any]:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = {}
+            with self._register:
+                self._shards.append(shard)
+        return shard
+
+    def _snapshots(self) -> list[dict[Labels, Any]]:
+        # dict.copy() is atomic under the GIL, so a shard can be read while its owner writes.
+        return [shard.copy() for shard in list(self._shards)]
+
+    def _labels(self, values: Labels) -> dict[str, str]:
+        return dict(zip(self.labelnames, values))
+
+    def collect(self) -> Family:
+        raise NotImplementedError
+
+
+class Counter(_Sharded):
+    type = "counter"
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        return sum(shard.get(labels, 0) for shard in self._snapshots())
+
+    def collect(self) -> Family:
+        totals: dict[Labels, float] = {}
+        for shard in self._snapshots():
+            for labels, value in shard.items():
+                totals[labels] = totals.get(labels, 0) + value
+        samples = [("", self._labels(labels), value) for labels, value in sorted(totals.items())]
+        return self.name, self.type, self.description, samples
+
+
+class Gauge(Counter):
+    """Up/down counter; the value is the sum of every thread's increments and decrements."""
+
+    type = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+
+class _Buckets:
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self, size: int) -> None:
+        self.counts = [0] * size
+        self.total = 0.0
+        self.count = 0
+
+
+class Histogram(_Sharded):
+    type = "histogram"
+
+    def __init__(
+        self, name: str, description: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> None:
+        super().__init__(name, description, labelnames)
+        self.bounds = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels: str) -> None:
+        shard = self._shard()
+        buckets = shard.get(labels)
+        if buckets is None:
+            # The extra slot counts observations above the largest bound.
+            buckets = shard[labels] = _Buckets(len(self.bounds) + 1)
+        buckets.counts[bisect_left(self.bounds, value)] += 1
+        buckets.total += value
+        buckets.count += 1
+
+    def collect(self) -> Family:
+        merged: dict[Labels, _Buckets] = {}
+        for shard in self._snapshots():
+            for labels, buckets in shard.items():
+                into = merged.setdefault(labels, _Buckets(len(self.bounds) + 1))
+                for index, count in enumerate(buckets.counts):
+                    into.counts[index] += count
+                into.total += buckets.total
+                into.count += buckets.count
+        samples: list[Sample] = []
+        for labels, buckets in sorted(merged.items()):
+            base = self._labels(labels)
+            cumulative = 0
+            for bound, count in zip((*self.bounds, math.inf), buckets.counts):
+                cumulative += count
+                samples.append(("_bucket", {**base, "le": _format_value(bound)}, cumulative))
+            samples.append(("_sum", base, buckets.total))
+            samples.append(("_count", base, buckets.count))
+        return self.name, self.type, self.description, samples
+
+
+_Metric = TypeVar("_Metric", bound=_Sharded)
+
+
+class MetricsRegistry:
+    """Metrics for this process, rendered in the Prometheus text exposition format."""
+
+    def __init__(self) -> None:
+        self._metrics: list[_Sharded] = []
+        self._collectors: list[Callable[[], Iterable[Family]]] = []
+
+    def counter(self, name: str, description: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._add(Counter(name, description, labelnames))
+
+    def gauge(self, name: str, description: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._add(Gauge(name, description, labelnames))
+
+    def histogram(
+        self, name: str, description: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> Histogram:
+        return self._add(Histogram(name, description, labelnames, buckets))
+
+    def _add(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, collector: Callable[[], Iterable[Family]]) -> None:
+        """Add values computed at scrape time, such as ratios derived from existing stats."""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        families = [metric.collect() for metric in self._metrics]
+        for collector in self._collectors:
+            families.extend(collector())
+        lines: list[str] = []
+        for name, kind, description, samples in families:
+            lines.append(f"# HELP {name} {_escape(description)}")
+            lines.append(f"# TYPE {name} {kind}")
+            for suffix, labels, value in samples:
+                lines.append(f"{name}{suffix}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+http_requests = registry.counter(
+    "http_requests_total", "HTTP requests by method, route template and status code.", ("method", "route", "status")
+)
+http_request_seconds = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency by method and route template.", ("method", "route")
+)
+http_in_flight = registry.gauge("http_requests_in_flight", "HTTP requests currently being served.")
+request_statements = registry.histogram(
+    "http_request_db_statements", "SQL statements executed per HTTP request.", ("method", "route"), STATEMENT_BUCKETS
+)
+request_db_seconds = registry.histogram(
+    "http_request_db_seconds", "Time spent executing SQL per HTTP request.", ("method", "route")
+)
+db_statements = registry.counter("db_statements_total", "SQL statements executed, by engine.", ("engine",))
+db_statement_seconds = registry.histogram(
+    "db_statement_duration_seconds", "SQL statement execution time, by engine.", ("engine",)
+)
+db_commits = registry.counter("db_commits_total", "Transactions committed, by engine.", ("engine",))
+pool_checkout_seconds = registry.histogram(
+    "db_pool_checkout_seconds", "Time to obtain a pooled connection, by engine.", ("engine",), CHECKOUT_BUCKETS
+)
+
+
+@dataclass
+class QueryUsage:
+    statements: int = 0
+    seconds: float = 0.0
+
+
+# The SQL usage of the request being served, if any; engine hooks add to it.
+current_usage: ContextVar[Optional[QueryUsage]] = ContextVar("current_usage", default=None)
+
+
+def record_statement(engine: str, seconds: float) -> None:
+    db_statements.inc(engine)
+    db_statement_seconds.observe(seconds, engine)
+    usage = current_usage.get()
+    if usage is not None:
+        usage.statements += 1
+        usage.seconds += seconds
+
+
+def _route_template(scope: Scope) -> str:
+    route = scope.get("route")
+    # Unmatched paths share one label so arbitrary URLs cannot grow the series count.
+    return getattr(route, "path", "unmatched")
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording latency, status and SQL usage per route template."""
+
+    def __init__(self, app: Callable[[Scope, Receive, Send], Any]) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message: dict[str, Any]) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        usage = QueryUsage()
+        token = current_usage.set(usage)
+        http_in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            http_in_flight.dec()
+            current_usage.reset(token)
+            method, route = scope["method"], _route_template(scope)
+            http_requests.inc(method, route, str(status_code))
+            http_request_seconds.observe(elapsed, method, route)
+            request_statements.observe(usage.statements, method, route)
+            request_db_seconds.observe(usage.seconds, method, route)
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import random
+from typing import Any, Generic, Iterable, Iterator, Optional, TypeVar
+
+K = TypeVar("K", bound=Any)
+
+
+class _Node(Generic[K]):
+    __slots__ = ("key", "priority", "size", "left", "right")
+
+    def __init__(self, key: K, priority: float) -> None:
+        self.key = key
+        self.priority = priority
+        self.size = 1
+        self.left: Optional[_Node[K]] = None
+        self.right: Optional[_Node[K]] = None
+
+
+def _size(node: Optional[_Node[K]]) -> int:
+    return node.size if node is not None else 0
+
+
+def _update(node: _Node[K]) -> _Node[K]:
+    node.size = 1 + _size(node.left) + _size(node.right)
+    return node
+
+
+class OrderStatisticTree(Generic[K]):
+    """Sorted set of unique keys with O(log n) expected insert, remove, rank and select.
+
+    A treap whose nodes carry subtree sizes, so the position of a key and the key at a position
+    are both found in one root-to-leaf walk.
+    """
+
+    def __init__(self, keys: Iterable[K] = ()) -> None:
+        self._root: Optional[_Node[K]] = self._build(sorted(keys))
+
+    @staticmethod
+    def _build(keys: list[K]) -> Optional[_Node[K]]:
+        """Build a balanced tree from sorted keys in O(n) instead of n inserts."""
+        def build(low: int, high: int) -> Optional[_Node[K]]:
+            if low >= high:
+                return None
+            middle = (low + high) // 2
+            node = _Node(keys[middle], 0.0)
+            node.left = build(low, middle)
+            node.right = build(middle + 1, high)
+            return _update(node)
+
+        root = build(0, len(keys))
+        # Random priorities handed out in descending order, breadth first, keep every parent
+        # above its children while later inserts still see a random treap.
+        priorities = iter(sorted((random.random() for _ in keys), reverse=True))
+        level = [root] if root is not None else []
+        while level:
+            for node in level:
+                node.priority = next(priorities)
+            level = [child for node in level for child in (node.left, node.right) if child is not None]
+        return root
+
+    def __len__(self) -> int:
+        return _size(self._root)
+
+    def __contains__(self, key: K) -> bool:
+        node = self._root
+        while node is not None:
+            if key == node.key:
+                return True
+            node = node.left if key < node.key else node.right
+        return False
+
+    def __iter__(self) -> Iterator[K]:
+        stack: list[_Node[K]] = []
+        node = self._root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.key
+            node = node.right
+
+    def _split(self, node: Optional[_Node[K]], key: K) -> tuple[Optional[_Node[K]], Optional[_Node[K]]]:
+        """Split into keys ``< key`` and keys ``>= key``."""
+        if node is None:
+            return None, None
+        if node.key < key:
+            node.right, right = self._split(node.right, key)
+            return _update(node), right
+        left, node.left = self._split(node.left, key)
+        return left, _update(node)
+
+    def _merge(self, left: Optional[_Node[K]], right: Optional[_Node[K]]) -> Optional[_Node[K]]:
+        if left is None:
+            return right
+        if right is None:
+            return left
+        if left.priority > right.priority:
+            left.right = self._merge(left.right, right)
+            return _update(left)
+        right.left = self._merge(left, right.left)
+        return _update(right)
+
+    def add(self, key: K) -> None:
+        if key in self:
+            return
+        left, right = self._split(self._root, key)
+        self._root = self._merge(self._merge(left, _Node(key, random.random())), right)
+
+    def discard(self, key: K) -> None:
+        if key not in self:
+            return
+        left, rest = self._split(self._root, key)
+        # ``rest`` starts with ``key``; detach its leftmost node.
+        parent: Optional[_Node[K]] = None
+        node = rest
+        path: list[_Node[K]] = []
+        while node is not None and node.left is not None:
+            path.append(node)
+            parent, node = node, node.left
+        assert node is not None
+        if parent is None:
+            rest = node.right
+        else:
+            parent.left = node.right
+            for ancestor in reversed(path):
+                _update(ancestor)
+        self._root = self._merge(left, rest)
+
+    def count_less(self, key: Any) -> int:
+        """Number of keys strictly smaller than ``key``; ``key`` itself need not be present."""
+        count = 0
+        node = self._root
+        while node is not None:
+            if node.key < key:
+                count += _size(node.left) + 1
+                node = node.right
+            else:
+                node = node.left
+        return count
+
+    def index(self, key: K) -> int:
+        if key not in self:
+            raise ValueError(f"{key!r} is not in the tree")
+        return self.count_less(key)
+
+    def select(self, position: int) -> K:
+        """Key at zero-based ``position`` in sorted order."""
+        if not 0 <= position < len(self):
+            raise IndexError("position out of range")
+        node = self._root
+        while node is not None:
+            left_size = _size(node.left)
+            if position < left_size:
+                node = node.left
+            elif position == left_size:
+                return node.key
+            else:
+                position -= left_size + 1
+                node = node.right
+        raise AssertionError("unreachable")  # pragma: no cover
+
+    def slice(self, start: int, stop: int) -> list[K]:
+        start, stop = max(start, 0), min(stop, len(self))
+        return [self.select(position) for position in range(start, stop)]
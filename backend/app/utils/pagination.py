@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import base64
+from datetime import datetime
+from typing import Any, Optional, TypeVar
+
+from fastapi import HTTPException, status
+from sqlalchemy import Row, Select, and_, or_
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ..models import Quest
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Anything with ``started_at`` and ``id``: quests, or rows selecting at least those columns.
+_Page = TypeVar("_Page")
+_Statement = TypeVar("_Statement", bound=Select[Any])
+
+
+def encode_cursor(started_at: datetime, quest_id: int) -> str:
+    raw = f"{started_at.isoformat()}|{quest_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+        started_at, quest_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(started_at), int(quest_id)
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor") from exc
+
+
+def newest_first(statement: _Statement, cursor: Optional[str] = None) -> _Statement:
+    """Order quests by ``(started_at, id)`` descending, starting after ``cursor`` when given."""
+    if cursor:
+        started_at, quest_id = decode_cursor(cursor)
+        statement = statement.where(
+            or_(Quest.started_at < started_at, and_(Quest.started_at == started_at, Quest.id < quest_id))
+        )
+    return statement.order_by(Quest.started_at.desc(), Quest.id.desc())
+
+
+def _split_page(rows: list[_Page], limit: int) -> tuple[list[_Page], Optional[str]]:
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1].started_at, rows[-1].id)
+
+
+async def quest_row_page_async(
+    session: AsyncSession, statement: Select[Any], cursor: Optional[str], limit: int
+) -> tuple[list[Row[Any]], Optional[str]]:
+    """Keyset page of quest column rows; the statement must select ``started_at`` and ``id``.
+
+    One extra row is read to know whether another page exists.
+    """
+    rows = list((await session.execute(newest_first(statement, cursor).limit(limit + 1))).all())
+    return _split_page(rows, limit)
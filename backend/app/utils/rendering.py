@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import typing
+from typing import Any, Iterable, Optional
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel
+from sqlalchemy.orm import InstrumentedAttribute
+
+from ..config import get_settings
+
+settings = get_settings()
+
+
+def fast_path(fields: Optional[str] = None) -> bool:
+    """Whether to render with a ``Serializer`` and orjson rather than through ``response_model``.
+
+    The fast path is opt-in: per request by asking for ``fields=``, which the full schema could
+    not validate anyway, or for every request with ``Settings.fast_responses``.
+    """
+    return bool(fields) or settings.fast_responses
+
+
+def _nested_model(annotation: Any) -> Optional[type[BaseModel]]:
+    """The schema a field nests, looking through ``Optional``."""
+    candidates = typing.get_args(annotation) or (annotation,)
+    for candidate in candidates:
+        if isinstance(candidate, type) and issubclass(candidate, BaseModel):
+            return candidate
+    return None
+
+
+class Serializer:
+    """Prebuilt renderer for one read schema that skips pydantic validation.
+
+    Endpoints hand it ORM objects or column rows they already trust (they come straight from
+    the tables the schema mirrors). On the fast path the result goes out through
+    ``ORJSONResponse``; otherwise it is returned for ``response_model`` to validate. The output
+    matches what the schema would produce.
+    """
+
+    def __init__(self, schema: type[BaseModel]) -> None:
+        self.schema = schema
+        self.fields = tuple(schema.model_fields)
+        self.nested: dict[str, Serializer] = {}
+        for name, field in schema.model_fields.items():
+            model = _nested_model(field.annotation)
+            if model is not None:
+                self.nested[name] = Serializer(model)
+
+    def fieldset(self, fields: Optional[str]) -> tuple[str, ...]:
+        """Parse a ``fields=a,b`` query value into schema field names, in schema order."""
+        if not fields:
+            return self.fields
+        requested = {name.strip() for name in fields.split(",") if name.strip()}
+        unknown = requested.difference(self.fields)
+        if unknown or not requested:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown fields: {', '.join(sorted(unknown))}" if unknown else "No fields requested",
+            )
+        return tuple(name for name in self.fields if name in requested)
+
+    def columns(self, model: type, fieldset: Iterable[str], *required: str) -> list[InstrumentedAttribute[Any]]:
+        """Model columns to SELECT for ``fieldset`` plus any ``required`` by the query itself.
+
+        Nested fields are skipped; the endpoint fills them from elsewhere (usually the catalog).
+        """
+        names = [name for name in fieldset if name not in self.nested]
+        names += [name for name in required if name not in names]
+        return [getattr(model, name) for name in names]
+
+    def row(self, source: Any, fieldset: Optional[Iterable[str]] = None, **values: Any) -> dict[str, Any]:
+        """Plain dict for one object or row; ``values`` supplies fields the source lacks."""
+        result: dict[str, Any] = {}
+        for name in fieldset or self.fields:
+            value = values[name] if name in values else getattr(source, name)
+            if name in self.nested and value is not None:
+                value = self.nested[name].row(value)
+            result[name] = value
+        return result
+
+    def rows(self, sources: Iterable[Any], fieldset: Optional[Iterable[str]] = None) -> list[dict[str, Any]]:
+        fieldset = tuple(fieldset or self.fields)
+        return [self.row(source, fieldset) for source in sources]
+
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import random
+from typing import Optional, Sequence
+
+
+class AliasTable:
+    """Walker/Vose alias table: O(n) to build, O(1) per weighted draw.
+
+    Each column holds a probability and an alias; a draw picks a column uniformly and keeps it
+    with that probability, otherwise takes its alias.
+    """
+
+    def __init__(self, weights: Sequence[float]) -> None:
+        total = float(sum(weights))
+        if not weights or total <= 0 or any(weight < 0 for weight in weights):
+            raise ValueError("Alias table needs non-negative weights with a positive sum")
+        size = len(weights)
+        scaled = [weight * size / total for weight in weights]
+        self._probability = [1.0] * size
+        self._alias = list(range(size))
+        small = [index for index, value in enumerate(scaled) if value < 1.0]
+        large = [index for index, value in enumerate(scaled) if value >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self._probability[less] = scaled[less]
+            self._alias[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            (small if scaled[more] < 1.0 else large).append(more)
+        # Whatever is left is 1.0 up to float error and keeps its default column.
+
+    def __len__(self) -> int:
+        return len(self._probability)
+
+    def sample(self, rng: Optional[random.Random] = None) -> int:
+        randrange, uniform = (rng.randrange, rng.random) if rng else (random.randrange, random.random)
+        column = randrange(len(self._probability))
+        return column if uniform() < self._probability[column] else self._alias[column]
+
+    def sample_many(self, count: int, rng: Optional[random.Random] = None) -> list[int]:
+        return [self.sample(rng) for _ in range(count)]
@@ -1,19 +1,24 @@
 from __future__ import annotations
 
+import hashlib
+import time
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Annotated, Optional
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
-from passlib.context import CryptContext
-from sqlmodel import Session, select
+from sqlalchemy import event, inspect
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from ..config import get_settings
-from ..database import get_session
+from ..database import get_async_session
 from ..models import Player
+from .cache import TTLCache
+from .hashing import HashingPoolSaturated, hashing_pool, pwd_context
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/token")
 settings = get_settings()
 
@@ -25,6 +30,38 @@ class TokenData:
         self.username = username
 
 
+@dataclass(frozen=True)
+class CachedPrincipal:
+    username: str
+    player_id: int
+    expires_at: float
+
+
+# Verified tokens keyed by SHA-256 digest so raw bearer tokens never sit in memory longer than a request.
+token_cache: TTLCache[str, CachedPrincipal] = TTLCache(
+    maxsize=settings.token_cache_size, ttl=settings.token_cache_ttl_seconds
+)
+
+
+def _token_digest(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def invalidate_player_tokens(player_id: int) -> int:
+    return token_cache.discard_where(lambda principal: principal.player_id == player_id)
+
+
+@event.listens_for(Player, "after_update")
+def _evict_on_username_change(mapper, connection, target: Player) -> None:  # type: ignore[no-untyped-def]
+    if inspect(target).attrs.username.history.has_changes():
+        invalidate_player_tokens(target.id)
+
+
+@event.listens_for(Player, "after_delete")
+def _evict_on_delete(mapper, connection, target: Player) -> None:  # type: ignore[no-untyped-def]
+    invalidate_player_tokens(target.id)
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
@@ -33,6 +70,28 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+def _hashing_unavailable() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Authentication is busy, retry shortly",
+        headers={"Retry-After": str(settings.hash_pool_retry_after_seconds)},
+    )
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    try:
+        return await hashing_pool.verify_password(plain_password, hashed_password)
+    except HashingPoolSaturated as exc:
+        raise _hashing_unavailable() from exc
+
+
+async def get_password_hash_async(password: str) -> str:
+    try:
+        return await hashing_pool.hash_password(password)
+    except HashingPoolSaturated as exc:
+        raise _hashing_unavailable() from exc
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
     expire = datetime.utcnow() + (expires_delta or timedelta(minutes=settings.access_token_expire_minutes))
@@ -40,32 +99,60 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return jwt.encode(to_encode, settings.secret_key, algorithm="HS256")
 
 
-def get_player_by_username(session: Session, username: str) -> Optional[Player]:
+def create_player_token(player: Player, expires_delta: Optional[timedelta] = None) -> str:
+    return create_access_token({"sub": player.username, "pid": player.id}, expires_delta=expires_delta)
+
+
+async def get_player_by_username_async(session: AsyncSession, username: str) -> Optional[Player]:
     statement = select(Player).where(Player.username == username)
-    return session.exec(statement).one_or_none()
+    return (await session.exec(statement)).one_or_none()
 
 
-def authenticate_player(session: Session, username: str, password: str) -> Optional[Player]:
-    player = get_player_by_username(session, username)
-    if not player or not verify_password(password, player.hashed_password):
+async def authenticate_player_async(session: AsyncSession, username: str, password: str) -> Optional[Player]:
+    player = await get_player_by_username_async(session, username)
+    if not player or not await verify_password_async(password, player.hashed_password):
         return None
     return player
 
 
-async def get_current_player(token: Annotated[str, Depends(oauth2_scheme)], session: Annotated[Session, Depends(get_session)]) -> Player:
+async def _resolve_principal(session: AsyncSession, token: str) -> Optional[CachedPrincipal]:
+    digest = _token_digest(token)
+    principal = token_cache.get(digest)
+    if principal is not None and principal.expires_at > time.time():
+        return principal
+    try:
+        payload = jwt.decode(token, settings.secret_key, algorithms=["HS256"])
+    except JWTError:
+        return None
+    username: Optional[str] = payload.get("sub")
+    if username is None:
+        return None
+    player_id = payload.get("pid")
+    if player_id is None:
+        # Tokens issued before the player id claim existed still resolve by username.
+        player = await get_player_by_username_async(session, username)
+        if player is None:
+            return None
+        player_id = player.id
+    expires_at = float(payload["exp"])
+    principal = CachedPrincipal(username=username, player_id=int(player_id), expires_at=expires_at)
+    token_cache.set(digest, principal, ttl=expires_at - time.time())
+    return principal
+
+
+async def get_current_player(
+    token: Annotated[str, Depends(oauth2_scheme)], session: Annotated[AsyncSession, Depends(get_async_session)]
+) -> Player:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        payload = jwt.decode(token, settings.secret_key, algorithms=["HS256"])
-        username: str = payload.get("sub")  # type: ignore[assignment]
-        if username is None:
-            raise credentials_exception
-    except JWTError as exc:  # pragma: no cover - failure path
-        raise credentials_exception from exc
-    player = get_player_by_username(session, username)
-    if player is None:
+    principal = await _resolve_principal(session, token)
+    if principal is None:
+        raise credentials_exception
+    player = await session.get(Player, principal.player_id)
+    if player is None or player.username != principal.username:
+        token_cache.pop(_token_digest(token))
         raise credentials_exception
     return player
@@ -0,0 +1,30 @@
+"""Compare a benchmark result file against a stored baseline.
+
+Exits with status 1 when any latency, throughput or per-operation metric is worse than the
+baseline by more than the tolerance, so it can gate a CI job. Run from the backend directory::
+
+    python -m benchmarks.compare benchmarks/baselines/macro.json results/macro.json --tolerance 0.2
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from benchmarks.results import DEFAULT_TOLERANCE, check_baseline, load_report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline", type=Path, help="stored result file to compare against")
+    parser.add_argument("current", type=Path, help="result file from the run under test")
+    parser.add_argument(
+        "--tolerance", type=float, default=DEFAULT_TOLERANCE, help="allowed relative slowdown per metric (0.15 = 15%%)"
+    )
+    args = parser.parse_args()
+
+    check_baseline(args.baseline, load_report(args.current), args.tolerance)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+"""Drive the full ASGI app in-process with concurrent clients and report latency per endpoint.
+
+A scratch SQLite database is seeded with ``--players`` hunters, each owning
+``--quests-per-player`` quests (one in ten active, the rest completed or failed), and the
+app is started with its normal startup hooks, background jobs included. Each endpoint is
+then hit ``--requests`` times by ``--concurrency`` httpx clients sharing one request plan;
+every request is made as a random seeded player. Reported per endpoint: p50/p95/p99
+latency in milliseconds, requests per second and the number of error responses.
+
+``POST /quests/{id}/complete`` consumes the seeded active quests, so it runs at most once
+per active quest. Run from the backend directory::
+
+    python -m benchmarks.macro --players 500 --concurrency 16 --output results/macro.json
+    python -m benchmarks.macro --baseline benchmarks/baselines/macro.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+import httpx
+
+from benchmarks.results import DEFAULT_TOLERANCE, build_report, check_baseline, percentile, write_report
+
+
+@dataclass(frozen=True)
+class Endpoint:
+    method: str
+    path: str
+    # Writes draw a fresh active quest per request instead of a random player.
+    consumes_quest: bool = False
+
+    @property
+    def name(self) -> str:
+        return f"{self.method} {self.path}"
+
+
+ENDPOINTS = [
+    Endpoint("GET", "/players/me"),
+    Endpoint("GET", "/dashboard"),
+    Endpoint("GET", "/quests/active"),
+    Endpoint("GET", "/quests/history"),
+    Endpoint("GET", "/analytics/me"),
+    Endpoint("GET", "/inventory/me"),
+    Endpoint("GET", "/leaderboard/top"),
+    Endpoint("GET", "/leaderboard/around-me"),
+    Endpoint("POST", "/quests/{quest_id}/complete", consumes_quest=True),
+]
+
+# (method, path, headers) for one request.
+Request = tuple[str, str, dict[str, str]]
+
+
+@dataclass
+class Fixture:
+    tokens: dict[int, str]
+    active_quests: list[tuple[int, int]]
+
+
+def seed(players: int, quests_per_player: int, rng: random.Random) -> Fixture:
+    """Bulk-insert players and quests, rebuild their aggregates and mint one token per player.
+
+    Each player also gets what registration and the rollover job would have created for them
+    (effective stats and the current daily quest), so requests measure reads, not first-use writes.
+    """
+    from sqlalchemy import insert
+    from sqlmodel import select
+
+    from app.database import session_scope
+    from app.models import Player, PlayerEffectiveStats, Quest, QuestStatus, QuestType
+    from app.services.analytics import backfill_player_stats
+    from app.services.effective_stats import initial_effective_stats
+    from app.services.progression import rank_for_level
+    from app.services.quests import generate_daily_quest
+    from app.utils.leveling import level_from_xp, total_xp_to_reach
+    from app.utils.security import create_player_token
+
+    now = datetime.utcnow()
+    top_xp = total_xp_to_reach(60)
+    with session_scope() as session:
+        rows = []
+        for n in range(players):
+            xp = rng.randrange(top_xp)
+            level = level_from_xp(xp).level
+            player = Player(
+                username=f"bench-{n}",
+                email=f"bench-{n}@example.com",
+                hashed_password="!",
+                xp=xp,
+                level=level,
+                rank=rank_for_level(level),
+            )
+            rows.append(player.model_dump(exclude={"id"}))
+        session.execute(insert(Player), rows)
+        accounts = session.exec(select(Player)).all()
+        session.execute(
+            insert(PlayerEffectiveStats), [initial_effective_stats(player).model_dump() for player in accounts]
+        )
+
+        for player in accounts:
+            rows = [generate_daily_quest(player).model_dump(exclude={"id"})]
+            for n in range(quests_per_player):
+                started_at = now - timedelta(minutes=rng.randrange(60 * 24 * 60))
+                if n % 10 == 0:
+                    state, completed_at, deadline = QuestStatus.ACTIVE, None, now + timedelta(days=7)
+                elif rng.random() < 0.8:
+                    state, completed_at, deadline = QuestStatus.COMPLETED, started_at + timedelta(hours=1), None
+                else:
+                    state, completed_at, deadline = QuestStatus.FAILED, None, started_at + timedelta(days=1)
+                quest = Quest(
+                    player_id=player.id,
+                    title=f"Quest {n}",
+                    description="Benchmark quest " * 8,
+                    quest_type=QuestType.STORY,
+                    status=state,
+                    xp_reward=rng.choice((50, 100, 250)),
+                    deadline=deadline,
+                    started_at=started_at,
+                    completed_at=completed_at,
+                )
+                rows.append(quest.model_dump(exclude={"id"}))
+            session.execute(insert(Quest), rows)
+        session.commit()
+        backfill_player_stats(session)
+
+        active = session.execute(
+            select(Quest.player_id, Quest.id).where(Quest.status == QuestStatus.ACTIVE, Quest.quest_type == QuestType.STORY)
+        ).all()
+        tokens = {player.id: create_player_token(player, timedelta(hours=12)) for player in accounts}
+    active_quests = [(player_id, quest_id) for player_id, quest_id in active]
+    rng.shuffle(active_quests)
+    return Fixture(tokens=tokens, active_quests=active_quests)
+
+
+def plan(endpoint: Endpoint, fixture: Fixture, count: int, rng: random.Random) -> list[Request]:
+    if endpoint.consumes_quest:
+        drawn = [fixture.active_quests.pop() for _ in range(min(count, len(fixture.active_quests)))]
+        return [
+            (endpoint.method, endpoint.path.format(quest_id=quest_id), _auth(fixture.tokens[player_id]))
+            for player_id, quest_id in drawn
+        ]
+    player_ids = list(fixture.tokens)
+    return [(endpoint.method, endpoint.path, _auth(fixture.tokens[rng.choice(player_ids)])) for _ in range(count)]
+
+
+def _auth(token: str) -> dict[str, str]:
+    return {"Authorization": f"Bearer {token}"}
+
+
+async def drive(app: Any, requests: list[Request], concurrency: int) -> dict[str, Any]:
+    """Send ``requests`` through ``concurrency`` clients and summarise the latencies."""
+    pending: Iterator[Request] = iter(requests)
+    latencies: list[float] = []
+    errors = 0
+
+    async def client() -> None:
+        nonlocal errors
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+            for method, path, headers in pending:
+                started = time.perf_counter()
+                response = await http.request(method, path, headers=headers)
+                latencies.append(time.perf_counter() - started)
+                if response.status_code >= 400:
+                    errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    if not latencies:
+        return {"requests": 0, "errors": 0}
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "rps": round(len(latencies) / elapsed, 1),
+    }
+
+
+async def run(args: argparse.Namespace, endpoints: list[Endpoint]) -> dict[str, dict[str, Any]]:
+    # Imported here so the app binds to the scratch database set up by main().
+    from app.database import engine, init_db
+    from app.main import app, run_leaderboard_refresh
+
+    rng = random.Random(args.seed)
+    init_db()
+    fixture = seed(args.players, args.quests_per_player, rng)
+    await app.router.startup()
+    run_leaderboard_refresh()
+    try:
+        results: dict[str, dict[str, Any]] = {}
+        for endpoint in endpoints:
+            if args.warmup and not endpoint.consumes_quest:
+                await drive(app, plan(endpoint, fixture, args.warmup, rng), args.concurrency)
+            results[endpoint.name] = await drive(app, plan(endpoint, fixture, args.requests, rng), args.concurrency)
+        return results
+    finally:
+        await app.router.shutdown()
+        engine.dispose()
+
+
+def _select(names: Optional[str]) -> list[Endpoint]:
+    if not names:
+        return ENDPOINTS
+    wanted = [name.strip() for name in names.split(",") if name.strip()]
+    known = {endpoint.path: endpoint for endpoint in ENDPOINTS}
+    unknown = [name for name in wanted if name not in known]
+    if unknown:
+        raise SystemExit(f"Unknown endpoints: {', '.join(unknown)}; choose from {', '.join(known)}")
+    return [known[name] for name in wanted]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--players", type=int, default=200, help="players seeded into the scratch database")
+    parser.add_argument("--quests-per-player", type=int, default=50, help="quests seeded per player")
+    parser.add_argument("--concurrency", type=int, default=16, help="concurrent httpx clients")
+    parser.add_argument("--requests", type=int, default=500, help="measured requests per endpoint")
+    parser.add_argument("--warmup", type=int, default=50, help="unmeasured requests per read endpoint")
+    parser.add_argument("--endpoints", help="comma-separated endpoint paths to run (default: all)")
+    parser.add_argument("--seed", type=int, default=1, help="random seed for the data and the request plan")
+    parser.add_argument("--output", type=Path, help="write the results to this JSON file")
+    parser.add_argument("--baseline", type=Path, help="compare against this result file and exit 1 on a regression")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="allowed relative slowdown")
+    args = parser.parse_args()
+    endpoints = _select(args.endpoints)
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ["SOLO_SYSTEM_DATABASE_URL"] = f"sqlite:///{Path(directory) / 'bench.db'}"
+        results = asyncio.run(run(args, endpoints))
+
+    width = max(len(name) for name in results)
+    for name, result in results.items():
+        if not result["requests"]:
+            print(f"{name:<{width}}  no requests (nothing left to consume)")
+            continue
+        print(
+            f"{name:<{width}}  p50 {result['p50_ms']:>8.2f} ms  p95 {result['p95_ms']:>8.2f} ms  "
+            f"p99 {result['p99_ms']:>8.2f} ms  {result['rps']:>8.1f} req/s  {result['errors']} errors"
+        )
+
+    parameters = {
+        key: getattr(args, key)
+        for key in ("players", "quests_per_player", "concurrency", "requests", "warmup", "seed")
+    }
+    report = build_report("macro", parameters, results)
+    if args.output:
+        write_report(args.output, report)
+    if args.baseline:
+        check_baseline(args.baseline, report, args.tolerance)
+
+
+if __name__ == "__main__":
+    main()
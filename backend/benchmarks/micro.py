@@ -0,0 +1,221 @@
+"""Micro benchmarks for the hot helpers behind every player and quest response.
+
+* ``level_from_xp`` – level lookup over XP values spread across the first 100 levels
+* ``calculate_rank`` – rank name for levels 1-100
+* ``quest_list_pydantic`` – a list of quests through ``response_model`` validation and a pydantic JSON dump
+* ``quest_list_orjson`` – the same list through the prebuilt ``Serializer`` and orjson
+* ``quest_response_*`` – one player's quests loaded from a scratch SQLite database and rendered
+  into a response body the way the endpoint would:
+
+  * ``default`` – ORM entities, ``response_model`` validation, pydantic JSON-mode dump, ``JSONResponse``
+  * ``encoder`` – ORM entities, ``response_model`` validation, ``jsonable_encoder``, ``JSONResponse``
+  * ``orjson`` – column rows, prebuilt ``Serializer``, ``ORJSONResponse``
+  * ``orjson_sparse`` – as ``orjson`` with ``fields=id,title,status`` pushed into the SELECT
+
+  These also report the body size, plain and gzipped.
+
+Each benchmark is timed in batches sized by ``timeit`` autorange and the fastest of
+``--repeat`` batches is reported as nanoseconds per operation. Run from the backend directory::
+
+    python -m benchmarks.micro --output results/micro.json --baseline benchmarks/baselines/micro.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import tempfile
+import timeit
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import TypeAdapter
+from sqlmodel import Session, SQLModel, select
+
+from app.database import build_engine
+from app.models import Player, Quest, QuestStatus
+from app.schemas import QuestRead
+from app.services.progression import _calculate_rank
+from app.utils.leveling import level_from_xp, total_xp_to_reach
+from app.utils.rendering import Serializer
+from benchmarks.results import DEFAULT_TOLERANCE, build_report, check_baseline, write_report
+
+quest_list = TypeAdapter(list[QuestRead])
+quest_serializer = Serializer(QuestRead)
+SPARSE_FIELDS = "id,title,status"
+
+# A benchmark is a callable plus the number of operations one call performs.
+Benchmark = tuple[Callable[[], Any], int]
+
+
+def _level_from_xp() -> Benchmark:
+    top = total_xp_to_reach(100)
+    xp_values = [top * n // 1000 for n in range(1000)]
+
+    def run() -> None:
+        for xp in xp_values:
+            level_from_xp(xp)
+
+    return run, len(xp_values)
+
+
+def _calculate_rank_bench() -> Benchmark:
+    levels = list(range(1, 101))
+
+    def run() -> None:
+        for level in levels:
+            _calculate_rank(level)
+
+    return run, len(levels)
+
+
+def _quests(count: int) -> list[Quest]:
+    started = datetime(2026, 1, 1)
+    return [
+        Quest(
+            id=n + 1,
+            player_id=1,
+            title=f"Quest {n}",
+            description="Benchmark quest " * 8,
+            status=QuestStatus.COMPLETED if n % 3 else QuestStatus.ACTIVE,
+            deadline=started + timedelta(days=1),
+            started_at=started + timedelta(minutes=n),
+            completed_at=started + timedelta(hours=n) if n % 3 else None,
+        )
+        for n in range(count)
+    ]
+
+
+def _quest_list_pydantic(quests: list[Quest]) -> Benchmark:
+    def run() -> bytes:
+        return quest_list.dump_json(quest_list.validate_python(quests, from_attributes=True))
+
+    return run, 1
+
+
+def _quest_list_orjson(quests: list[Quest]) -> Benchmark:
+    def run() -> bytes:
+        return orjson.dumps(quest_serializer.rows(quests))
+
+    return run, 1
+
+
+# Renders the response body for one player's quests.
+Render = Callable[[Session, int], bytes]
+
+
+def _render_default(session: Session, player_id: int) -> bytes:
+    quests = session.exec(select(Quest).where(Quest.player_id == player_id)).all()
+    validated = quest_list.validate_python(quests, from_attributes=True)
+    return JSONResponse(quest_list.dump_python(validated, mode="json")).body
+
+
+def _render_encoder(session: Session, player_id: int) -> bytes:
+    quests = session.exec(select(Quest).where(Quest.player_id == player_id)).all()
+    validated = quest_list.validate_python(quests, from_attributes=True)
+    return JSONResponse(jsonable_encoder(validated)).body
+
+
+def _render_orjson(fields: Optional[str]) -> Render:
+    fieldset = quest_serializer.fieldset(fields)
+
+    def render(session: Session, player_id: int) -> bytes:
+        columns = quest_serializer.columns(Quest, fieldset)
+        rows = session.execute(select(*columns).where(Quest.player_id == player_id)).all()
+        return ORJSONResponse(quest_serializer.rows(rows, fieldset)).body
+
+    return render
+
+
+RESPONSE_VARIANTS: dict[str, Render] = {
+    "quest_response_default": _render_default,
+    "quest_response_encoder": _render_encoder,
+    "quest_response_orjson": _render_orjson(None),
+    "quest_response_orjson_sparse": _render_orjson(SPARSE_FIELDS),
+}
+
+
+def _quest_response(render: Render, session: Session, player_id: int) -> Benchmark:
+    def run() -> bytes:
+        body = render(session, player_id)
+        # Every request starts with an empty identity map.
+        session.expunge_all()
+        return body
+
+    return run, 1
+
+
+def _body_sizes(benchmark: Benchmark) -> dict[str, int]:
+    body = benchmark[0]()
+    return {"bytes": len(body), "gzip_bytes": len(gzip.compress(body))}
+
+
+@contextmanager
+def _scratch_player(quests: int) -> Iterator[tuple[Session, int]]:
+    """A session on a throwaway SQLite database holding one player with ``quests`` quests."""
+    with tempfile.TemporaryDirectory() as directory:
+        engine = build_engine(f"sqlite:///{Path(directory) / 'bench.db'}", {})
+        try:
+            SQLModel.metadata.create_all(engine)
+            with Session(engine) as session:
+                player = Player(username="bench", email="bench@example.com", hashed_password="x")
+                session.add(player)
+                session.flush()
+                session.add_all(
+                    Quest(player_id=player.id, title=f"Quest {n}", description="Benchmark quest " * 8)
+                    for n in range(quests)
+                )
+                session.commit()
+                yield session, player.id
+        finally:
+            engine.dispose()
+
+
+def measure(benchmark: Benchmark, repeat: int) -> dict[str, Any]:
+    run, operations = benchmark
+    timer = timeit.Timer(run)
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=number))
+    return {"ns_per_op": round(best / (number * operations) * 1e9, 1), "operations": number * operations}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--quests", type=int, default=50, help="quests per serialised list and rendered response")
+    parser.add_argument("--repeat", type=int, default=5, help="timed batches per benchmark; the fastest is kept")
+    parser.add_argument("--output", type=Path, help="write the results to this JSON file")
+    parser.add_argument("--baseline", type=Path, help="compare against this result file and exit 1 on a regression")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="allowed relative slowdown")
+    args = parser.parse_args()
+
+    quests = _quests(args.quests)
+    benchmarks: dict[str, Benchmark] = {
+        "level_from_xp": _level_from_xp(),
+        "calculate_rank": _calculate_rank_bench(),
+        "quest_list_pydantic": _quest_list_pydantic(quests),
+        "quest_list_orjson": _quest_list_orjson(quests),
+    }
+    results = {name: measure(benchmark, args.repeat) for name, benchmark in benchmarks.items()}
+    with _scratch_player(args.quests) as (session, player_id):
+        for name, render in RESPONSE_VARIANTS.items():
+            benchmark = _quest_response(render, session, player_id)
+            results[name] = {**measure(benchmark, args.repeat), **_body_sizes(benchmark)}
+
+    for name, result in results.items():
+        sizes = f"  ({result['bytes']} bytes, {result['gzip_bytes']} gzipped)" if "bytes" in result else ""
+        print(f"{name:>28}: {result['ns_per_op']:>12.1f} ns/op{sizes}")
+
+    report = build_report("micro", {"quests": args.quests, "repeat": args.repeat}, results)
+    if args.output:
+        write_report(args.output, report)
+    if args.baseline:
+        check_baseline(args.baseline, report, args.tolerance)
+
+
+if __name__ == "__main__":
+    main()
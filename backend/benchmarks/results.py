@@ -0,0 +1,119 @@
+"""JSON result files shared by the benchmark suites, and comparison against a stored baseline.
+
+A result file looks like::
+
+    {
+      "suite": "macro",
+      "created_at": "2026-10-18T09:30:00+00:00",
+      "environment": {"python": "3.11.9", "platform": "Linux-6.8-x86_64"},
+      "parameters": {"players": 200, "concurrency": 16},
+      "results": {"GET /players/me": {"p50_ms": 3.1, "p95_ms": 5.2, "p99_ms": 7.4, "rps": 410.2}}
+    }
+
+Only the metrics in ``METRICS`` are compared; anything else in a result (request counts,
+body sizes) is informational.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import platform
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Mapping, Sequence
+
+# Metric name -> True when a larger value is better.
+METRICS: dict[str, bool] = {
+    "ns_per_op": False,
+    "p50_ms": False,
+    "p95_ms": False,
+    "p99_ms": False,
+    "rps": True,
+    "tx_per_second": True,
+}
+DEFAULT_TOLERANCE = 0.15
+
+
+def percentile(ordered: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted, non-empty sequence."""
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def build_report(suite: str, parameters: Mapping[str, Any], results: Mapping[str, Mapping[str, Any]]) -> dict[str, Any]:
+    return {
+        "suite": suite,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "environment": {"python": platform.python_version(), "platform": platform.platform()},
+        "parameters": dict(parameters),
+        "results": {name: dict(metrics) for name, metrics in results.items()},
+    }
+
+
+def write_report(path: Path, report: Mapping[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+def load_report(path: Path) -> dict[str, Any]:
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def compare_reports(
+    baseline: Mapping[str, Any], current: Mapping[str, Any], tolerance: float = DEFAULT_TOLERANCE
+) -> list[dict[str, Any]]:
+    """One row per metric present in both reports.
+
+    ``change`` is the relative change in the metric's "better" direction, so a negative value is
+    always a slowdown; ``regressed`` is set when the slowdown is larger than ``tolerance``.
+    """
+    if baseline.get("suite") != current.get("suite"):
+        raise ValueError(f"Cannot compare a {current.get('suite')!r} run with a {baseline.get('suite')!r} baseline")
+    rows: list[dict[str, Any]] = []
+    for name, metrics in current["results"].items():
+        previous = baseline["results"].get(name)
+        if previous is None:
+            continue
+        for metric, higher_is_better in METRICS.items():
+            if metric not in metrics or not previous.get(metric):
+                continue
+            gain = metrics[metric] - previous[metric] if higher_is_better else previous[metric] - metrics[metric]
+            change = gain / previous[metric]
+            rows.append(
+                {
+                    "name": name,
+                    "metric": metric,
+                    "baseline": previous[metric],
+                    "current": metrics[metric],
+                    "change": change,
+                    "regressed": change < -tolerance,
+                }
+            )
+    return rows
+
+
+def print_comparison(rows: Sequence[Mapping[str, Any]]) -> bool:
+    """Print a comparison table; returns True when any metric regressed."""
+    width = max((len(row["name"]) for row in rows), default=10)
+    for row in rows:
+        flag = "  REGRESSED" if row["regressed"] else ""
+        print(
+            f"{row['name']:<{width}}  {row['metric']:>9}: {row['baseline']:>12.3f} -> {row['current']:>12.3f}"
+            f"  ({row['change']:+.1%}){flag}"
+        )
+    return any(row["regressed"] for row in rows)
+
+
+def check_baseline(path: Path, report: Mapping[str, Any], tolerance: float = DEFAULT_TOLERANCE) -> None:
+    """Print ``report`` against the baseline at ``path`` and exit with status 1 on a regression."""
+    baseline = load_report(path)
+    try:
+        rows = compare_reports(baseline, report, tolerance)
+    except ValueError as exc:
+        sys.exit(str(exc))
+    if baseline.get("parameters") != report.get("parameters"):
+        print(f"warning: parameters differ from the baseline ({baseline.get('parameters')}), numbers may not be comparable")
+    if print_comparison(rows):
+        sys.exit(1)
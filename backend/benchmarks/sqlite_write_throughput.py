@@ -0,0 +1,94 @@
+"""Compare concurrent write throughput of the default SQLite setup against the tuned profile.
+
+Run from the backend directory::
+
+    python -m benchmarks.sqlite_write_throughput --writers 8 --transactions 200 --output results/sqlite.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Mapping
+
+from sqlalchemy import update
+from sqlalchemy.exc import OperationalError
+from sqlmodel import Session, SQLModel
+
+from app.config import get_settings
+from app.database import build_engine, engine_report, sqlite_profile
+from app.models import Player, Quest
+from benchmarks.results import DEFAULT_TOLERANCE, build_report, check_baseline, write_report
+
+
+def run_profile(pragmas: Mapping[str, Any], writers: int, transactions: int) -> dict[str, Any]:
+    with tempfile.TemporaryDirectory() as directory:
+        url = f"sqlite:///{Path(directory) / 'bench.db'}"
+        engine = build_engine(url, pragmas, pool_size=writers, max_overflow=0)
+        SQLModel.metadata.create_all(engine)
+        with Session(engine) as session:
+            players = [Player(username=f"w{i}", email=f"w{i}@example.com", hashed_password="x") for i in range(writers)]
+            session.add_all(players)
+            session.commit()
+            player_ids = [player.id for player in players]
+
+        def writer(player_id: int) -> int:
+            failures = 0
+            for n in range(transactions):
+                try:
+                    with Session(engine) as session:
+                        session.add(Quest(player_id=player_id, title=f"bench {n}", description="throughput"))
+                        session.execute(update(Player).where(Player.id == player_id).values(xp=Player.xp + 10))
+                        session.commit()
+                except OperationalError:
+                    failures += 1
+            return failures
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=writers) as pool:
+            failures = sum(pool.map(writer, player_ids))
+        elapsed = time.perf_counter() - started
+        report = engine_report(engine)
+        engine.dispose()
+
+    committed = writers * transactions - failures
+    return {
+        "journal_mode": report.get("journal_mode"),
+        "synchronous": report.get("synchronous"),
+        "committed": committed,
+        "failed": failures,
+        "seconds": round(elapsed, 3),
+        "tx_per_second": round(committed / elapsed, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--transactions", type=int, default=200, help="write transactions per writer")
+    parser.add_argument("--output", type=Path, help="write the results to this JSON file")
+    parser.add_argument("--baseline", type=Path, help="compare against this result file and exit 1 on a regression")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="allowed relative slowdown")
+    args = parser.parse_args()
+
+    profiles: dict[str, Mapping[str, Any]] = {"default": {}, "tuned": sqlite_profile(get_settings())}
+    results = {name: run_profile(pragmas, args.writers, args.transactions) for name, pragmas in profiles.items()}
+    for name, result in results.items():
+        print(
+            f"{name:>8}: {result['tx_per_second']:>8} tx/s  "
+            f"({result['committed']} committed, {result['failed']} failed in {result['seconds']}s, "
+            f"journal={result['journal_mode']}, synchronous={result['synchronous']})"
+        )
+
+    report = build_report("sqlite_write_throughput", {"writers": args.writers, "transactions": args.transactions}, results)
+    if args.output:
+        write_report(args.output, report)
+    if args.baseline:
+        check_baseline(args.baseline, report, args.tolerance)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+from contextlib import contextmanager
+from typing import Iterator
+
+import pytest
+
+from .hunters import Hunter, HunterFactory
+from .query_counter import QueryBudget, budget_report, count_queries
+
+
+@pytest.fixture
+def query_budget() -> QueryBudget:
+    """``with query_budget(3, "GET /players/me"):`` fails the test, listing the SQL, when the block runs more."""
+
+    @contextmanager
+    def within(limit: int, label: str = "block") -> Iterator[list[str]]:
+        with count_queries() as statements:
+            yield statements
+        if len(statements) > limit:
+            pytest.fail(budget_report(label, statements, limit), pytrace=False)
+
+    return within
+
+
+@pytest.fixture
+def hunter(request: pytest.FixtureRequest) -> HunterFactory:
+    """``hunter()`` registers a new player, named after the test module, and returns their client."""
+    prefix = request.module.__name__.rsplit(".", 1)[-1].removeprefix("test_")
+    return lambda: Hunter(prefix)
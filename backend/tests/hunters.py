@@ -0,0 +1,41 @@
+import uuid
+from typing import Any, Callable, Optional
+
+from fastapi.testclient import TestClient
+from httpx import Response
+
+from app.main import app
+
+
+class Hunter:
+    """A newly registered player and a client that sends their bearer token.
+
+    Every request, registration included, goes through ``request`` so subclasses can wrap it.
+    """
+
+    def __init__(self, prefix: str = "hunter", client: Optional[TestClient] = None) -> None:
+        self.client = client or TestClient(app)
+        self.headers: dict[str, str] = {}
+        self.username = f"{prefix}-{uuid.uuid4().hex[:8]}"
+        credentials = {"username": self.username, "password": "pw"}
+        player = self.post("/auth/register", json={**credentials, "email": f"{self.username}@example.com"}).json()
+        self.id: int = player["id"]
+        token = self.post("/auth/token", data=credentials).json()["access_token"]
+        self.headers = {"Authorization": f"Bearer {token}"}
+
+    def request(self, method: str, path: str, **kwargs: Any) -> Response:
+        headers = {**self.headers, **kwargs.pop("headers", {})}
+        return self.client.request(method, path, headers=headers, **kwargs)
+
+    def get(self, path: str, **kwargs: Any) -> Response:
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path: str, **kwargs: Any) -> Response:
+        return self.request("POST", path, **kwargs)
+
+    def create_quest(self, **values: Any) -> int:
+        return self.post("/quests/", json={"title": "Hunt", "description": "Clear the gate", **values}).json()["id"]
+
+
+# The ``hunter`` fixture: each ``hunter()`` call registers another player.
+HunterFactory = Callable[[], Hunter]
@@ -0,0 +1,33 @@
+from contextlib import contextmanager
+from typing import Callable, ContextManager, Iterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.database import async_engine, engine
+
+# The ``query_budget`` fixture: ``query_budget(limit, label)`` returns a context manager.
+QueryBudget = Callable[..., ContextManager[list[str]]]
+
+
+@contextmanager
+def count_queries(*targets: Engine) -> Iterator[list[str]]:
+    """Collect the SQL of every statement run on ``targets`` (both app engines by default) in the block."""
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany) -> None:  # type: ignore[no-untyped-def]
+        statements.append(statement)
+
+    targets = targets or (engine, async_engine.sync_engine)
+    for target in targets:
+        event.listen(target, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        for target in targets:
+            event.remove(target, "before_cursor_execute", record)
+
+
+def budget_report(label: str, statements: list[str], limit: int) -> str:
+    listing = "\n".join(f"  {number}. {' '.join(sql.split())}" for number, sql in enumerate(statements, 1))
+    return f"{label} ran {len(statements)} SQL statements, budget is {limit}:\n{listing}"
@@ -0,0 +1,47 @@
+import asyncio
+
+from app.utils.batching import BatchWriter
+
+
+def test_batch_writer_flushes_on_size_and_drains_on_stop() -> None:
+    async def scenario() -> tuple[list[list[int]], dict[str, int]]:
+        batches: list[list[int]] = []
+
+        async def sink(batch: list[int]) -> None:
+            batches.append(batch)
+
+        writer: BatchWriter[int] = BatchWriter("test", batch_size=3, flush_interval_seconds=60, max_queue=100)
+        writer.start(sink)
+        writer.push(range(4))
+        await asyncio.sleep(0.05)
+        writer.push([4])
+        await writer.stop()
+        return batches, writer.stats()
+
+    batches, stats = asyncio.run(scenario())
+    assert batches == [[0, 1, 2], [3], [4]]
+    assert stats["depth"] == 0 and stats["written"] == 5
+
+
+def test_batch_writer_requeues_a_failed_batch() -> None:
+    async def scenario() -> tuple[list[list[int]], dict[str, int]]:
+        batches: list[list[int]] = []
+        calls = 0
+
+        async def flaky_sink(batch: list[int]) -> None:
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                raise RuntimeError("database unavailable")
+            batches.append(batch)
+
+        writer: BatchWriter[int] = BatchWriter("test", batch_size=10, flush_interval_seconds=60, max_queue=100)
+        writer.start(flaky_sink)
+        writer.push([1, 2])
+        assert await writer.flush() == 0
+        await writer.stop()
+        return batches, writer.stats()
+
+    batches, stats = asyncio.run(scenario())
+    assert batches == [[1, 2]]
+    assert stats["failures"] == 1 and stats["written"] == 2
@@ -0,0 +1,46 @@
+from fastapi.testclient import TestClient
+
+from app.database import init_db, session_scope
+from app.main import app, seed_data
+from app.models import Item, ItemCategory
+from app.services.catalog import catalog_cache
+
+
+def setup_module() -> None:
+    init_db()
+    seed_data()
+
+
+def test_catalog_revalidates_with_etag() -> None:
+    client = TestClient(app)
+    first = client.get("/inventory/items")
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+
+    cached = client.get("/inventory/items", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+
+
+def test_catalog_write_bumps_version() -> None:
+    client = TestClient(app)
+    etag = client.get("/skills/").headers["etag"]
+    items_etag = client.get("/inventory/items").headers["etag"]
+    version = catalog_cache.version
+
+    probe = Item(name="Catalog Probe", description="Test item.", category=ItemCategory.MISC, price=1)
+    with session_scope() as session:
+        session.add(probe)
+        session.commit()
+
+    assert catalog_cache.version == version + 1
+    refreshed = client.get("/inventory/items", headers={"If-None-Match": items_etag})
+    assert refreshed.status_code == 200
+    assert any(item["name"] == "Catalog Probe" for item in refreshed.json())
+    # The skill listing did not change, so its validator still holds after the reload.
+    assert client.get("/skills/", headers={"If-None-Match": etag}).status_code == 304
+
+    with session_scope() as session:
+        session.delete(session.get(Item, probe.id))
+        session.commit()
+    assert catalog_cache.version == version + 2
@@ -0,0 +1,53 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.database import async_engine, init_db
+from app.main import app, seed_data
+
+from .hunters import HunterFactory
+
+
+def setup_module() -> None:
+    init_db()
+    seed_data()
+
+
+def _count_selects(client: TestClient, path: str, headers: dict[str, str]) -> tuple[int, dict]:
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany) -> None:  # type: ignore[no-untyped-def]
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        body = client.get(path, headers=headers).json()
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+    return len(statements), body
+
+
+def test_dashboard_matches_single_endpoints(hunter: HunterFactory) -> None:
+    client = TestClient(app)
+    headers = hunter().headers
+    client.post("/quests/", headers=headers, json={"title": "Side job", "description": "Extra"})
+
+    dashboard = client.get("/dashboard", headers=headers).json()
+    assert dashboard["daily_quest"] == client.get("/quests/daily", headers=headers).json()
+    assert dashboard["player"] == client.get("/players/me", headers=headers).json()
+    assert dashboard["analytics"] == client.get("/analytics/me", headers=headers).json()
+    active = client.get("/quests/active", headers=headers).json()
+    assert sorted(dashboard["active_quests"], key=lambda q: q["id"]) == sorted(active, key=lambda q: q["id"])
+
+
+def test_dashboard_uses_a_fixed_number_of_queries(hunter: HunterFactory) -> None:
+    client = TestClient(app)
+    headers = hunter().headers
+    client.get("/dashboard", headers=headers)
+    few, _ = _count_selects(client, "/dashboard", headers)
+    for n in range(5):
+        client.post("/quests/", headers=headers, json={"title": f"Job {n}", "description": "Extra"})
+    many, body = _count_selects(client, "/dashboard", headers)
+    assert len(body["active_quests"]) == 6
+    # Player lookup, quests, then stats and effective stats together.
+    assert few == many == 3
@@ -0,0 +1,61 @@
+from fastapi.testclient import TestClient
+
+from app.database import init_db, session_scope
+from app.main import app, seed_data
+from app.models import Player
+from app.services.quests import bump_quest_versions
+
+from .hunters import HunterFactory
+
+READ_PATHS = ("/players/me", "/quests/active", "/analytics/me")
+
+
+def setup_module() -> None:
+    init_db()
+    seed_data()
+
+
+def _etags(client: TestClient, headers: dict[str, str]) -> dict[str, str]:
+    etags = {}
+    for path in READ_PATHS:
+        response = client.get(path, headers=headers)
+        assert response.status_code == 200, path
+        assert response.headers["etag"].startswith("W/")
+        etags[path] = response.headers["etag"]
+    return etags
+
+
+def _revalidate(client: TestClient, headers: dict[str, str], etags: dict[str, str]) -> dict[str, int]:
+    return {path: client.get(path, headers={**headers, "If-None-Match": etag}).status_code for path, etag in etags.items()}
+
+
+def test_unchanged_reads_return_304(hunter: HunterFactory) -> None:
+    client = TestClient(app)
+    headers = hunter().headers
+    etags = _etags(client, headers)
+    assert _revalidate(client, headers, etags) == {path: 304 for path in READ_PATHS}
+    assert client.get("/players/me", headers={**headers, "If-None-Match": etags["/quests/active"]}).status_code == 200
+
+
+def test_quest_changes_invalidate_validators(hunter: HunterFactory) -> None:
+    client = TestClient(app)
+    headers = hunter().headers
+    etags = _etags(client, headers)
+    quest = client.post("/quests/", headers=headers, json={"title": "Fresh", "description": "New quest"}).json()
+    assert _revalidate(client, headers, etags) == {path: 200 for path in READ_PATHS}
+
+    etags = _etags(client, headers)
+    client.post(f"/quests/{quest['id']}/complete", headers=headers)
+    assert _revalidate(client, headers, etags) == {path: 200 for path in READ_PATHS}
+
+
+def test_bulk_quest_writes_invalidate_validators(hunter: HunterFactory) -> None:
+    client = TestClient(app)
+    headers = hunter().headers
+    etags = _etags(client, headers)
+    player_id = client.get("/players/me", headers=headers).json()["id"]
+    with session_scope() as session:
+        bump_quest_versions(session, [player_id])
+        session.commit()
+        assert session.get(Player, player_id).quest_version == 1
+    assert _revalidate(client, headers, etags)["/quests/active"] == 200
@@ -0,0 +1,63 @@
+from fastapi.testclient import TestClient
+from sqlmodel import select
+
+from app.database import init_db, session_scope
+from app.main import app, seed_data
+from app.models import InventoryItem, Player
+from app.services.inventory import compact_inventory
+
+from .hunters import Hunter, HunterFactory
+
+
+def setup_module() -> None:
+    init_db()
+    seed_data()
+
+
+def _funded(hunter: HunterFactory) -> Hunter:
+    funded = hunter()
+    with session_scope() as session:
+        player = session.get(Player, funded.id)
+        player.currency = 10_000
+        session.add(player)
+        session.commit()
+    return funded
+
+
+def test_acquisitions_stack_and_equip_splits_one_unit(hunter: HunterFactory) -> None:
+    client = TestClient(app)
+    headers = _funded(hunter).headers
+    first = client.post("/shop/purchase", headers=headers, json={"item_id": 1, "quantity": 2}).json()
+    second = client.post("/shop/purchase", headers=headers, json={"item_id": 1, "quantity": 3}).json()
+    assert second["id"] == first["id"]
+    assert second["quantity"] == 5
+
+    equipped = client.post(f"/inventory/equip/{first['id']}", headers=headers).json()
+    assert equipped["equipped"] and equipped["quantity"] == 1
+    inventory = client.get("/inventory/me", headers=headers).json()
+    stacks = {(stack["item"]["id"], stack["equipped"]): stack["quantity"] for stack in inventory}
+    assert stacks == {(1, False): 4, (1, True): 1}
+
+    profile = client.get("/players/me", headers=headers).json()
+    assert profile["effective_stats"]["strength"] == profile["strength"] + 5
+    client.post(f"/inventory/unequip/{equipped['id']}", headers=headers)
+    profile = client.get("/players/me", headers=headers).json()
+    assert profile["effective_stats"]["strength"] == profile["strength"]
+
+
+def test_compaction_merges_duplicate_rows(hunter: HunterFactory) -> None:
+    player_id = _funded(hunter).id
+    with session_scope() as session:
+        # Simulate rows left behind before stacking by dropping the unique index for the insert.
+        session.connection().exec_driver_sql("DROP INDEX uq_inventoryitem_stack")
+        for quantity in (1, 2, 4):
+            session.add(InventoryItem(player_id=player_id, item_id=2, quantity=quantity))
+        session.commit()
+
+        assert compact_inventory(session, batch_size=2) == 2
+        session.connection().exec_driver_sql(
+            "CREATE UNIQUE INDEX uq_inventoryitem_stack ON inventoryitem (player_id, item_id, equipped)"
+        )
+        session.commit()
+        rows = session.exec(select(InventoryItem).where(InventoryItem.player_id == player_id)).all()
+        assert [(row.item_id, row.quantity) for row in rows] == [(2, 7)]
@@ -0,0 +1,103 @@
+from app.database import init_db
+from app.main import seed_data
+from app.models import Rank
+from app.services.leaderboard import global_leaderboard
+from app.services.progression import rank_level_range
+
+from .hunters import Hunter, HunterFactory
+
+
+def setup_module() -> None:
+    init_db()
+    seed_data()
+
+
+def _complete(player: Hunter, xp: int) -> None:
+    assert player.post(f"/quests/{player.create_quest(xp_reward=xp)}/complete").status_code == 200
+
+
+def _fail(player: Hunter) -> None:
+    assert player.post(f"/quests/{player.create_quest(xp_reward=0)}/fail").status_code == 204
+
+
+def _leveled(hunter: HunterFactory, xp: int = 0) -> Hunter:
+    player = hunter()
+    if xp:
+        _complete(player, xp)
+    return player
+
+
+def _read(player: Hunter, path: str, **params: object) -> dict:
+    response = player.get(path, params=params)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def _bracket(rank: Rank) -> tuple[int, int]:
+    return global_leaderboard.bounds(*rank_level_range(rank))
+
+
+def test_top_lists_a_rank_bracket_with_positions_counted_from_its_start(hunter: HunterFactory) -> None:
+    # Level 1 (E), level 5 (D) and level 10 (C).
+    players = {Rank.E: _leveled(hunter), Rank.D: _leveled(hunter, 3_000), Rank.C: _leveled(hunter, 14_000)}
+
+    for rank, player in players.items():
+        start, stop = _bracket(rank)
+        page = _read(player, "/leaderboard/top", rank=rank.value, limit=100)
+        assert page["total"] == stop - start
+        assert [entry["position"] for entry in page["entries"]] == list(range(1, min(stop - start, 100) + 1))
+        assert {entry["rank"] for entry in page["entries"]} == {rank.value}
+        assert [entry["player_id"] for entry in page["entries"]] == [
+            standing.player_id for standing in global_leaderboard.slice(start, min(stop, start + 100))
+        ]
+
+        mine = _read(player, "/leaderboard/me", rank=rank.value)
+        assert mine["total"] == stop - start
+        assert mine["entry"]["player_id"] == player.id
+        assert mine["entry"]["position"] == global_leaderboard.position(player.id) - start + 1
+
+    overall = _read(players[Rank.C], "/leaderboard/top", limit=100)
+    assert overall["total"] == len(global_leaderboard)
+    assert [entry["position"] for entry in overall["entries"]] == list(range(1, len(overall["entries"]) + 1))
+
+
+def test_players_outside_the_bracket_are_not_found(hunter: HunterFactory) -> None:
+    player = _leveled(hunter, 3_000)
+    for path in ("/leaderboard/me", "/leaderboard/around-me"):
+        response = player.get(path, params={"rank": Rank.E.value})
+        assert response.status_code == 404
+        assert response.json()["detail"] == "Not ranked in this bracket"
+    assert _read(player, "/leaderboard/me", rank=Rank.D.value)["entry"]["player_id"] == player.id
+
+
+def test_around_me_is_a_window_centred_on_the_player(hunter: HunterFactory) -> None:
+    # Neighbours on both sides inside the D bracket.
+    middle = [_leveled(hunter, 3_000 + step) for step in range(3)][1]
+
+    position = _read(middle, "/leaderboard/me")["entry"]["position"]
+    page = _read(middle, "/leaderboard/around-me", radius=1)
+    assert page["total"] == len(global_leaderboard)
+    assert [entry["position"] for entry in page["entries"]] == [position - 1, position, position + 1]
+    assert page["entries"][1]["player_id"] == middle.id
+    assert [entry["player_id"] for entry in page["entries"]] == [
+        standing.player_id for standing in global_leaderboard.slice(position - 2, position + 1)
+    ]
+
+    start, _ = _bracket(Rank.D)
+    in_bracket = _read(middle, "/leaderboard/around-me", radius=1, rank=Rank.D.value)
+    assert in_bracket["entries"] == [{**entry, "position": entry["position"] - start} for entry in page["entries"]]
+
+
+def test_players_move_after_completing_or_failing_quests(hunter: HunterFactory) -> None:
+    chaser, leader = _leveled(hunter, 3_000), _leveled(hunter, 3_100)
+
+    def position(player: Hunter) -> int:
+        return _read(player, "/leaderboard/me")["entry"]["position"]
+
+    assert position(leader) < position(chaser)
+    _complete(chaser, 200)
+    assert position(chaser) < position(leader)
+    assert _read(chaser, "/leaderboard/me")["entry"]["xp"] == 3_200
+    _fail(chaser)
+    assert position(leader) < position(chaser)
+    assert _read(chaser, "/leaderboard/me")["entry"]["xp"] == 2_950
@@ -0,0 +1,47 @@
+from app.utils.leveling import (
+    BASE_XP,
+    XP_SCALE,
+    level_from_xp,
+    levels_from_xp,
+    total_xp_to_reach,
+    xp_curve,
+    xp_required_for_level,
+)
+
+
+def _reference_level(xp: int) -> tuple[int, int, int]:
+    level, xp_pool, required = 1, xp, BASE_XP
+    total = BASE_XP
+    while xp_pool >= required:
+        xp_pool -= required
+        level += 1
+        required = int(required * XP_SCALE)
+        total += required
+    return level, required - xp_pool, total
+
+
+def test_curve_matches_iterative_definition() -> None:
+    required = BASE_XP
+    total = 0
+    for level in range(1, 80):
+        total += required
+        assert xp_required_for_level(level) == required
+        assert total_xp_to_reach(level) == total
+        required = int(required * XP_SCALE)
+
+
+def test_level_from_xp_boundaries() -> None:
+    for xp in [0, 1, 499, 500, 501, 1124, 1125, 1126, 10**6, 10**9]:
+        info = level_from_xp(xp)
+        assert (info.level, info.xp_for_next, info.total_xp_required) == _reference_level(xp)
+
+
+def test_levels_from_xp_batch_matches_single_lookups() -> None:
+    values = [0, 750, 12_000, 5, 10**8, 2_500]
+    assert levels_from_xp(values) == [level_from_xp(xp) for xp in values]
+    assert levels_from_xp([]) == []
+
+
+def test_xp_curve_rows() -> None:
+    rows = xp_curve(3)
+    assert rows == [(1, 500, 500), (2, 625, 1125), (3, 781, 1906)]
@@ -0,0 +1,81 @@
+import threading
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.database import init_db
+from app.main import app, seed_data
+from app.utils.metrics import MetricsRegistry
+
+from .hunters import HunterFactory
+
+
+def setup_module() -> None:
+    init_db()
+    seed_data()
+
+
+def _samples(text: str) -> dict[str, float]:
+    return {
+        line.rsplit(" ", 1)[0]: float(line.rsplit(" ", 1)[1])
+        for line in text.splitlines()
+        if line and not line.startswith("#")
+    }
+
+
+def test_counts_from_many_threads_are_merged_on_scrape() -> None:
+    registry = MetricsRegistry()
+    hits = registry.counter("hits_total", "Hits.", ("kind",))
+    latency = registry.histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0))
+
+    def record() -> None:
+        for _ in range(1000):
+            hits.inc("a")
+        latency.observe(0.05)
+        latency.observe(5.0)
+
+    threads = [threading.Thread(target=record) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    text = registry.render()
+    assert "# TYPE latency_seconds histogram" in text
+    samples = _samples(text)
+    assert samples['hits_total{kind="a"}'] == 4000
+    assert samples['latency_seconds_bucket{le="0.1"}'] == 4
+    assert samples['latency_seconds_bucket{le="1"}'] == 4
+    assert samples['latency_seconds_bucket{le="+Inf"}'] == 8
+    assert samples["latency_seconds_count"] == 8
+    assert samples["latency_seconds_sum"] == pytest.approx(4 * 5.05)
+
+
+def test_requests_are_reported_per_route_with_sql_usage(hunter: HunterFactory) -> None:
+    client = TestClient(app)
+    headers = hunter().headers
+    before = _samples(client.get("/metrics").text)
+
+    for _ in range(3):
+        assert client.get("/players/me", headers=headers).status_code == 200
+    client.get(f"/no-such-page/{uuid.uuid4().hex}")
+
+    response = client.get("/metrics")
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    after = _samples(response.text)
+
+    def delta(name: str) -> float:
+        return after.get(name, 0) - before.get(name, 0)
+
+    route = 'method="GET",route="/players/me"'
+    assert delta(f'http_requests_total{{{route},status="200"}}') == 3
+    assert delta(f"http_request_duration_seconds_count{{{route}}}") == 3
+    assert delta(f"http_request_db_statements_count{{{route}}}") == 3
+    assert delta(f"http_request_db_statements_sum{{{route}}}") >= 3
+    assert delta('http_requests_total{method="GET",route="unmatched",status="404"}') == 1
+    assert delta('db_statements_total{engine="async"}') >= 3
+    assert after['db_commits_total{engine="async"}'] >= 1
+    assert after["http_requests_in_flight"] == 1  # the scrape itself
+    assert 'cache_hit_ratio{cache="token"}' in after
+    assert 'db_pool_checkout_seconds_count{engine="async"}' in after
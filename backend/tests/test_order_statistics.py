@@ -0,0 +1,39 @@
+import random
+
+import pytest
+
+from app.utils.order_statistics import OrderStatisticTree
+
+
+def test_tree_matches_sorted_list_under_random_updates() -> None:
+    rng = random.Random(11)
+    initial = rng.sample(range(10_000), 500)
+    tree = OrderStatisticTree(initial)
+    reference = sorted(initial)
+    for _ in range(2_000):
+        key = rng.randrange(10_000)
+        if key in reference:
+            tree.discard(key)
+            reference.remove(key)
+        else:
+            tree.add(key)
+            reference.append(key)
+            reference.sort()
+    assert len(tree) == len(reference)
+    assert list(tree) == reference
+    for position in rng.sample(range(len(reference)), 50):
+        assert tree.select(position) == reference[position]
+        assert tree.index(reference[position]) == position
+    assert tree.count_less(5_000) == sum(1 for key in reference if key < 5_000)
+    assert tree.slice(10, 20) == reference[10:20]
+
+
+def test_tree_rejects_missing_keys_and_positions() -> None:
+    tree = OrderStatisticTree([1, 2, 3])
+    tree.add(2)
+    tree.discard(9)
+    assert list(tree) == [1, 2, 3]
+    with pytest.raises(ValueError):
+        tree.index(9)
+    with pytest.raises(IndexError):
+        tree.select(3)
@@ -0,0 +1,26 @@
+from app.database import init_db
+from app.main import seed_data
+
+from .hunters import HunterFactory
+
+STATS = ("strength", "agility", "intelligence", "vitality", "sense")
+
+
+def setup_module() -> None:
+    init_db()
+    seed_data()
+
+
+def test_allocation_rejects_overspending_and_reductions(hunter: HunterFactory) -> None:
+    player = hunter()
+    profile = player.get("/players/me").json()
+    stats = {name: profile[name] for name in STATS}
+
+    response = player.post("/players/me/allocate", json={**stats, "strength": stats["strength"] + profile["stat_points"] + 1})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Not enough stat points"
+
+    response = player.post("/players/me/allocate", json={**stats, "strength": stats["strength"] - 1})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Cannot reduce stats"
+    assert player.get("/players/me").json() == profile
@@ -0,0 +1,155 @@
+from typing import Any
+
+import pytest
+from fastapi.routing import APIRoute
+from fastapi.testclient import TestClient
+from httpx import Response
+from sqlmodel import select
+
+from app.database import init_db, session_scope
+from app.main import app, seed_data
+from app.models import Item
+
+from .hunters import Hunter
+from .query_counter import QueryBudget
+
+# The most SQL statements each endpoint may run on its success path with warm caches. Regressions
+# here are usually one extra query (a refresh after commit, a lazy relationship load while
+# serialising, the player loaded twice), so a raised budget needs a reason in review.
+BUDGETS: dict[tuple[str, str], int] = {
+    ("POST", "/auth/register"): 4,
+    ("POST", "/auth/token"): 1,
+    ("GET", "/players/me"): 2,
+    ("POST", "/players/me/allocate"): 3,
+    ("GET", "/quests/daily"): 4,
+    ("GET", "/quests/active"): 2,
+    ("GET", "/quests/completed"): 2,
+    ("POST", "/quests/"): 3,
+    ("POST", "/quests/batch"): 9,
+    ("POST", "/quests/{quest_id}/complete"): 7,
+    ("POST", "/quests/{quest_id}/fail"): 7,
+    ("POST", "/quests/penalty"): 3,
+    ("POST", "/quests/emergency"): 3,
+    ("GET", "/quests/history"): 2,
+    ("GET", "/quests/history/export"): 2,
+    ("GET", "/inventory/items"): 0,
+    ("GET", "/inventory/me"): 2,
+    ("POST", "/inventory/equip/{inventory_id}"): 6,
+    ("POST", "/inventory/unequip/{inventory_id}"): 6,
+    ("POST", "/inventory/lootbox"): 2,
+    ("POST", "/inventory/lootbox/open"): 2,
+    ("GET", "/skills/"): 0,
+    ("GET", "/skills/me"): 2,
+    ("POST", "/skills/unlock/{skill_id}"): 4,
+    ("POST", "/shop/purchase"): 3,
+    ("GET", "/analytics/me"): 2,
+    ("GET", "/analytics/me/history"): 2,
+    ("GET", "/leveling/curve"): 0,
+    ("GET", "/leaderboard/top"): 1,
+    ("GET", "/leaderboard/me"): 2,
+    ("GET", "/leaderboard/around-me"): 2,
+    ("GET", "/dashboard"): 3,
+    ("GET", "/health"): 0,
+    ("GET", "/health/caches"): 0,
+    ("GET", "/health/queues"): 0,
+    ("GET", "/health/pools"): 0,
+    ("GET", "/metrics"): 0,
+}
+
+
+def setup_module() -> None:
+    init_db()
+    seed_data()
+
+
+def _route_template(method: str, path: str) -> str:
+    for route in app.routes:
+        if isinstance(route, APIRoute) and method in route.methods and route.path_regex.match(path):
+            return route.path
+    raise AssertionError(f"No route for {method} {path}")
+
+
+class BudgetedHunter(Hunter):
+    """A player whose every request, registration included, is checked against its endpoint's budget."""
+
+    def __init__(self, query_budget: QueryBudget) -> None:
+        self.query_budget = query_budget
+        self.checked: set[tuple[str, str]] = set()
+        super().__init__("budget")
+
+    def request(self, method: str, path: str, **kwargs: Any) -> Response:
+        route = _route_template(method, path)
+        with self.query_budget(BUDGETS[method, route], f"{method} {route}"):
+            response = super().request(method, path, **kwargs)
+        assert response.status_code < 400, (method, route, response.text)
+        self.checked.add((method, route))
+        return response
+
+
+def test_exceeding_a_budget_fails_with_the_captured_sql(query_budget: QueryBudget) -> None:
+    with pytest.raises(pytest.fail.Exception) as failure:
+        with query_budget(0, "catalog read"):
+            with session_scope() as session:
+                session.exec(select(Item)).all()
+    message = str(failure.value)
+    assert "catalog read ran 1 SQL statements, budget is 0" in message
+    assert "FROM item" in message
+
+
+def test_every_route_declares_a_budget() -> None:
+    routes = {(method, route.path) for route in app.routes if isinstance(route, APIRoute) for method in route.methods}
+    assert routes == set(BUDGETS)
+
+
+def test_endpoints_stay_within_query_budgets(query_budget: QueryBudget) -> None:
+    # Budgets assume a loaded catalog, as in any process that has served a request.
+    TestClient(app).get("/inventory/items")
+    hunter = BudgetedHunter(query_budget)
+
+    profile = hunter.get("/players/me").json()
+    hunter.get("/quests/daily")
+    rich = hunter.create_quest(xp_reward=5000, currency_reward=2000, stat_reward=3)
+    hunter.post(f"/quests/{rich}/complete")
+    stats = {name: profile[name] for name in ("strength", "agility", "intelligence", "vitality", "sense")}
+    hunter.post("/players/me/allocate", json={**stats, "strength": stats["strength"] + 1})
+    failed = hunter.create_quest()
+    hunter.post(f"/quests/{failed}/fail")
+    batch = [hunter.create_quest(), hunter.create_quest()]
+    hunter.post(
+        "/quests/batch",
+        json={"operations": [{"quest_id": batch[0], "action": "complete"}, {"quest_id": batch[1], "action": "fail"}]},
+    )
+    hunter.post("/quests/penalty")
+    hunter.post("/quests/emergency", json={"description": "Gate break", "duration_minutes": 30})
+    for path in ("/quests/active", "/quests/completed", "/quests/history", "/quests/history/export"):
+        hunter.get(path)
+
+    hunter.get("/inventory/items")
+    stack = hunter.post("/shop/purchase", json={"item_id": 1}).json()
+    hunter.post("/inventory/lootbox")
+    hunter.post("/inventory/lootbox/open", params={"count": 3})
+    hunter.get("/inventory/me")
+    equipped = hunter.post(f"/inventory/equip/{stack['id']}").json()
+    hunter.post(f"/inventory/unequip/{equipped['id']}")
+
+    hunter.get("/skills/")
+    hunter.post("/skills/unlock/1")
+    hunter.get("/skills/me")
+
+    for path in (
+        "/analytics/me",
+        "/analytics/me/history",
+        "/leveling/curve",
+        "/leaderboard/top",
+        "/leaderboard/me",
+        "/leaderboard/around-me",
+        "/dashboard",
+        "/health",
+        "/health/caches",
+        "/health/queues",
+        "/health/pools",
+        "/metrics",
+    ):
+        hunter.get(path)
+
+    assert hunter.checked == set(BUDGETS)
@@ -0,0 +1,94 @@
+import re
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlmodel import SQLModel
+
+from app.database import async_engine, engine, init_db, session_scope
+from app.main import app, seed_data
+from app.services.analytics import capture_snapshots
+from app.services.leaderboard import load_leaderboard
+from app.services.quests import sweep_expired_quests
+from app.services.rollover import RolloverWheel
+
+from .hunters import HunterFactory
+
+# Listing the whole catalog is intentionally a full read of these small tables.
+FULL_SCAN_ALLOWED = {"item", "skill"}
+FULL_SCAN = re.compile(r"^SCAN (?:TABLE )?(\w+)(?: AS \w+)?$")
+
+captured: dict[str, tuple] = {}
+
+
+def _capture(conn, cursor, statement, parameters, context, executemany) -> None:  # type: ignore[no-untyped-def]
+    if not executemany and statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE")):
+        captured.setdefault(statement, parameters)
+
+
+def setup_module() -> None:
+    init_db()
+    seed_data()
+    # Requests run on the async engine, background jobs on the sync one.
+    for target in (engine, async_engine.sync_engine):
+        event.listen(target, "before_cursor_execute", _capture)
+
+
+def teardown_module() -> None:
+    for target in (engine, async_engine.sync_engine):
+        event.remove(target, "before_cursor_execute", _capture)
+
+
+def _exercise_endpoints(hunter: HunterFactory) -> None:
+    client = TestClient(app)
+    headers = hunter().headers
+
+    daily = client.get("/quests/daily", headers=headers).json()
+    custom = client.post("/quests/", headers=headers, json={"title": "Plan", "description": "Check plans"}).json()
+    client.post(f"/quests/{daily['id']}/complete", headers=headers)
+    client.post(f"/quests/{custom['id']}/fail", headers=headers)
+    batch = client.post("/quests/", headers=headers, json={"title": "Batch", "description": "Check plans"}).json()
+    client.post("/quests/batch", headers=headers, json={"operations": [{"quest_id": batch["id"], "action": "complete"}]})
+    for path in (
+        "/players/me",
+        "/quests/active",
+        "/quests/completed",
+        "/quests/history",
+        "/analytics/me",
+        "/analytics/me/history",
+        "/inventory/me",
+        "/inventory/items",
+        "/skills/",
+        "/skills/me",
+        "/dashboard",
+        "/leaderboard/top",
+        "/leaderboard/top?rank=E",
+        "/leaderboard/me",
+        "/leaderboard/around-me",
+    ):
+        assert client.get(path, headers=headers).status_code == 200, path
+    loot = client.post("/inventory/lootbox", headers=headers).json()
+    client.post(f"/inventory/equip/{loot['id']}", headers=headers)
+    client.post("/shop/purchase", headers=headers, json={"item_id": loot["item"]["id"]})
+    client.post("/skills/unlock/1", headers=headers)
+
+    with session_scope() as session:
+        sweep_expired_quests(session)
+        RolloverWheel().tick(session)
+        capture_snapshots(session)
+        load_leaderboard(session)
+
+
+def test_router_queries_use_indexes(hunter: HunterFactory) -> None:
+    _exercise_endpoints(hunter)
+    assert captured
+
+    offenders = []
+    with engine.connect() as connection:
+        for statement, parameters in captured.items():
+            plan = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+            for row in plan:
+                match = FULL_SCAN.match(row[-1])
+                # Scans of materialised subqueries are fine; only real tables count.
+                if match and match.group(1) in SQLModel.metadata.tables and match.group(1) not in FULL_SCAN_ALLOWED:
+                    offenders.append(f"{row[-1]}\n    {statement}")
+    assert not offenders, "Full table scans found:\n" + "\n".join(offenders)
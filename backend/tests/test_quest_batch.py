@@ -0,0 +1,100 @@
+from fastapi.testclient import TestClient
+
+from app.database import init_db
+from app.main import app, seed_data
+
+from .hunters import HunterFactory
+
+
+def setup_module() -> None:
+    init_db()
+    seed_data()
+
+
+def _quest(client: TestClient, headers: dict[str, str], xp: int) -> int:
+    body = {"title": f"Workout {xp}", "description": "Synced from a watch", "xp_reward": xp, "currency_reward": 10}
+    return client.post("/quests/", headers=headers, json=body).json()["id"]
+
+
+def test_batch_sums_rewards_and_reports_each_operation(hunter: HunterFactory) -> None:
+    client = TestClient(app)
+    headers = hunter().headers
+    other = hunter().headers
+    first, second, third = (_quest(client, headers, xp) for xp in (400, 400, 900))
+    foreign = _quest(client, other, 100)
+
+    response = client.post(
+        "/quests/batch",
+        headers=headers,
+        json={
+            "operations": [
+                {"quest_id": first, "action": "complete"},
+                {"quest_id": second, "action": "complete"},
+                {"quest_id": first, "action": "complete"},
+                {"quest_id": third, "action": "fail"},
+                {"quest_id": foreign, "action": "complete"},
+            ]
+        },
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert [(result["ok"], result["status"], result["detail"]) for result in body["results"]] == [
+        (True, "completed", None),
+        (True, "completed", None),
+        (False, "completed", "Quest is not active"),
+        (True, "failed", None),
+        (False, None, "Quest not found"),
+    ]
+    assert body["rewards"]["stat_points_awarded"] == 2
+
+    player = client.get("/players/me", headers=headers).json()
+    assert player["xp"] == 400 + 400 - 250
+    assert player["currency"] == 20
+    analytics = client.get("/analytics/me", headers=headers).json()
+    assert (analytics["quests_completed"], analytics["quests_failed"]) == (2, 1)
+    penalties = [quest for quest in client.get("/quests/active", headers=headers).json() if quest["quest_type"] == "penalty"]
+    assert len(penalties) == 1
+
+
+def test_batch_rejects_empty_operations(hunter: HunterFactory) -> None:
+    client = TestClient(app)
+    headers = hunter().headers
+    assert client.post("/quests/batch", headers=headers, json={"operations": []}).status_code == 422
+
+
+def test_single_and_batch_failures_leave_the_same_level_and_rank(hunter: HunterFactory) -> None:
+    client = TestClient(app)
+    single, batch = hunter().headers, hunter().headers
+    for headers in (single, batch):
+        rich = _quest(client, headers, 13_000)
+        client.post(f"/quests/{rich}/complete", headers=headers)
+        assert client.get("/players/me", headers=headers).json()["rank"] == "C"
+
+    assert client.post(f"/quests/{_quest(client, single, 0)}/fail", headers=single).status_code == 204
+    operations = [{"quest_id": _quest(client, batch, 0), "action": "fail"}]
+    assert client.post("/quests/batch", headers=batch, json={"operations": operations}).status_code == 200
+
+    profiles = [client.get("/players/me", headers=headers).json() for headers in (single, batch)]
+    assert [(profile["xp"], profile["level"], profile["rank"]) for profile in profiles] == [(12_750, 9, "D")] * 2
+
+
+def test_failing_a_penalty_quest_does_not_issue_another(hunter: HunterFactory) -> None:
+    client = TestClient(app)
+    single, batch = hunter().headers, hunter().headers
+
+    def penalties(headers: dict[str, str]) -> list[int]:
+        active = client.get("/quests/active", headers=headers).json()
+        return [quest["id"] for quest in active if quest["quest_type"] == "penalty"]
+
+    penalty = client.post("/quests/penalty", headers=single).json()["id"]
+    assert client.post(f"/quests/{penalty}/fail", headers=single).status_code == 204
+    assert penalties(single) == []
+
+    penalty = client.post("/quests/penalty", headers=batch).json()["id"]
+    response = client.post("/quests/batch", headers=batch, json={"operations": [{"quest_id": penalty, "action": "fail"}]})
+    assert response.json()["results"][0]["ok"]
+    assert penalties(batch) == []
+
+    story = _quest(client, batch, 100)
+    client.post("/quests/batch", headers=batch, json={"operations": [{"quest_id": story, "action": "fail"}]})
+    assert len(penalties(batch)) == 1
@@ -0,0 +1,68 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import select
+
+from app.config import get_settings
+from app.database import init_db, session_scope
+from app.main import app, seed_data
+from app.models import InventoryItem, Item, Quest
+from app.schemas import ItemRead, QuestRead
+from app.services.inventory import stack_read
+
+from .hunters import HunterFactory
+
+
+def setup_module() -> None:
+    init_db()
+    seed_data()
+
+
+@pytest.mark.parametrize("fast", [False, True], ids=["validated", "fast"])
+def test_list_responses_match_schema_validation(hunter: HunterFactory, monkeypatch: pytest.MonkeyPatch, fast: bool) -> None:
+    monkeypatch.setattr(get_settings(), "fast_responses", fast)
+    player = hunter()
+    for n in range(3):
+        player.create_quest(title=f"Render {n}", xp_reward=10 * n)
+    player.post(f"/quests/{player.create_quest(title='Done')}/complete")
+    player.post("/inventory/lootbox/open", params={"count": 3})
+
+    with session_scope() as session:
+        quests = session.exec(select(Quest).where(Quest.player_id == player.id)).all()
+        expected = {quest.id: QuestRead.model_validate(quest).model_dump(mode="json") for quest in quests}
+        stacks = session.exec(select(InventoryItem).where(InventoryItem.player_id == player.id)).all()
+        expected_stacks = {
+            stack.id: stack_read(stack, ItemRead.model_validate(session.get(Item, stack.item_id))).model_dump(mode="json")
+            for stack in stacks
+        }
+    active = {quest_id for quest_id, quest in expected.items() if quest["status"] == "active"}
+    completed = {quest_id for quest_id, quest in expected.items() if quest["status"] == "completed"}
+
+    def by_id(rows: list[dict]) -> dict[int, dict]:
+        return {row["id"]: row for row in rows}
+
+    assert by_id(player.get("/quests/active").json()) == {quest_id: expected[quest_id] for quest_id in active}
+    assert by_id(player.get("/quests/completed").json()["items"]) == {quest_id: expected[quest_id] for quest_id in completed}
+    page = player.get("/quests/history").json()
+    assert by_id(page["items"]) == expected
+    assert page["next_cursor"] is None
+    export = player.get("/quests/history/export").text.splitlines()
+    assert by_id([json.loads(line) for line in export]) == expected
+    assert expected_stacks and by_id(player.get("/inventory/me").json()) == expected_stacks
+
+
+def test_sparse_fieldsets(hunter: HunterFactory) -> None:
+    client = TestClient(app)
+    headers = hunter().headers
+    for n in range(3):
+        client.post("/quests/", headers=headers, json={"title": f"Sparse {n}", "description": "Fast path"})
+
+    first = client.get("/quests/history?limit=2&fields=title,id", headers=headers).json()
+    assert [set(quest) for quest in first["items"]] == [{"id", "title"}, {"id", "title"}]
+    rest = client.get(f"/quests/history?limit=2&fields=title&cursor={first['next_cursor']}", headers=headers).json()
+    assert rest["items"] == [{"title": "Sparse 0"}]
+
+    response = client.get("/quests/active?fields=title,secret", headers=headers)
+    assert response.status_code == 400
+    assert client.get("/inventory/me?fields=quantity", headers=headers).json() == []
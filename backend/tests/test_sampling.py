@@ -0,0 +1,21 @@
+import random
+from collections import Counter
+
+import pytest
+
+from app.utils.sampling import AliasTable
+
+
+def test_alias_table_matches_weights() -> None:
+    table = AliasTable([5, 3, 0, 2])
+    draws = Counter(table.sample_many(100_000, random.Random(7)))
+    assert 2 not in draws
+    for index, expected in ((0, 0.5), (1, 0.3), (3, 0.2)):
+        assert draws[index] / 100_000 == pytest.approx(expected, abs=0.01)
+
+
+def test_alias_table_rejects_empty_weights() -> None:
+    with pytest.raises(ValueError):
+        AliasTable([0, 0])
+    with pytest.raises(ValueError):
+        AliasTable([])
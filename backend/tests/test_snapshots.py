@@ -0,0 +1,83 @@
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+from sqlmodel import func, select
+
+from app.database import init_db, session_scope
+from app.main import app, seed_data
+from app.models import AnalyticsSnapshot
+from app.services.analytics import capture_snapshots
+
+from .hunters import HunterFactory
+
+
+def setup_module() -> None:
+    init_db()
+    seed_data()
+
+
+def _snapshot_count(player_id: int) -> int:
+    with session_scope() as session:
+        return session.exec(select(func.count()).where(AnalyticsSnapshot.player_id == player_id)).one()
+
+
+def test_capture_skips_players_unchanged_since_their_last_snapshot(hunter: HunterFactory) -> None:
+    client = TestClient(app)
+    player = hunter()
+    headers, player_id = player.headers, player.id
+
+    with session_scope() as session:
+        assert capture_snapshots(session, batch_size=2) >= 1
+    assert _snapshot_count(player_id) == 1
+
+    with session_scope() as session:
+        capture_snapshots(session)
+    assert _snapshot_count(player_id) == 1
+
+    quest = client.post("/quests/", headers=headers, json={"title": "Run", "description": "5km", "xp_reward": 40})
+    client.post(f"/quests/{quest.json()['id']}/complete", headers=headers)
+    with session_scope() as session:
+        capture_snapshots(session)
+    assert _snapshot_count(player_id) == 2
+
+    history = client.get("/analytics/me/history", headers=headers).json()
+    assert len(history) == 1
+    assert history[0]["bucket"] == datetime.utcnow().strftime("%Y-%m-%d")
+    assert history[0]["xp"] == 40
+    assert history[0]["quests_completed"] == 1
+
+
+def test_history_keeps_the_latest_snapshot_per_iso_week(hunter: HunterFactory) -> None:
+    client = TestClient(app)
+    player = hunter()
+    headers, player_id = player.headers, player.id
+    with session_scope() as session:
+        for captured_at, xp in (
+            (datetime(2020, 12, 28, 9), 10),
+            (datetime(2021, 1, 3, 22), 20),  # Sunday: still ISO week 53 of 2020
+            (datetime(2021, 1, 4, 8), 30),  # Monday: ISO week 1 of 2021
+            (datetime(2021, 1, 20, 8), 40),
+        ):
+            session.add(
+                AnalyticsSnapshot(
+                    player_id=player_id,
+                    captured_at=captured_at,
+                    level=1,
+                    xp=xp,
+                    strength=10,
+                    agility=10,
+                    intelligence=10,
+                    vitality=10,
+                    sense=10,
+                    mana=100,
+                    quests_completed=0,
+                    quests_failed=0,
+                )
+            )
+        session.commit()
+
+    weeks = client.get("/analytics/me/history", headers=headers, params={"resolution": "week"}).json()
+    assert [(point["bucket"], point["xp"]) for point in weeks] == [("2020-W53", 20), ("2021-W01", 30), ("2021-W03", 40)]
+
+    months = client.get("/analytics/me/history", headers=headers, params={"resolution": "month", "limit": 1}).json()
+    assert [(point["bucket"], point["xp"]) for point in months] == [("2021-01", 40)]
@@ -6,6 +6,7 @@ import { StatCard } from "./components/StatCard";
 import { ExperienceBar } from "./components/ExperienceBar";
 import { xpRequiredForLevel } from "./utils/leveling";
 import { useAnalytics } from "./hooks/useAnalytics";
+import { useLevelingCurve } from "./hooks/useLevelingCurve";
 import { AnalyticsCard } from "./components/AnalyticsCard";
 import { useActiveQuests, useCompleteQuest, useDailyQuest } from "./hooks/useQuests";
 import { QuestCard } from "./components/QuestCard";
@@ -22,13 +23,14 @@ const Dashboard: React.FC = () => {
   const { data: analytics, isLoading: isAnalyticsLoading } = useAnalytics();
   const { data: dailyQuest } = useDailyQuest();
   const { data: activeQuests } = useActiveQuests();
+  const { data: levelingCurve } = useLevelingCurve();
   const completeMutation = useCompleteQuest();
 
   if (isPlayerLoading || !player || isAnalyticsLoading || !analytics) {
     return <Loader />;
   }
 
-  const xpForNext = xpRequiredForLevel(player.level);
+  const xpForNext = xpRequiredForLevel(player.level, levelingCurve);
 
   return (
     <div className="min-h-screen bg-gradient-to-b from-slate-950 via-slate-900 to-slate-950 pb-16">
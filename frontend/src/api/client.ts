@@ -1,15 +1,61 @@
-import axios from "axios";
-
-export const apiClient = axios.create({
-  baseURL: import.meta.env.VITE_API_URL ?? "http://localhost:8000",
-});
-
-export const authorizedClient = (token?: string) =>
-  axios.create({
-    baseURL: import.meta.env.VITE_API_URL ?? "http://localhost:8000",
-    headers: token
-      ? {
-          Authorization: `Bearer ${token}`,
-        }
-      : undefined,
+import axios, { type AxiosInstance } from "axios";
+
+const baseURL = import.meta.env.VITE_API_URL ?? "http://localhost:8000";
+
+type Validated = { etag: string; data: unknown };
+
+// Last ETag and body per URL, grouped by token, so refetches can be answered with an empty 304.
+// A token's group is dropped with forgetToken when the user logs out or the token changes, and
+// responses still in flight for it are not stored afterwards.
+const validated = new Map<string, Map<string, Validated>>();
+
+const tokenScope = (token: string) => `token:${token}`;
+
+const cacheKey = (url?: string, params?: unknown) => `${url ?? ""} ${params ? JSON.stringify(params) : ""}`;
+
+const withValidators = (instance: AxiosInstance, scope: string) => {
+  if (!validated.has(scope)) validated.set(scope, new Map());
+  instance.interceptors.request.use((config) => {
+    if ((config.method ?? "get").toLowerCase() === "get") {
+      const cached = validated.get(scope)?.get(cacheKey(config.url, config.params));
+      if (cached) config.headers.set("If-None-Match", cached.etag);
+    }
+    return config;
   });
+  instance.interceptors.response.use((response) => {
+    const { config } = response;
+    if ((config.method ?? "get").toLowerCase() !== "get") return response;
+    const key = cacheKey(config.url, config.params);
+    if (response.status === 304) {
+      const cached = validated.get(scope)?.get(key);
+      if (cached) return { ...response, status: 200, data: cached.data };
+      return response;
+    }
+    const etag = response.headers["etag"];
+    if (typeof etag === "string") validated.get(scope)?.set(key, { etag, data: response.data });
+    return response;
+  });
+  return instance;
+};
+
+const createClient = (scope: string, token?: string) =>
+  withValidators(
+    axios.create({
+      baseURL,
+      headers: token
+        ? {
+            Authorization: `Bearer ${token}`,
+          }
+        : undefined,
+      validateStatus: (status) => (status >= 200 && status < 300) || status === 304,
+    }),
+    scope,
+  );
+
+export const apiClient = createClient("public");
+
+export const authorizedClient = (token?: string) => createClient(token ? tokenScope(token) : "public", token);
+
+export const forgetToken = (token: string) => {
+  validated.delete(tokenScope(token));
+};
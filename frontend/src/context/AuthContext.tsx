@@ -1,4 +1,5 @@
 import React, { createContext, useContext, useMemo, useState } from "react";
+import { forgetToken } from "../api/client";
 
 type AuthContextValue = {
   token: string | null;
@@ -13,6 +14,8 @@ export const AuthProvider: React.FC<{ children: React.ReactNode }> = ({ children
   });
 
   const setToken = (value: string | null) => {
+    // Cached responses for the old token would otherwise stay in memory for the page's life.
+    if (token && token !== value) forgetToken(token);
     setTokenState(value);
     if (value) {
       localStorage.setItem("solo-token", value);
@@ -1,6 +1,4 @@
-import { useQuery } from "@tanstack/react-query";
-import { authorizedClient } from "../api/client";
-import { useAuth } from "../context/AuthContext";
+import { useDashboard, type DashboardResponse } from "./useDashboard";
 
 export type Analytics = {
   level: number;
@@ -11,15 +9,6 @@ export type Analytics = {
   average_daily_xp: number;
 };
 
-export const useAnalytics = () => {
-  const { token } = useAuth();
-  return useQuery({
-    queryKey: ["analytics"],
-    queryFn: async () => {
-      if (!token) throw new Error("Not authenticated");
-      const response = await authorizedClient(token).get<Analytics>("/analytics/me");
-      return response.data;
-    },
-    enabled: !!token,
-  });
-};
+const selectAnalytics = (dashboard: DashboardResponse) => dashboard.analytics;
+
+export const useAnalytics = () => useDashboard(selectAnalytics);
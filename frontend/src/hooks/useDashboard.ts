@@ -0,0 +1,31 @@
+import { useQuery } from "@tanstack/react-query";
+import { authorizedClient } from "../api/client";
+import { useAuth } from "../context/AuthContext";
+import type { Analytics } from "./useAnalytics";
+import type { PlayerResponse } from "./usePlayerData";
+import type { Quest } from "./useQuests";
+
+export type DashboardResponse = {
+  player: PlayerResponse;
+  daily_quest: Quest | null;
+  active_quests: Quest[];
+  analytics: Analytics;
+};
+
+export const dashboardQueryKey = ["dashboard"] as const;
+
+// The player, quest and analytics hooks all select from this one query, so a page load or
+// refetch is a single request.
+export const useDashboard = <T = DashboardResponse>(select?: (dashboard: DashboardResponse) => T) => {
+  const { token } = useAuth();
+  return useQuery({
+    queryKey: dashboardQueryKey,
+    queryFn: async () => {
+      if (!token) throw new Error("Not authenticated");
+      const response = await authorizedClient(token).get<DashboardResponse>("/dashboard");
+      return response.data;
+    },
+    select,
+    enabled: !!token,
+  });
+};
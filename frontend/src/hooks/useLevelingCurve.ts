@@ -0,0 +1,14 @@
+import { useQuery } from "@tanstack/react-query";
+import { apiClient } from "../api/client";
+import type { LevelingCurve } from "../utils/leveling";
+
+export const useLevelingCurve = () =>
+  useQuery({
+    queryKey: ["leveling", "curve"],
+    queryFn: async () => {
+      const response = await apiClient.get<LevelingCurve>("/leveling/curve");
+      return response.data;
+    },
+    staleTime: Infinity,
+    gcTime: Infinity,
+  });
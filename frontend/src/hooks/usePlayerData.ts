@@ -1,21 +1,8 @@
-import { useQuery } from "@tanstack/react-query";
-import { authorizedClient } from "../api/client";
-import { useAuth } from "../context/AuthContext";
+import { useDashboard, type DashboardResponse } from "./useDashboard";
 
-export const usePlayerData = () => {
-  const { token } = useAuth();
+const selectPlayer = (dashboard: DashboardResponse) => dashboard.player;
 
-  return useQuery({
-    queryKey: ["player"],
-    queryFn: async () => {
-      if (!token) throw new Error("Not authenticated");
-      const client = authorizedClient(token);
-      const response = await client.get("/players/me");
-      return response.data as PlayerResponse;
-    },
-    enabled: !!token,
-  });
-};
+export const usePlayerData = () => useDashboard(selectPlayer);
 
 export type PlayerResponse = {
   id: number;
@@ -34,4 +21,14 @@ export type PlayerResponse = {
   best_streak: number;
   rank: string;
   class_name?: string | null;
+  timezone: string;
+  effective_stats?: EffectiveStats | null;
+};
+
+export type EffectiveStats = {
+  strength: number;
+  agility: number;
+  intelligence: number;
+  vitality: number;
+  sense: number;
 };
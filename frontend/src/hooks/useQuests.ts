@@ -1,6 +1,7 @@
-import { useMutation, useQuery, useQueryClient } from "@tanstack/react-query";
+import { useMutation, useQueryClient } from "@tanstack/react-query";
 import { authorizedClient } from "../api/client";
 import { useAuth } from "../context/AuthContext";
+import { dashboardQueryKey, useDashboard, type DashboardResponse } from "./useDashboard";
 
 export type Quest = {
   id: number;
@@ -18,18 +19,10 @@ export type Quest = {
   completed_at?: string | null;
 };
 
-export const useActiveQuests = () => {
-  const { token } = useAuth();
-  return useQuery({
-    queryKey: ["quests", "active"],
-    queryFn: async () => {
-      if (!token) throw new Error("Not authenticated");
-      const response = await authorizedClient(token).get<Quest[]>("/quests/active");
-      return response.data;
-    },
-    enabled: !!token,
-  });
-};
+const selectActiveQuests = (dashboard: DashboardResponse) => dashboard.active_quests;
+const selectDailyQuest = (dashboard: DashboardResponse) => dashboard.daily_quest;
+
+export const useActiveQuests = () => useDashboard(selectActiveQuests);
 
 export const useCompleteQuest = () => {
   const { token } = useAuth();
@@ -41,22 +34,9 @@ export const useCompleteQuest = () => {
       return response.data;
     },
     onSuccess: () => {
-      client.invalidateQueries({ queryKey: ["quests"] });
-      client.invalidateQueries({ queryKey: ["player"] });
-      client.invalidateQueries({ queryKey: ["analytics"] });
+      client.invalidateQueries({ queryKey: dashboardQueryKey });
     },
   });
 };
 
-export const useDailyQuest = () => {
-  const { token } = useAuth();
-  return useQuery({
-    queryKey: ["quests", "daily"],
-    queryFn: async () => {
-      if (!token) throw new Error("Not authenticated");
-      const response = await authorizedClient(token).get<Quest>("/quests/daily");
-      return response.data;
-    },
-    enabled: !!token,
-  });
-};
+export const useDailyQuest = () => useDashboard(selectDailyQuest);
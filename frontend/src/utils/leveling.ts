@@ -1,7 +1,23 @@
 const BASE_XP = 500;
 const XP_SCALE = 1.25;
 
-export const xpRequiredForLevel = (level: number) => {
+export type LevelCurveEntry = {
+  level: number;
+  xp_required: number;
+  total_xp: number;
+};
+
+export type LevelingCurve = {
+  base_xp: number;
+  xp_scale: number;
+  levels: LevelCurveEntry[];
+};
+
+export const xpRequiredForLevel = (level: number, curve?: LevelingCurve) => {
+  const entry = curve?.levels[level - 1];
+  if (entry && entry.level === level) {
+    return entry.xp_required;
+  }
   let xp = BASE_XP;
   for (let i = 1; i < level; i += 1) {
     xp = Math.floor(xp * XP_SCALE);